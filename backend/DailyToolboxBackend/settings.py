@@ -42,6 +42,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres', # Full-text and trigram search lookups
     'rest_framework',        # Add this
     'corsheaders',           # Add this
     'menu', # <--- Add your 'menu' app here
@@ -107,6 +108,23 @@ Password for user postgres: admin123 [superuser password]
 https://gemini.google.com/app/e58cff66245cab52
 """
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Must be shared by every process (web workers and management commands): menu
+# payload versions, the typeahead change log and trending rankings are written
+# by one process and read by the others. A per-process backend (LocMemCache,
+# DummyCache) fails the core.E001 system check. The database cache needs
+# 'python manage.py createcachetable'; Redis or Memcached are faster and
+# increment versions atomically, e.g.
+#   'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://127.0.0.1:6379'
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'core_cache',
+        'OPTIONS': {'MAX_ENTRIES': 50000},
+    }
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -168,4 +186,68 @@ except Exception as e:
 AUTHENTICATION_BACKENDS = [
     'core.backends.FirebaseAuthenticationBackend', # Add this line (will create in 0.4)
     'django.contrib.auth.backends.ModelBackend', # Keep default Django auth
-]
\ No newline at end of file
+]
+
+# Maximum number of verified Firebase ID tokens kept in memory per worker (see core.backends)
+FIREBASE_TOKEN_CACHE_SIZE = 1024
+
+# How long rendered + precompressed navbar payloads stay in the cache (seconds).
+# Payloads are also invalidated whenever a menu item changes (see core.menu_cache).
+MENU_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Admin changelists switch from exact COUNT(*) to PostgreSQL's planner estimates
+# once a table holds more rows than this (see core.paginators).
+ADMIN_ESTIMATED_COUNT_THRESHOLD = 10000
+
+# Usage events posted to /api/analytics/events/ are buffered per worker and written in bulk by
+# a background thread once this many are queued or the oldest is this many seconds old (see core.analytics).
+ANALYTICS_BUFFER_SIZE = 5000
+ANALYTICS_FLUSH_INTERVAL = 5.0
+# Maximum number of events accepted in a single POST
+ANALYTICS_MAX_EVENTS_PER_REQUEST = 500
+
+# Trending job (manage.py compute_trending, see core.trending): the top N live items per
+# tool_domain by usage score, where an event's weight halves every TRENDING_HALF_LIFE_HOURS.
+TRENDING_TOP_N = 5
+TRENDING_HALF_LIFE_HOURS = 48
+TRENDING_WINDOW_DAYS = 14
+
+# Geo-targeted navbar variants (see core.geo): the client's region comes from the first of
+# these request headers that holds a country code, else from looking up REMOTE_ADDR in
+# GEOIP_DATABASE, a file built with manage.py build_geoip_db (None = disabled). Only list
+# headers your CDN/proxy sets itself, e.g. ('CF-IPCountry',) behind Cloudflare: clients can
+# send any other header and choose their own region.
+GEO_REGION_HEADERS = ()
+GEOIP_DATABASE = None
+
+# Maximum number of values per request to the batch unit conversion endpoint (see core.units)
+UNIT_CONVERSION_MAX_BATCH = 1_000_000
+
+# Currency converter (see core.currency): manage.py refresh_currency_rates fetches rates from
+# CURRENCY_RATE_PROVIDER (a class given CURRENCY_RATE_SOURCE, a file path or URL) and writes the
+# memory-mapped CURRENCY_RATE_SNAPSHOT that the API reads (None = currency endpoints return 503).
+# Responses flag rates older than CURRENCY_RATE_MAX_AGE seconds as stale.
+CURRENCY_RATE_PROVIDER = 'core.currency.FileRateProvider'
+CURRENCY_RATE_SOURCE = None
+CURRENCY_RATE_SNAPSHOT = None
+CURRENCY_RATE_MAX_AGE = 6 * 60 * 60
+# Maximum number of amounts per request to the batch currency conversion endpoint
+CURRENCY_CONVERSION_MAX_BATCH = 100_000
+
+# QR code generator (see core.qr): renderings are cached on disk in QR_CACHE_DIR (None = a
+# directory under the system temp dir), least recently used first out beyond QR_CACHE_MAX_BYTES.
+# Batch misses render on QR_RENDER_PROCESSES worker processes (None = one per CPU, 0 = in-process).
+QR_CACHE_DIR = None
+QR_CACHE_MAX_BYTES = 256 * 1024 * 1024
+QR_RENDER_PROCESSES = None
+# Maximum number of codes per request to the batch (ZIP) endpoint
+QR_BATCH_MAX_ITEMS = 500
+
+# Maximum number of passwords per request to the (streaming) password generator (see core.passwords)
+PASSWORD_MAX_COUNT = 1_000_000
+
+# Calculator expressions (see core.expressions): compiled expressions kept per process, the
+# maximum number of values per variable in a batch, and the seconds a batch may run.
+EXPRESSION_CACHE_SIZE = 1024
+EXPRESSION_MAX_BATCH = 1_000_000
+EXPRESSION_TIME_LIMIT = 1.0
@@ -1,10 +1,17 @@
 # backend/core/admin.py
 from django.contrib import admin
+from django.db.models import Q
 from .models import MenuItem
+from .admin_actions import MenuItemBulkActionsMixin
+from .admin_filters import ParentMenuFilter
+from .menu_cache import invalidate_menu_cache
+from .paginators import EstimatedCountPaginator
+from .search import prefix_query, trigram_available
+from .typeahead import invalidate_typeahead
 from django.utils import timezone # Import timezone for auto-setting timestamps
 
 @admin.register(MenuItem)
-class MenuItemAdmin(admin.ModelAdmin):
+class MenuItemAdmin(MenuItemBulkActionsMixin, admin.ModelAdmin):
     list_display = (
         'title', 'parent_menu', 'url', 'order', 'is_dropdown', 'is_active',
         'is_visible', 'is_trending', 'is_promoted', 'is_featured', 'access_level',
@@ -15,10 +22,15 @@ class MenuItemAdmin(admin.ModelAdmin):
         'is_active', 'is_visible', 'is_dropdown', 'is_trending', 'is_promoted',
         'is_featured', 'is_hidden', 'is_draft', 'is_published', 'is_scheduled',
         'is_external', 'is_accessible', 'is_searchable', 'is_cacheable',
-        'is_archived', 'is_deleted', 'access_level', 'parent_menu',
+        'is_archived', 'is_deleted', 'access_level', ParentMenuFilter,
     )
     search_fields = ('title', 'url', 'seo_title', 'seo_description', 'tool_domain', 'geo_location')
     ordering = ('parent_menu__order', 'parent_menu__title', 'order', 'title') # Order by parent, then order, then title
+    list_select_related = ('parent_menu__parent_menu',) # MenuItem.__str__ shows the parent's title
+    # Keep the changelist cheap on large tables: no second COUNT(*), estimated counts past a threshold
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    autocomplete_fields = ('parent_menu',) # Searchable parent picker instead of a <select> of every item
     
     # Group fields into logical sections for better readability in the admin change form
     fieldsets = (
@@ -85,6 +97,10 @@ class MenuItemAdmin(admin.ModelAdmin):
         
         # Always set updated_by when the object is saved
         obj.updated_by = request.user
+
+        # Remember who scheduled the item; the publish_scheduled_items worker credits them as publisher
+        if obj.is_scheduled and not obj.scheduled_by:
+            obj.scheduled_by = request.user
         
         # Handle specific timestamp logic based on boolean flags for publishing, archiving, and deleting
         if obj.is_published and not obj.published_at:
@@ -103,4 +119,25 @@ class MenuItemAdmin(admin.ModelAdmin):
             obj.deleted_at = None
 
         # Call the superclass's save_model method to actually save the object
-        super().save_model(request, obj, form, change)
\ No newline at end of file
+        super().save_model(request, obj, form, change)
+
+    def get_search_results(self, request, queryset, search_term):
+        # Full-text search over the GIN-indexed search_vector instead of an ILIKE scan of every
+        # search_fields column (search_fields itself stays: autocomplete_fields needs it). When the
+        # vector finds nothing, what it can't match (stop-word titles such as "All", url,
+        # geo_location) is looked up with ILIKE, but only behind pg_trgm indexes (migrations 0007, 0009).
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        query = prefix_query(search_term)
+        matches = queryset.filter(search_vector=query) if query is not None else queryset.none()
+        if trigram_available() and not matches.exists():
+            matches = queryset.filter(
+                Q(title__icontains=search_term) | Q(url__icontains=search_term) | Q(geo_location__icontains=search_term)
+            )
+        return matches, False
+
+    def menu_items_changed(self):
+        # Bulk actions bypass save() and its signals: refresh the cached navbar and search index once per action
+        invalidate_menu_cache()
+        invalidate_typeahead()
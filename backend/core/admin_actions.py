@@ -0,0 +1,111 @@
+# backend/core/admin_actions.py
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+class MenuItemActionForm(ActionForm):
+    """Admin action bar with an extra input for the 'Set tool domain' action."""
+    tool_domain = forms.CharField(
+        required=False,
+        label="Tool domain",
+        help_text="Used by 'Set tool domain of selected menu items'.",
+    )
+
+
+def bulk_update(modeladmin, request, queryset, verb, **fields):
+    """
+    Apply an admin action as one set-based UPDATE, filling in updated_at/updated_by.
+
+    QuerySet.update() skips save() and model signals, so the admin gets a single
+    menu_items_changed() call per action instead of one per row.
+    """
+    now = timezone.now()
+    fields = {name: value(now) if callable(value) else value for name, value in fields.items()}
+    count = queryset.update(updated_at=now, updated_by=request.user, **fields)
+    if count:
+        modeladmin.menu_items_changed()
+    modeladmin.message_user(request, f"{count} menu item(s) {verb}.", messages.SUCCESS)
+    return count
+
+
+def keep_or_now(field_name):
+    """Keep an existing timestamp, otherwise stamp it with the action time (like save_model does)."""
+    return lambda now: Coalesce(field_name, Value(now))
+
+
+@admin.action(description="Publish selected menu items")
+def publish_selected(modeladmin, request, queryset):
+    bulk_update(
+        modeladmin, request, queryset, "published",
+        is_published=True, is_scheduled=False,
+        published_at=keep_or_now('published_at'), published_by=request.user,
+    )
+
+
+@admin.action(description="Unpublish selected menu items")
+def unpublish_selected(modeladmin, request, queryset):
+    bulk_update(modeladmin, request, queryset, "unpublished", is_published=False, published_at=None)
+
+
+@admin.action(description="Archive selected menu items")
+def archive_selected(modeladmin, request, queryset):
+    bulk_update(
+        modeladmin, request, queryset, "archived",
+        is_archived=True, archived_at=keep_or_now('archived_at'), archived_by=request.user,
+    )
+
+
+@admin.action(description="Soft-delete selected menu items")
+def soft_delete_selected(modeladmin, request, queryset):
+    bulk_update(
+        modeladmin, request, queryset, "soft-deleted",
+        is_deleted=True, deleted_at=keep_or_now('deleted_at'), deleted_by=request.user,
+    )
+
+
+@admin.action(description="Restore selected menu items (un-archive and un-delete)")
+def restore_selected(modeladmin, request, queryset):
+    bulk_update(
+        modeladmin, request, queryset, "restored",
+        is_archived=False, archived_at=None, archived_by=None,
+        is_deleted=False, deleted_at=None, deleted_by=None,
+    )
+
+
+@admin.action(description="Set tool domain of selected menu items")
+def set_tool_domain(modeladmin, request, queryset):
+    tool_domain = request.POST.get('tool_domain', '').strip()
+    if not tool_domain:
+        modeladmin.message_user(request, "Enter a tool domain next to the action first.", messages.WARNING)
+        return
+    bulk_update(modeladmin, request, queryset, f"moved to tool domain '{tool_domain}'", tool_domain=tool_domain)
+
+
+def flag_action(flag, value, label):
+    """Build a 'Mark/Unmark as <label>' action that sets one promotion flag."""
+    def action(modeladmin, request, queryset):
+        bulk_update(modeladmin, request, queryset, f"{'marked' if value else 'unmarked'} as {label}", **{flag: value})
+    action.__name__ = f"{'mark' if value else 'unmark'}_{flag.removeprefix('is_')}"
+    return admin.action(description=f"{'Mark' if value else 'Unmark'} selected menu items as {label}")(action)
+
+
+class MenuItemBulkActionsMixin:
+    """
+    Bulk publish/archive/restore/soft-delete/domain/promotion actions for a MenuItem admin.
+    Override menu_items_changed() to invalidate caches once per action.
+    """
+    action_form = MenuItemActionForm
+    actions = [
+        publish_selected, unpublish_selected, archive_selected, restore_selected, soft_delete_selected,
+        set_tool_domain,
+        flag_action('is_featured', True, "featured"), flag_action('is_featured', False, "featured"),
+        flag_action('is_promoted', True, "promoted"), flag_action('is_promoted', False, "promoted"),
+        flag_action('is_trending', True, "trending"), flag_action('is_trending', False, "trending"),
+    ]
+
+    def menu_items_changed(self):
+        pass
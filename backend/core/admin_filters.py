@@ -0,0 +1,24 @@
+# backend/core/admin_filters.py
+from django.contrib import admin
+
+
+class ParentMenuFilter(admin.SimpleListFilter):
+    """
+    Filter by parent menu, offering only items that actually have children.
+
+    The default FK filter lists every menu item in the sidebar; dropdown parents
+    are a small fraction of a large table. Any parent can still be filtered via
+    ?parent_menu__id__exact=<id>.
+    """
+    title = 'parent menu'
+    parameter_name = 'parent_menu__id__exact'
+
+    def lookups(self, request, model_admin):
+        items = model_admin.model._default_manager
+        parent_ids = items.filter(parent_menu__isnull=False).values('parent_menu')
+        return items.filter(pk__in=parent_ids).order_by('title').values_list('pk', 'title')
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(parent_menu_id=self.value())
+        return queryset
@@ -0,0 +1,182 @@
+# backend/core/analytics.py
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import MenuItem, MenuItemEvent
+
+logger = logging.getLogger(__name__)
+
+EVENT_TYPES = {MenuItemEvent.VIEW, MenuItemEvent.CLICK}
+# analytics_data keys the rollup maintains, per event type
+COUNTER_KEYS = {MenuItemEvent.VIEW: 'views', MenuItemEvent.CLICK: 'clicks'}
+# Client timestamps older than this (or in the future) are replaced with the server time
+MAX_EVENT_AGE = timedelta(days=1)
+
+
+def parse_events(raw_events, now=None):
+    """
+    Validate raw event dicts from the SPA: {"item": <id>, "type": "view"|"click", "ts": <epoch ms>}.
+    Returns (events, rejected) where events are (menu_item_id, event_type, occurred_at) tuples.
+
+    Deliberately plain Python rather than a serializer: this runs for every event.
+    """
+    now = now or timezone.now()
+    oldest = now - MAX_EVENT_AGE
+    events, rejected = [], 0
+    for raw in raw_events:
+        try:
+            item_id, event_type = int(raw['item']), raw['type']
+        except (TypeError, KeyError, ValueError):
+            rejected += 1
+            continue
+        if event_type not in EVENT_TYPES or item_id <= 0:
+            rejected += 1
+            continue
+        occurred_at = now
+        if isinstance(raw.get('ts'), (int, float)):
+            try:
+                occurred_at = datetime.fromtimestamp(raw['ts'] / 1000, tz=dt_timezone.utc)
+            except (OverflowError, OSError, ValueError):
+                pass
+            if not oldest <= occurred_at <= now:
+                occurred_at = now
+        events.append((item_id, event_type, occurred_at))
+    return events, rejected
+
+
+class EventBuffer:
+    """
+    In-memory, thread-safe buffer of usage events for one worker process.
+
+    add() only appends to a list under a lock; a daemon thread (started by the
+    first add() in each process) flushes the buffer once it holds max_size
+    events or its oldest event is flush_interval seconds old, so requests never
+    wait on a flush and a quiet worker still writes its events out on time.
+    A flush writes every buffered event with one bulk INSERT and rolls the
+    per-item totals into MenuItem.analytics_data with one batched UPDATE, so a
+    hot item costs one row write per flush instead of one per hit. Whatever is
+    left is flushed when the process exits.
+    """
+
+    def __init__(self, max_size=5000, flush_interval=5.0):
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self._events = []
+        self._first_event_at = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._flusher_pid = None
+
+    def __len__(self):
+        return len(self._events)
+
+    def add(self, events):
+        """Buffer (menu_item_id, event_type, occurred_at) tuples; wake the flusher if it has work to schedule."""
+        if not events:
+            return
+        with self._lock:
+            if self._flusher_pid != os.getpid(): # Threads don't survive a fork into a worker
+                self._flusher_pid = os.getpid()
+                threading.Thread(target=self._run_flusher, name='analytics-flusher', daemon=True).start()
+            if not self._events:
+                self._first_event_at = time.monotonic()
+            self._events.extend(events)
+            wake = len(self._events) == len(events) or len(self._events) >= self.max_size
+        if wake:
+            self._wake.set()
+
+    def _run_flusher(self):
+        while True:
+            self._wake.clear()
+            with self._lock:
+                first_event_at, full = self._first_event_at, len(self._events) >= self.max_size
+                if not self._events:
+                    first_event_at = None
+            if first_event_at is None:
+                self._wake.wait()
+                continue
+            remaining = first_event_at + self.flush_interval - time.monotonic()
+            if remaining > 0 and not full:
+                self._wake.wait(remaining)
+                continue
+            self.flush()
+            connection.close() # This thread's own connection; reopened by the next flush
+
+    def flush(self):
+        """Write out everything buffered so far. Returns the number of events stored."""
+        with self._flush_lock: # One flush at a time; concurrent callers find the buffer already drained
+            with self._lock:
+                events, self._events = self._events, []
+                self._first_event_at = None
+            if not events:
+                return 0
+            try:
+                return write_events(events)
+            except Exception:
+                # Dropping a batch of counters beats letting the buffer grow without bound
+                logger.exception("Could not store %d analytics event(s); dropping them.", len(events))
+                return 0
+
+
+def write_events(events):
+    """
+    Store events and roll them up into MenuItem.analytics_data, e.g.
+    {"views": 120, "clicks": 7, "last_event_at": "2026-01-01T12:00:00+00:00"}.
+
+    Events for unknown items are dropped. Items whose analytics_data holds
+    something other than an object keep it untouched (their events are still
+    stored). The rollup locks the affected rows once per flush, in id order.
+    """
+    counts = defaultdict(lambda: defaultdict(int))
+    last_event_at = {}
+    for item_id, event_type, occurred_at in events:
+        counts[item_id][event_type] += 1
+        last_event_at[item_id] = max(occurred_at, last_event_at.get(item_id, occurred_at))
+
+    with transaction.atomic():
+        items = list(
+            MenuItem.objects.select_for_update().filter(pk__in=counts).order_by('pk').only('id', 'analytics_data')
+        )
+        known = {item.pk for item in items}
+        MenuItemEvent.objects.bulk_create(
+            [
+                MenuItemEvent(menu_item_id=item_id, event_type=event_type, occurred_at=occurred_at)
+                for item_id, event_type, occurred_at in events if item_id in known
+            ],
+            batch_size=1000,
+        )
+        rolled_up = []
+        for item in items:
+            data = {} if item.analytics_data is None else item.analytics_data
+            if not isinstance(data, dict):
+                continue
+            for event_type, count in counts[item.pk].items():
+                key = COUNTER_KEYS[event_type]
+                previous = data.get(key)
+                data[key] = (previous if isinstance(previous, int) else 0) + count
+            previous = data.get('last_event_at')
+            # Anything but an ISO string (null, a number, legacy data) is overwritten
+            if not isinstance(previous, str) or previous < last_event_at[item.pk].isoformat():
+                data['last_event_at'] = last_event_at[item.pk].isoformat()
+            item.analytics_data = data
+            rolled_up.append(item)
+        # Counters only: the navbar cache is deliberately not invalidated for them
+        MenuItem.objects.bulk_update(rolled_up, ['analytics_data'], batch_size=500)
+    return sum(sum(counts[pk].values()) for pk in known)
+
+
+event_buffer = EventBuffer(
+    max_size=getattr(settings, 'ANALYTICS_BUFFER_SIZE', 5000),
+    flush_interval=getattr(settings, 'ANALYTICS_FLUSH_INTERVAL', 5.0),
+)
+atexit.register(event_buffer.flush)
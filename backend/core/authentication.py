@@ -0,0 +1,59 @@
+# backend/core/authentication.py
+import logging
+
+from firebase_admin import auth
+from rest_framework import authentication, exceptions
+
+from .backends import get_or_create_firebase_user, verify_firebase_token
+
+logger = logging.getLogger(__name__)
+
+
+class FirebaseAuthentication(authentication.BaseAuthentication):
+    """
+    Stateless DRF authentication for Firebase ID tokens sent in the
+    'Authorization: Bearer <token>' header.
+
+    Views opt in through authentication_classes. Nothing is written to the
+    session, so every request stands on its own token (verified tokens are
+    served from core.backends.token_cache).
+    """
+    keyword = 'Bearer'
+
+    def authenticate(self, request):
+        auth_header = authentication.get_authorization_header(request).split()
+        if not auth_header or auth_header[0].lower() != self.keyword.lower().encode():
+            return None # No bearer token: let other authenticators (or anonymous access) handle it
+        if len(auth_header) != 2:
+            raise exceptions.AuthenticationFailed("Invalid Authorization header. Expected 'Bearer <token>'.")
+
+        try:
+            firebase_id_token = auth_header[1].decode()
+            decoded_token = verify_firebase_token(firebase_id_token)
+        except (UnicodeError, ValueError, auth.InvalidIdTokenError, auth.CertificateFetchError) as e:
+            # Invalid, expired or unverifiable token
+            raise exceptions.AuthenticationFailed(f"Firebase authentication failed: {e}")
+
+        user = get_or_create_firebase_user(decoded_token)
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed("User account is disabled.")
+        return (user, decoded_token)
+
+    def authenticate_header(self, request):
+        # Makes DRF answer unauthenticated requests with 401 (not 403)
+        return self.keyword
+
+
+class OptionalFirebaseAuthentication(FirebaseAuthentication):
+    """
+    FirebaseAuthentication for views anonymous callers may use too: a bad,
+    expired or revoked token is logged and the request carries on unauthenticated
+    (or with its session), instead of failing with 401.
+    """
+
+    def authenticate(self, request):
+        try:
+            return super().authenticate(request)
+        except exceptions.AuthenticationFailed as exc:
+            logger.info("Ignoring Firebase credentials: %s", exc.detail)
+            return None
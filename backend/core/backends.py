@@ -1,7 +1,107 @@
 # backend/core/backends.py
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
 from django.contrib.auth.models import User
 from firebase_admin import auth
 
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU cache of verified Firebase ID token claims.
+
+    Entries are keyed by a SHA-256 hash of the token (raw tokens are never kept)
+    and expire at the token's own 'exp' claim, so a cached token is never
+    accepted for longer than Firebase itself would accept it.
+    """
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict() # token hash -> (exp, claims)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(id_token):
+        return hashlib.sha256(id_token.encode('utf-8')).hexdigest()
+
+    def get(self, id_token):
+        """Return the cached claims for a token, or None if unknown or expired."""
+        key = self._key(id_token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(entry[1])
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, id_token, claims):
+        exp = claims.get('exp')
+        if not exp or exp <= time.time():
+            return
+        key = self._key(id_token)
+        with self._lock:
+            self._entries[key] = (exp, dict(claims))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False) # Evict the least recently used token
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries), 'max_size': self.max_size}
+
+
+token_cache = VerifiedTokenCache(max_size=getattr(settings, 'FIREBASE_TOKEN_CACHE_SIZE', 1024))
+
+
+def verify_firebase_token(firebase_id_token):
+    """
+    Verify a Firebase ID token, skipping signature checks for tokens seen before.
+
+    Only cache misses reach auth.verify_id_token. Google's public signing
+    certificates are cached in-process by firebase_admin's HTTP session, which
+    honours the Cache-Control max-age Google publishes with each key rotation,
+    so misses don't refetch them either until the keys rotate.
+    Raises the same errors as auth.verify_id_token.
+    """
+    decoded_token = token_cache.get(firebase_id_token)
+    if decoded_token is None:
+        decoded_token = auth.verify_id_token(firebase_id_token)
+        token_cache.set(firebase_id_token, decoded_token)
+    return decoded_token
+
+
+def get_or_create_firebase_user(decoded_token):
+    """Return the Django user linked to a verified token's Firebase UID, creating it if needed."""
+    uid = decoded_token['uid']
+    email = decoded_token.get('email') # Get email if available
+
+    # Find or create a Django user
+    # In a real app, you might want more sophisticated user linking
+    user, created = User.objects.get_or_create(username=uid)
+    if created:
+        user.email = email if email else f"{uid}@firebase.local"
+        user.set_unusable_password() # Firebase handles passwords
+        user.save()
+    elif email and user.email != email:
+        user.email = email
+        user.save()
+
+    return user
+
+
 class FirebaseAuthenticationBackend:
     """
     Custom Django authentication backend to authenticate users
@@ -12,23 +112,9 @@ class FirebaseAuthenticationBackend:
             return None
 
         try:
-            # Verify the Firebase ID token
-            decoded_token = auth.verify_id_token(firebase_id_token)
-            uid = decoded_token['uid']
-            email = decoded_token.get('email') # Get email if available
-
-            # Find or create a Django user
-            # In a real app, you might want more sophisticated user linking
-            user, created = User.objects.get_or_create(username=uid)
-            if created:
-                user.email = email if email else f"{uid}@firebase.local"
-                user.set_unusable_password() # Firebase handles passwords
-                user.save()
-            elif email and user.email != email:
-                user.email = email
-                user.save()
-
-            return user
+            # Verify the Firebase ID token (served from token_cache on repeat requests)
+            decoded_token = verify_firebase_token(firebase_id_token)
+            return get_or_create_firebase_user(decoded_token)
         except Exception as e:
             # Log the error (e.g., invalid token, expired token)
             print(f"Firebase authentication failed: {e}")
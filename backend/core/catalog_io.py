@@ -0,0 +1,327 @@
+# backend/core/catalog_io.py
+"""
+Streaming import/export of the MenuItem catalog as CSV or JSON Lines.
+
+Rows are keyed by title (unique for core menu items), so importing the same
+file twice is a no-op. The 'parent' column names the parent by title or by its
+full path from the top level ('Tools > Converters'), which must match the menu
+once the import is done; an empty value makes the item top-level.
+"""
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.utils import timezone
+
+from .geo import region_codes
+from .menu_cache import invalidate_menu_cache
+from .models import MenuItem
+from .typeahead import invalidate_typeahead
+
+CATALOG_FORMATS = ('csv', 'jsonl')
+PARENT_COLUMN = 'parent'
+PATH_SEPARATOR = ' > '
+IMPORT_BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 100
+_KEEP = object() # Row has no 'parent' column: leave parent_menu alone
+
+# Every editable, non-relational column (audit timestamps/users are managed by the app)
+CATALOG_FIELDS = ['title'] + [
+    f.name for f in MenuItem._meta.concrete_fields
+    if f.editable and not f.is_relation and not f.primary_key and f.name != 'title'
+]
+CATALOG_COLUMNS = ['title', PARENT_COLUMN] + CATALOG_FIELDS[1:]
+
+TRUE_VALUES = {'1', 't', 'true', 'y', 'yes'}
+FALSE_VALUES = {'0', 'f', 'false', 'n', 'no'}
+
+
+def catalog_format(name, default='csv'):
+    """Guess 'csv' or 'jsonl' from a file name (or return the default)."""
+    for fmt, suffixes in (('csv', ('.csv',)), ('jsonl', ('.jsonl', '.ndjson'))):
+        if name and name.lower().endswith(suffixes):
+            return fmt
+    return default
+
+
+# --- Export -----------------------------------------------------------------
+
+class _Echo:
+    """File-like object whose write() hands back the line, so csv.writer can feed a generator."""
+    def write(self, value):
+        return value
+
+
+def export_catalog(fmt='csv', queryset=None, chunk_size=2000):
+    """
+    Yield the catalog as CSV or JSON Lines text, one row at a time.
+
+    Rows are streamed with a server-side cursor (QuerySet.iterator), top-level
+    items first; import_catalog() links any parent that appears later in the file.
+    """
+    if fmt not in CATALOG_FORMATS:
+        raise ValueError(f"Unknown catalog format '{fmt}'.")
+    queryset = MenuItem.objects.all() if queryset is None else queryset
+    rows = (
+        queryset
+        .order_by(models.F('parent_menu').asc(nulls_first=True), 'order', 'title')
+        .values_list('parent_menu__title', *CATALOG_FIELDS)
+        .iterator(chunk_size=chunk_size)
+    )
+    if fmt == 'csv':
+        writer = csv.writer(_Echo())
+        yield writer.writerow(CATALOG_COLUMNS)
+        for parent_title, *values in rows:
+            row = dict(zip(CATALOG_FIELDS, values), parent=parent_title)
+            yield writer.writerow([_csv_cell(row[column]) for column in CATALOG_COLUMNS])
+    else:
+        for parent_title, *values in rows:
+            row = dict(zip(CATALOG_FIELDS, values), parent=parent_title)
+            yield json.dumps({column: row[column] for column in CATALOG_COLUMNS}, default=_json_default) + '\n'
+
+
+def _json_default(value):
+    # Full-precision ISO 8601 (DjangoJSONEncoder drops microseconds, which would break re-import no-ops)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _csv_cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+# --- Import -----------------------------------------------------------------
+
+def read_catalog(stream, fmt='csv'):
+    """Yield (line number, row dict) pairs from a text stream, without reading it all at once."""
+    if fmt == 'csv':
+        yield from enumerate(csv.DictReader(stream), start=2)
+    elif fmt == 'jsonl':
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                row = exc
+            yield line_number, row
+    else:
+        raise ValueError(f"Unknown catalog format '{fmt}'.")
+
+
+def text_stream(binary_file, encoding='utf-8-sig'):
+    """Wrap an uploaded/opened binary file for read_catalog (decoded lazily, BOM tolerated)."""
+    return io.TextIOWrapper(binary_file, encoding=encoding, newline='')
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    linked: int = 0 # Rows whose parent was set in the final pass (the parent came later in the file)
+    error_count: int = 0
+    errors: list = field(default_factory=list)
+
+    def add_error(self, line_number, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line_number, 'error': message})
+
+    def as_dict(self):
+        return {
+            'rows': self.rows, 'created': self.created, 'updated': self.updated,
+            'unchanged': self.unchanged, 'linked': self.linked, 'error_count': self.error_count, 'errors': self.errors,
+        }
+
+
+def _clean_value(model_field, value):
+    """Convert a CSV cell or JSON value to the field's Python value (raises ValidationError)."""
+    is_text = isinstance(model_field, (models.CharField, models.TextField))
+    if isinstance(value, str) and not is_text:
+        value = value.strip()
+    if value == '':
+        value = None # CSV cannot tell '' from NULL; nullable columns store NULL
+    if isinstance(value, str) and isinstance(model_field, models.BooleanField):
+        if value.lower() not in TRUE_VALUES | FALSE_VALUES:
+            raise ValidationError(f"'{value}' is not a boolean.")
+        value = value.lower() in TRUE_VALUES
+    elif isinstance(value, str) and isinstance(model_field, models.JSONField):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            raise ValidationError("Invalid JSON.")
+    if value is None and not model_field.null:
+        value = '' if is_text else model_field.get_default()
+    return model_field.clean(value, None)
+
+
+def _clean_row(row):
+    """Validate one input row -> (title, parent path or None if absent, {field: value}).
+
+    The parent path is a tuple of titles from the top level down, () for a top-level item.
+    """
+    if not isinstance(row, dict):
+        raise ValidationError("Each row must be an object." if not isinstance(row, Exception) else f"Invalid JSON: {row}")
+    unknown = set(row) - set(CATALOG_COLUMNS)
+    if unknown:
+        raise ValidationError(f"Unknown column(s): {', '.join(sorted(map(str, unknown)))}.")
+    title = (row.get('title') or '').strip()
+    if not title:
+        raise ValidationError("'title' is required.")
+
+    values = {'title': title}
+    for name in CATALOG_FIELDS[1:]:
+        if name in row:
+            try:
+                values[name] = _clean_value(MenuItem._meta.get_field(name), row[name])
+            except ValidationError as exc:
+                raise ValidationError(f"{name}: {' '.join(exc.messages)}")
+
+    parent = None # Column absent: leave the parent as it is
+    if PARENT_COLUMN in row:
+        raw = (row[PARENT_COLUMN] or '').strip()
+        parent = tuple(part.strip() for part in raw.split(PATH_SEPARATOR)) if raw else ()
+        if '' in parent:
+            raise ValidationError(f"parent: empty title in path '{raw}'.")
+        if title in parent:
+            raise ValidationError("An item cannot be its own parent.")
+    return title, parent, values
+
+
+def _stamp_lifecycle(item, now):
+    # bulk_create/bulk_update skip MenuItem.save(); apply the same timestamp and region rules
+    item.geo_regions = region_codes(item.geo_location)
+    if item.is_published and not item.published_at:
+        item.published_at = now
+    if item.is_archived and not item.archived_at:
+        item.archived_at = now
+    if item.is_deleted and not item.deleted_at:
+        item.deleted_at = now
+
+
+def import_catalog(rows, user=None, batch_size=IMPORT_BATCH_SIZE, progress=None):
+    """
+    Upsert (line number, row) pairs, e.g. from read_catalog(), in batches.
+
+    Each batch costs one SELECT plus one bulk_create and one bulk_update. Parents
+    that do not exist yet (e.g. defined later in the file) and parents given by a
+    path, which is checked against the ancestors the whole file sets up, are
+    linked in a final pass. 'progress' is called with the running ImportResult after every batch.
+    The menu cache and search index are invalidated once at the end if anything changed.
+    """
+    result = ImportResult()
+    pending_parents = {} # child title -> parent path, linked after all rows are written
+    batch = []
+    for line_number, row in rows:
+        result.rows += 1
+        try:
+            batch.append((line_number, *_clean_row(row)))
+        except ValidationError as exc:
+            result.add_error(line_number, ' '.join(exc.messages))
+        if len(batch) >= batch_size:
+            _import_batch(batch, user, result, pending_parents)
+            batch = []
+            if progress:
+                progress(result)
+    if batch:
+        _import_batch(batch, user, result, pending_parents)
+    if pending_parents:
+        _link_parents(pending_parents, user, result)
+    if progress:
+        progress(result)
+    if result.created or result.updated or result.linked:
+        invalidate_menu_cache()
+        invalidate_typeahead()
+    return result
+
+
+def _import_batch(batch, user, result, pending_parents):
+    now = timezone.now()
+    titles = {title for _, title, _, _ in batch}
+    parent_titles = {parent[0] for _, _, parent, _ in batch if parent and len(parent) == 1}
+    known = MenuItem.objects.in_bulk(titles | parent_titles, field_name='title')
+
+    to_create, to_update, changed_fields = {}, {}, set()
+    for _, title, parent, values in batch:
+        parent_id = _KEEP
+        if parent == ():
+            parent_id = None
+        elif parent and len(parent) == 1 and parent[0] in known:
+            parent_id = known[parent[0]].pk
+        elif parent:
+            pending_parents[title] = parent
+        if parent_id is not _KEEP:
+            pending_parents.pop(title, None) # A later row for the same title wins
+
+        item = to_create.get(title) or known.get(title)
+        if item is None:
+            item = to_create[title] = MenuItem(created_by=user, updated_by=user)
+        changes = {name: value for name, value in values.items() if getattr(item, name) != value}
+        if parent_id is not _KEEP and item.parent_menu_id != parent_id:
+            changes['parent_menu_id'] = parent_id
+        for name, value in changes.items():
+            setattr(item, name, value)
+        if item.pk is not None and changes:
+            changed_fields.update('parent_menu' if name == 'parent_menu_id' else name for name in changes)
+            to_update[title] = item
+
+    with transaction.atomic():
+        for item in to_create.values():
+            _stamp_lifecycle(item, now)
+        MenuItem.objects.bulk_create(to_create.values(), batch_size=len(batch))
+        for item in to_update.values():
+            _stamp_lifecycle(item, now)
+            item.updated_at, item.updated_by = now, user
+        if to_update:
+            fields = changed_fields | {'updated_at', 'updated_by', 'published_at', 'archived_at', 'deleted_at', 'geo_regions'}
+            MenuItem.objects.bulk_update(to_update.values(), sorted(fields))
+    result.created += len(to_create)
+    result.updated += len(to_update)
+    result.unchanged += len((titles & known.keys()) - to_update.keys())
+
+
+def _link_parents(pending_parents, user, result, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Point rows at parents that did not exist yet when the rows were written, or
+    that were given by a path. Shorter paths go first, so a path's ancestors are
+    linked before it is checked against them; rows whose path does not match are
+    rejected.
+    """
+    items = sorted(pending_parents.items(), key=lambda pending: len(pending[1]))
+    now = timezone.now()
+    for start in range(0, len(items), batch_size):
+        chunk = dict(items[start:start + batch_size])
+        known = MenuItem.objects.in_bulk(set(chunk).union(*chunk.values()), field_name='title')
+        linked = {} # title -> parent id set earlier in this chunk
+        to_update = []
+        for title, path in chunk.items():
+            missing = [segment for segment in path if segment not in known]
+            if missing:
+                result.add_error(None, f"{title}: parent '{missing[0]}' does not exist.")
+                continue
+            ancestor_ids = [None, *(known[segment].pk for segment in path)]
+            if len(path) > 1 and any( # A single title names the parent wherever it is
+                linked.get(segment, known[segment].parent_menu_id) != ancestor_ids[depth]
+                for depth, segment in enumerate(path)
+            ):
+                result.add_error(None, f"{title}: parent path '{PATH_SEPARATOR.join(path)}' does not match the menu.")
+                continue
+            linked[title] = ancestor_ids[-1]
+            if known[title].parent_menu_id != ancestor_ids[-1]:
+                item = known[title]
+                item.parent_menu_id, item.updated_at, item.updated_by = ancestor_ids[-1], now, user
+                to_update.append(item)
+        MenuItem.objects.bulk_update(to_update, ['parent_menu', 'updated_at', 'updated_by'])
+        result.linked += len(to_update)
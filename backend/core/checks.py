@@ -0,0 +1,23 @@
+# backend/core/checks.py
+from django.conf import settings
+from django.core.checks import Error, register
+
+# Backends whose data never leaves the process that wrote it
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    """The default cache carries menu versions and the typeahead log between processes, so it must be shared."""
+    backend = settings.CACHES.get('default', {}).get('BACKEND', PROCESS_LOCAL_CACHES[0])
+    if backend in PROCESS_LOCAL_CACHES:
+        return [Error(
+            f"The default cache ({backend}) is local to each process, so menu and typeahead invalidations "
+            "would not reach other workers.",
+            hint="Configure a shared backend in CACHES (database, Redis or Memcached).",
+            id='core.E001',
+        )]
+    return []
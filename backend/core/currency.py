@@ -0,0 +1,245 @@
+# backend/core/currency.py
+"""
+Currency conversion from a locally cached snapshot of exchange rates.
+
+A refresh worker (manage.py refresh_currency_rates) pulls rates from a
+pluggable provider and writes every pairwise rate into a small binary file.
+Request workers memory-map that file, so a conversion is one read at a
+computed offset: no network I/O and no parsing on the request path. The
+worker replaces the file atomically and readers remap it when it changes.
+"""
+import json
+import logging
+import math
+import mmap
+import os
+import re
+import struct
+import tempfile
+import threading
+import time
+import urllib.request
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+try:
+    import numpy as np
+except ImportError: # numpy is only needed for batch conversions
+    np = None
+
+logger = logging.getLogger(__name__)
+
+CURRENCY_CODE_RE = re.compile(r'[A-Z]{3}') # Used with fullmatch ('$' would also accept 'USD\n')
+# Snapshots older than this are flagged as stale in API responses
+CURRENCY_RATE_MAX_AGE = getattr(settings, 'CURRENCY_RATE_MAX_AGE', 6 * 60 * 60)
+# How often (seconds) a worker checks whether the snapshot file was replaced
+SNAPSHOT_CHECK_INTERVAL = 5.0
+
+
+# --- Providers ----------------------------------------------------------------
+
+class RateProvider:
+    """
+    Source of exchange rates, configured by CURRENCY_RATE_PROVIDER (dotted path)
+    and CURRENCY_RATE_SOURCE. fetch() returns (base code, {code: units of code
+    per one base unit}, as_of datetime).
+    """
+
+    def __init__(self, source):
+        self.source = source
+
+    def fetch(self):
+        raise NotImplementedError
+
+    def parse(self, data):
+        """Read the common {"base": "USD", "timestamp": <epoch seconds>, "rates": {"EUR": 0.92, ...}} shape."""
+        try:
+            base, rates = data['base'], dict(data['rates'])
+        except (KeyError, TypeError, ValueError):
+            raise ValueError("Rate data must be an object with 'base' and 'rates'.")
+        timestamp = data.get('timestamp')
+        as_of = datetime.fromtimestamp(timestamp, tz=dt_timezone.utc) if isinstance(timestamp, (int, float)) else timezone.now()
+        return base, rates, as_of
+
+
+class FileRateProvider(RateProvider):
+    """Rates from a local JSON file: a stand-in for a real provider in development and tests."""
+
+    def fetch(self):
+        with open(self.source, encoding='utf-8') as rate_file:
+            return self.parse(json.load(rate_file))
+
+
+class HTTPRateProvider(RateProvider):
+    """Rates from a JSON API with the same response shape (e.g. Open Exchange Rates' latest.json?app_id=...)."""
+    timeout = 10
+
+    def fetch(self):
+        with urllib.request.urlopen(self.source, timeout=self.timeout) as response:
+            return self.parse(json.load(response))
+
+
+def rate_provider(provider=None, source=None):
+    """Instantiate a provider class (dotted path), defaulting to the configured one."""
+    provider = provider or getattr(settings, 'CURRENCY_RATE_PROVIDER', 'core.currency.FileRateProvider')
+    return import_string(provider)(source or getattr(settings, 'CURRENCY_RATE_SOURCE', None))
+
+
+# --- Rate snapshot file -------------------------------------------------------
+#
+# Layout (little-endian): magic, uint32 count, float64 as_of (epoch seconds),
+# char[3] codes[count] (sorted), zero padding to 8 bytes, then float64
+# rates[count][count] where rates[i][j] converts one codes[i] into codes[j].
+
+SNAPSHOT_MAGIC = b'DTBFX01\0'
+_HEADER = struct.Struct('<8sId')
+
+
+def _matrix_offset(count):
+    return (_HEADER.size + 3 * count + 7) // 8 * 8
+
+
+def write_rate_snapshot(base, rates, as_of, path):
+    """
+    Write a snapshot for RateSnapshot from (base, {code: rate}, as_of). The file
+    is written next to 'path' and moved into place, so readers never see a
+    partial file. Returns the number of currencies.
+    """
+    # Providers' JSON may hold any type: validate every code (the base first) before using it as a key
+    for code in (base, *rates):
+        if not isinstance(code, str) or not CURRENCY_CODE_RE.fullmatch(code):
+            raise ValueError(f"Invalid currency code {code!r}.")
+    rates = {**rates, base: 1.0}
+    for code, rate in rates.items():
+        if isinstance(rate, bool) or not isinstance(rate, (int, float)) or not math.isfinite(rate) or rate <= 0:
+            raise ValueError(f"Invalid rate for {code}: {rate!r}.")
+    codes = sorted(rates)
+    count = len(codes)
+    header = _HEADER.pack(SNAPSHOT_MAGIC, count, as_of.timestamp()) + ''.join(codes).encode('ascii')
+    matrix = struct.pack(f'<{count * count}d', *(rates[target] / rates[source] for source in codes for target in codes))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temporary_path = tempfile.mkstemp(dir=directory, prefix='.rates-')
+    try:
+        with os.fdopen(fd, 'wb') as output:
+            output.write(header.ljust(_matrix_offset(count), b'\0'))
+            output.write(matrix)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+    return count
+
+
+class RateSnapshot:
+    """
+    Read-only view of a snapshot file through mmap. Single lookups unpack one
+    float at a computed offset; batches index a NumPy view of the same pages.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as snapshot_file:
+            stat = os.fstat(snapshot_file.fileno())
+            self._map = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.path = path
+        self.identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        magic, self.count, as_of = _HEADER.unpack_from(self._map, 0)
+        self._matrix = _matrix_offset(self.count)
+        if magic != SNAPSHOT_MAGIC or len(self._map) != self._matrix + 8 * self.count * self.count:
+            raise ValueError(f"{path} is not a rate snapshot written by refresh_currency_rates.")
+        codes = self._map[_HEADER.size:_HEADER.size + 3 * self.count].decode('ascii')
+        self.codes = [codes[i:i + 3] for i in range(0, len(codes), 3)]
+        self.index = {code: i for i, code in enumerate(self.codes)}
+        self.as_of = datetime.fromtimestamp(as_of, tz=dt_timezone.utc)
+
+    def position(self, code):
+        """Row/column of a currency code ('usd' works too). Raises ValueError for unknown codes."""
+        try:
+            return self.index[str(code).strip().upper()]
+        except KeyError:
+            raise ValueError(f"Unknown currency '{code}'.")
+
+    def rate(self, from_code, to_code):
+        """Units of to_code per one from_code."""
+        offset = self._matrix + 8 * (self.position(from_code) * self.count + self.position(to_code))
+        return struct.unpack_from('<d', self._map, offset)[0]
+
+    def convert_many(self, amounts, from_codes, to_codes):
+        """
+        Convert parallel sequences of amounts and currency codes in one
+        vectorised pass over a NumPy view of the mapped matrix (no copy).
+        Returns float64 arrays (results, rates).
+        """
+        if np is None:
+            raise ImproperlyConfigured("Batch currency conversion requires numpy (pip install numpy).")
+        amounts = np.asarray(amounts, dtype=np.float64)
+        if amounts.ndim != 1 or not len(amounts) == len(from_codes) == len(to_codes):
+            raise ValueError("Amounts and currencies must be flat lists of the same length.")
+        positions = {} # Batches usually repeat a handful of codes: resolve each once
+
+        def position(code):
+            if code not in positions:
+                positions[code] = self.position(code)
+            return positions[code]
+
+        rows = np.fromiter(map(position, from_codes), np.intp, len(amounts))
+        columns = np.fromiter(map(position, to_codes), np.intp, len(amounts))
+        matrix = np.frombuffer(self._map, dtype='<f8', count=self.count * self.count, offset=self._matrix)
+        rates = matrix[rows * self.count + columns]
+        with np.errstate(over='ignore', invalid='ignore'): # Overflow is reported below, not warned about
+            results = amounts * rates
+        if not np.isfinite(results).all():
+            raise ValueError(f"Result is not a finite number for amount #{int(np.argmin(np.isfinite(results))) + 1}.")
+        return results, rates
+
+    def metadata(self, now=None):
+        """Freshness of the snapshot, for API responses."""
+        age = max(0.0, ((now or timezone.now()) - self.as_of).total_seconds())
+        return {'as_of': self.as_of.isoformat(), 'age_seconds': round(age), 'stale': age > CURRENCY_RATE_MAX_AGE}
+
+
+_snapshot = None
+_checked_at = 0.0
+_snapshot_lock = threading.Lock()
+
+
+def rate_snapshot():
+    """
+    The CURRENCY_RATE_SNAPSHOT file, mapped once per process and remapped when
+    the refresh worker has replaced it (checked every SNAPSHOT_CHECK_INTERVAL
+    seconds). None until a snapshot has been written.
+    """
+    global _snapshot, _checked_at
+    path = getattr(settings, 'CURRENCY_RATE_SNAPSHOT', None)
+    if not path:
+        return None
+    current = _snapshot if _snapshot is not None and _snapshot.path == path else None
+    if current is not None and time.monotonic() - _checked_at < SNAPSHOT_CHECK_INTERVAL:
+        return current
+    with _snapshot_lock:
+        _checked_at = time.monotonic()
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return current # Keep serving the mapping we have (it stays valid after the file is gone)
+        if current is None or current.identity != (stat.st_ino, stat.st_mtime_ns, stat.st_size):
+            try:
+                # The old mapping is not closed: in-flight requests may still read it; it goes with its last reference
+                _snapshot = current = RateSnapshot(path)
+            except (OSError, ValueError):
+                logger.exception("Could not load currency rate snapshot %s.", path)
+    return current
+
+
+def refresh_rates(provider=None, path=None):
+    """Fetch rates from a provider and write them to the snapshot file. Returns (currency count, as_of)."""
+    provider = provider or rate_provider()
+    path = path or getattr(settings, 'CURRENCY_RATE_SNAPSHOT', None)
+    if not path:
+        raise ValueError("Set CURRENCY_RATE_SNAPSHOT to the path of the rate snapshot file.")
+    base, rates, as_of = provider.fetch()
+    return write_rate_snapshot(base, rates, as_of, path), as_of
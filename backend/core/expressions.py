@@ -0,0 +1,240 @@
+# backend/core/expressions.py
+"""
+Arithmetic expressions for the Online and Quick Calculator tools.
+
+An expression is parsed with ast and checked against a whitelist (numbers,
+variables, + - * / // % ** or ^, and the functions in FUNCTIONS), then compiled
+into nested closures: nothing is ever passed to eval(). Compiled expressions
+are kept in an LRU cache, so a popular expression is parsed once per process.
+The same closures evaluate one binding with floats and math, or a whole batch
+of bindings with NumPy arrays, one vectorised operation per node.
+
+Inputs are bounded (MAX_EXPRESSION_LENGTH characters, MAX_NODES nodes), all
+arithmetic is in floating point so no operation can build a huge integer, and
+batch evaluation stops once it runs past its time limit.
+"""
+import ast
+import math
+import operator
+import time
+from functools import lru_cache, reduce
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+try:
+    import numpy as np
+except ImportError: # numpy is only needed for batch evaluation
+    np = None
+
+MAX_EXPRESSION_LENGTH = 1000
+MAX_NODES = 200
+# Seconds a batch evaluation may take before it is abandoned
+EXPRESSION_TIME_LIMIT = getattr(settings, 'EXPRESSION_TIME_LIMIT', 1.0)
+
+CONSTANTS = {'pi': math.pi, 'e': math.e, 'tau': math.tau}
+# Operator node -> (scalar function, vectorised function). math.pow raises where float ** float would go complex.
+BINARY_OPERATORS = {
+    ast.Add: (operator.add, operator.add), ast.Sub: (operator.sub, operator.sub),
+    ast.Mult: (operator.mul, operator.mul), ast.Div: (operator.truediv, operator.truediv),
+    ast.FloorDiv: (operator.floordiv, operator.floordiv), ast.Mod: (operator.mod, operator.mod),
+    ast.Pow: (math.pow, operator.pow),
+}
+UNARY_OPERATORS = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+
+
+def _log(x, base=None):
+    return math.log(x) if base is None else math.log(x, base)
+
+
+def _vector_log(x, base=None):
+    return np.log(x) if base is None else np.log(x) / np.log(base)
+
+
+def _vector(name):
+    # NumPy functions are looked up on use, so the table can be built without numpy installed
+    return lambda *args: getattr(np, name)(*args)
+
+
+# name -> (scalar function, vectorised function, minimum arguments, maximum arguments or None)
+FUNCTIONS = {
+    'abs': (abs, _vector('abs'), 1, 1),
+    'sqrt': (math.sqrt, _vector('sqrt'), 1, 1),
+    'cbrt': (lambda x: math.copysign(abs(x) ** (1 / 3), x), _vector('cbrt'), 1, 1),
+    'exp': (math.exp, _vector('exp'), 1, 1),
+    'log': (_log, _vector_log, 1, 2),
+    'ln': (math.log, _vector('log'), 1, 1),
+    'log10': (math.log10, _vector('log10'), 1, 1),
+    'log2': (math.log2, _vector('log2'), 1, 1),
+    'sin': (math.sin, _vector('sin'), 1, 1),
+    'cos': (math.cos, _vector('cos'), 1, 1),
+    'tan': (math.tan, _vector('tan'), 1, 1),
+    'asin': (math.asin, _vector('arcsin'), 1, 1),
+    'acos': (math.acos, _vector('arccos'), 1, 1),
+    'atan': (math.atan, _vector('arctan'), 1, 1),
+    'atan2': (math.atan2, _vector('arctan2'), 2, 2),
+    'sinh': (math.sinh, _vector('sinh'), 1, 1),
+    'cosh': (math.cosh, _vector('cosh'), 1, 1),
+    'tanh': (math.tanh, _vector('tanh'), 1, 1),
+    'floor': (math.floor, _vector('floor'), 1, 1),
+    'ceil': (math.ceil, _vector('ceil'), 1, 1),
+    'round': (round, _vector('round'), 1, 1),
+    'hypot': (math.hypot, lambda *args: reduce(np.hypot, args, 0.0), 1, None),
+    'min': (min, lambda *args: reduce(np.minimum, args), 2, None),
+    'max': (max, lambda *args: reduce(np.maximum, args), 2, None),
+}
+
+
+class _Deadline:
+    """Checked after every operation of a batch evaluation."""
+
+    def __init__(self, seconds):
+        self.expires = time.monotonic() + seconds
+
+    def check(self):
+        if time.monotonic() > self.expires:
+            raise ValueError("Evaluation took too long.")
+
+
+class _NoDeadline:
+    def check(self):
+        pass
+
+
+_NO_DEADLINE = _NoDeadline()
+
+
+class Expression:
+    """A validated, compiled expression. Get one with compile_expression()."""
+
+    def __init__(self, text, tree):
+        self.text = text
+        self.variables = tuple(sorted({
+            node.id for node in ast.walk(tree)
+            if isinstance(node, ast.Name) and node.id not in CONSTANTS and node.id not in FUNCTIONS
+        }))
+        self._tree = tree
+        self._scalar = _compile(tree.body, 0)
+        self._vector = None # Compiled on first batch use (needs numpy)
+
+    def _missing(self, bindings):
+        missing = [name for name in self.variables if name not in bindings]
+        if missing:
+            raise ValueError(f"Missing value(s) for: {', '.join(missing)}.")
+
+    def evaluate(self, **bindings):
+        """Value for one binding of the variables (numbers). Raises ValueError for math errors."""
+        self._missing(bindings)
+        try:
+            env = {name: float(bindings[name]) for name in self.variables}
+            result = float(self._scalar(env, _NO_DEADLINE))
+        except ZeroDivisionError:
+            raise ValueError("Division by zero.")
+        except OverflowError:
+            raise ValueError("Result is too large.")
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"Math error: {exc}.")
+        if not math.isfinite(result): # Float arithmetic overflows to infinity without raising
+            raise ValueError("Result is not a finite number.")
+        return result
+
+    def evaluate_many(self, bindings, time_limit=None):
+        """
+        Values for many bindings in one vectorised pass: bindings maps each
+        variable to a list of numbers (all the same length) or a single number.
+        Returns a float64 array; math errors give NaN or infinity instead of raising.
+        """
+        if np is None:
+            raise ImproperlyConfigured("Batch expression evaluation requires numpy (pip install numpy).")
+        self._missing(bindings)
+        env, length = {}, None
+        for name in self.variables:
+            value = np.asarray(bindings[name], dtype=np.float64)
+            if value.ndim > 1 or (value.ndim == 1 and length is not None and len(value) != length):
+                raise ValueError("Variables must be numbers or flat lists of numbers of the same length.")
+            if value.ndim == 1:
+                length = len(value)
+            env[name] = value
+        if self._vector is None:
+            self._vector = _compile(self._tree.body, 1)
+        deadline = _Deadline(EXPRESSION_TIME_LIMIT if time_limit is None else time_limit)
+        with np.errstate(all='ignore'):
+            result = np.asarray(self._vector(env, deadline), dtype=np.float64)
+        return result if result.ndim else np.full(length or 1, result) # Constant if no variable is a list
+
+
+def _compile(node, mode):
+    """Closure (env, deadline) -> value for a validated node; mode 0 uses the scalar functions, 1 the vectorised ones."""
+    if isinstance(node, ast.Constant):
+        # NumPy scalars in batches, so that 1/0 gives infinity rather than raising
+        value = float(node.value) if mode == 0 else np.float64(node.value)
+        return lambda env, deadline: value
+    if isinstance(node, ast.Name):
+        if node.id in CONSTANTS:
+            value = CONSTANTS[node.id] if mode == 0 else np.float64(CONSTANTS[node.id])
+            return lambda env, deadline: value
+        name = node.id
+        return lambda env, deadline: env[name]
+    if isinstance(node, ast.UnaryOp):
+        operand, apply = _compile(node.operand, mode), UNARY_OPERATORS[type(node.op)]
+        return lambda env, deadline: apply(operand(env, deadline))
+    if isinstance(node, ast.BinOp):
+        left, right, apply = _compile(node.left, mode), _compile(node.right, mode), BINARY_OPERATORS[type(node.op)][mode]
+
+        def binary(env, deadline):
+            value = apply(left(env, deadline), right(env, deadline))
+            deadline.check()
+            return value
+        return binary
+    function, arguments = FUNCTIONS[node.func.id][mode], [_compile(argument, mode) for argument in node.args]
+
+    def call(env, deadline):
+        value = function(*(argument(env, deadline) for argument in arguments))
+        deadline.check()
+        return value
+    return call
+
+
+def _validate(tree):
+    nodes = list(ast.walk(tree))
+    if sum(isinstance(node, ast.expr) for node in nodes) > MAX_NODES:
+        raise ValueError(f"Expression is too complex (at most {MAX_NODES} numbers, names, operations and calls).")
+    called = {id(node.func) for node in nodes if isinstance(node, ast.Call)}
+    for node in nodes:
+        if isinstance(node, (ast.BinOp, ast.UnaryOp)):
+            if type(node.op) not in BINARY_OPERATORS and type(node.op) not in UNARY_OPERATORS:
+                raise ValueError(f"Unsupported operator: {type(node.op).__name__}.")
+        elif isinstance(node, ast.Constant):
+            if type(node.value) not in (int, float):
+                raise ValueError(f"Unsupported value: {node.value!r}.")
+        elif isinstance(node, ast.Name):
+            if node.id in FUNCTIONS and id(node) not in called:
+                raise ValueError(f"{node.id} is a function: call it, e.g. {node.id}(x).")
+        elif isinstance(node, ast.Call):
+            name = node.func.id if isinstance(node.func, ast.Name) else None
+            if name not in FUNCTIONS:
+                raise ValueError(f"Unknown function. Available: {', '.join(FUNCTIONS)}.")
+            _, _, minimum, maximum = FUNCTIONS[name]
+            if node.keywords or not minimum <= len(node.args) <= (maximum or MAX_NODES):
+                raise ValueError(f"Wrong number of arguments for {name}().")
+        elif not isinstance(node, (ast.Expression, ast.Load, *BINARY_OPERATORS, *UNARY_OPERATORS)):
+            raise ValueError(f"Unsupported syntax: {type(node).__name__}.")
+
+
+@lru_cache(maxsize=getattr(settings, 'EXPRESSION_CACHE_SIZE', 1024))
+def compile_expression(text):
+    """Parse, validate and compile an expression ('2 * (x + 1)^2'); cached. Raises ValueError."""
+    if not isinstance(text, str) or not text.strip():
+        raise ValueError("Expression is empty.")
+    if len(text) > MAX_EXPRESSION_LENGTH:
+        raise ValueError(f"Expression is too long (at most {MAX_EXPRESSION_LENGTH} characters).")
+    try:
+        # Calculators write powers as 2^10; as Python's XOR it would bind looser than + and *
+        tree = ast.parse(text.strip().replace('^', '**'), mode='eval')
+    except (SyntaxError, RecursionError, MemoryError):
+        raise ValueError("Invalid expression.")
+    _validate(tree)
+    try:
+        return Expression(text, tree)
+    except OverflowError: # A literal beyond the float range
+        raise ValueError("Number is too large.")
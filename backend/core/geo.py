@@ -0,0 +1,175 @@
+# backend/core/geo.py
+"""
+Region targeting for menu items.
+
+Free-text MenuItem.geo_location values ('USA, Europe', 'in', ...) are
+normalised into ISO 3166-1 alpha-2 region codes (MenuItem.geo_regions); an
+empty list means the item is shown everywhere. The region of a request is
+resolved once, from a CDN/proxy header or from a memory-mapped IPv4 range
+database built by manage.py build_geoip_db.
+"""
+import ipaddress
+import mmap
+import re
+import struct
+import threading
+
+from django.conf import settings
+
+# Names people actually type into geo_location, mapped to region codes.
+# Groups (e.g. 'Europe') expand to several codes; 'Global' and friends mean everywhere.
+GLOBAL_ALIASES = {'global', 'worldwide', 'world', 'all', 'any', 'everywhere', '*'}
+REGION_ALIASES = {
+    'usa': ['US'], 'united states': ['US'], 'united states of america': ['US'], 'america': ['US'],
+    'uk': ['GB'], 'united kingdom': ['GB'], 'great britain': ['GB'], 'britain': ['GB'], 'england': ['GB'],
+    'india': ['IN'], 'canada': ['CA'], 'australia': ['AU'], 'new zealand': ['NZ'], 'germany': ['DE'],
+    'france': ['FR'], 'spain': ['ES'], 'italy': ['IT'], 'netherlands': ['NL'], 'ireland': ['IE'],
+    'japan': ['JP'], 'china': ['CN'], 'singapore': ['SG'], 'brazil': ['BR'], 'mexico': ['MX'],
+    'south africa': ['ZA'], 'uae': ['AE'], 'united arab emirates': ['AE'], 'pakistan': ['PK'],
+    'bangladesh': ['BD'], 'nepal': ['NP'], 'sri lanka': ['LK'],
+    'north america': ['CA', 'MX', 'US'],
+    'europe': [
+        'AT', 'BE', 'BG', 'CH', 'CY', 'CZ', 'DE', 'DK', 'EE', 'ES', 'FI', 'FR', 'GB', 'GR', 'HR', 'HU',
+        'IE', 'IS', 'IT', 'LT', 'LU', 'LV', 'MT', 'NL', 'NO', 'PL', 'PT', 'RO', 'SE', 'SI', 'SK',
+    ],
+    'eu': [
+        'AT', 'BE', 'BG', 'CY', 'CZ', 'DE', 'DK', 'EE', 'ES', 'FI', 'FR', 'GR', 'HR', 'HU', 'IE', 'IT',
+        'LT', 'LU', 'LV', 'MT', 'NL', 'PL', 'PT', 'RO', 'SE', 'SI', 'SK',
+    ],
+    'south asia': ['AF', 'BD', 'BT', 'IN', 'LK', 'MV', 'NP', 'PK'],
+}
+# Officially assigned ISO 3166-1 alpha-2 codes: the only regions items can target or requests resolve to
+# (so placeholders such as 'XX', 'T1' or 'ZZ' and made-up codes never create a navbar variant)
+REGION_CODES = frozenset("""
+    AD AE AF AG AI AL AM AO AQ AR AS AT AU AW AX AZ BA BB BD BE BF BG BH BI BJ BL BM BN BO BQ BR BS
+    BT BV BW BY BZ CA CC CD CF CG CH CI CK CL CM CN CO CR CU CV CW CX CY CZ DE DJ DK DM DO DZ EC EE
+    EG EH ER ES ET FI FJ FK FM FO FR GA GB GD GE GF GG GH GI GL GM GN GP GQ GR GS GT GU GW GY HK HM
+    HN HR HT HU ID IE IL IM IN IO IQ IR IS IT JE JM JO JP KE KG KH KI KM KN KP KR KW KY KZ LA LB LC
+    LI LK LR LS LT LU LV LY MA MC MD ME MF MG MH MK ML MM MN MO MP MQ MR MS MT MU MV MW MX MY MZ NA
+    NC NE NF NG NI NL NO NP NR NU NZ OM PA PE PF PG PH PK PL PM PN PR PS PT PW PY QA RE RO RS RU RW
+    SA SB SC SD SE SG SH SI SJ SK SL SM SN SO SR SS ST SV SX SY SZ TC TD TF TG TH TJ TK TL TM TN TO
+    TR TT TV TW TZ UA UG UM US UY UZ VA VC VE VG VI VN VU WF WS YE YT ZA ZM ZW
+""".split())
+# Request headers that carry the client's region, in order of preference. Only list headers an
+# edge proxy/CDN sets (and overwrites on every request): anything else lets clients pick a region.
+GEO_REGION_HEADERS = tuple(getattr(settings, 'GEO_REGION_HEADERS', ()))
+
+
+def region_codes(geo_location):
+    """
+    Normalise a free-text geo_location into a sorted list of region codes.
+    An empty list means 'everywhere' (blank, 'Global', or nothing recognisable).
+    """
+    codes = set()
+    for token in re.split(r'[,;/|]+', geo_location or ''):
+        token = ' '.join(token.split()).lower()
+        if not token:
+            continue
+        if token in GLOBAL_ALIASES:
+            return []
+        if token in REGION_ALIASES:
+            codes.update(REGION_ALIASES[token])
+        elif token.upper() in REGION_CODES:
+            codes.add(token.upper())
+    return sorted(codes)
+
+
+def normalize_region(value):
+    """A header value such as 'in' -> 'IN'; None for anything that is not a known region code."""
+    value = (value or '').strip().upper()
+    return value if value in REGION_CODES else None
+
+
+# --- IPv4 range database ------------------------------------------------------
+#
+# Layout (little-endian): magic, uint32 count, then three parallel arrays sorted
+# by range start: uint32 starts[count], uint32 ends[count], char[2] codes[count].
+
+GEOIP_MAGIC = b'DTBGEO1\0'
+_HEADER = struct.Struct('<8sI')
+
+
+def write_geoip_database(ranges, path):
+    """Write (start_ip, end_ip, region_code) IPv4 ranges to a database file for GeoIPDatabase."""
+    ranges = sorted((int(start), int(end), code.upper().encode('ascii')) for start, end, code in ranges)
+    with open(path, 'wb') as output:
+        output.write(_HEADER.pack(GEOIP_MAGIC, len(ranges)))
+        output.write(struct.pack(f'<{len(ranges)}I', *(start for start, _, _ in ranges)))
+        output.write(struct.pack(f'<{len(ranges)}I', *(end for _, end, _ in ranges)))
+        output.write(b''.join(code for _, _, code in ranges))
+    return len(ranges)
+
+
+class GeoIPDatabase:
+    """
+    Read-only IPv4 -> region lookups over a memory-mapped database file.
+
+    Nothing is parsed up front: the OS pages in only the parts a binary search
+    touches, and the mapping is shared by every worker on the machine.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as db_file:
+            self._map = mmap.mmap(db_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count = _HEADER.unpack_from(self._map, 0)
+        if magic != GEOIP_MAGIC or len(self._map) != _HEADER.size + self.count * 10:
+            self._map.close()
+            raise ValueError(f"{path} is not a geo IP database built by build_geoip_db.")
+        self._starts = _HEADER.size
+        self._ends = self._starts + 4 * self.count
+        self._codes = self._ends + 4 * self.count
+
+    def _start(self, index):
+        return struct.unpack_from('<I', self._map, self._starts + 4 * index)[0]
+
+    def lookup(self, ip):
+        """Region code for an IPv4 address string, or None."""
+        try:
+            address = int(ipaddress.IPv4Address(ip))
+        except (ipaddress.AddressValueError, ValueError):
+            return None
+        low, high = 0, self.count # Find the last range starting at or before the address
+        while low < high:
+            middle = (low + high) // 2
+            if self._start(middle) <= address:
+                low = middle + 1
+            else:
+                high = middle
+        index = low - 1
+        if index < 0 or struct.unpack_from('<I', self._map, self._ends + 4 * index)[0] < address:
+            return None
+        return normalize_region(self._map[self._codes + 2 * index:self._codes + 2 * index + 2].decode('ascii'))
+
+    def close(self):
+        self._map.close()
+
+
+_database = None
+_database_lock = threading.Lock()
+
+
+def geoip_database():
+    """The configured GEOIP_DATABASE, opened once per process (None if not configured or unreadable)."""
+    global _database
+    path = getattr(settings, 'GEOIP_DATABASE', None)
+    if _database is None and path:
+        with _database_lock:
+            if _database is None:
+                try:
+                    _database = GeoIPDatabase(path)
+                except (OSError, ValueError):
+                    _database = False # Don't retry on every request
+    return _database or None
+
+
+def request_region(request):
+    """
+    Region of a request: the first usable value of a trusted GEO_REGION_HEADERS
+    header (set by the CDN), else the client address looked up in GEOIP_DATABASE, else None.
+    """
+    for header in GEO_REGION_HEADERS:
+        region = normalize_region(request.headers.get(header))
+        if region:
+            return region
+    database = geoip_database()
+    return database.lookup(request.META.get('REMOTE_ADDR')) if database else None
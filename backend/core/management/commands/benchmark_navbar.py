@@ -0,0 +1,72 @@
+# backend/core/management/commands/benchmark_navbar.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from core.models import MenuItem
+from core.navbar import build_menu_items, navbar_payload, serialize_menu_items
+from core.renderers import FastJSONRenderer
+from core.serializers import MENU_ITEM_PROFILES
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the navbar payload: MenuItemSerializer + JSONRenderer versus the "
+        "values() fast path + FastJSONRenderer. Optionally seeds synthetic menu items "
+        "inside a transaction that is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=0, help="Synthetic top-level items to seed (default: use existing data).")
+        parser.add_argument('--children', type=int, default=5, help="Dropdown items per seeded top-level item.")
+        parser.add_argument('--iterations', type=int, default=50, help="Payloads to build per path.")
+        parser.add_argument('--profile', choices=[name for name in MENU_ITEM_PROFILES], help="Field profile to benchmark.")
+
+    def handle(self, *args, **options):
+        projection = {'profile': options['profile']}
+        with transaction.atomic():
+            if options['items']:
+                self.seed(options['items'], options['children'])
+
+            serializer_body, serializer_time = self.measure(
+                lambda: JSONRenderer().render(navbar_payload(serialize_menu_items(**projection))),
+                options['iterations'],
+            )
+            fast_body, fast_time = self.measure(
+                lambda: FastJSONRenderer().render(navbar_payload(build_menu_items(**projection))),
+                options['iterations'],
+            )
+            live_items = MenuItem.live.count()
+            transaction.set_rollback(True) # Never keep the synthetic rows
+
+        if fast_body != serializer_body:
+            raise CommandError("Fast path output differs from the serializer output.")
+
+        self.stdout.write(f"Menu items: {live_items} live, payload {len(fast_body)} bytes")
+        self.stdout.write(f"Serializer path: {options['iterations'] / serializer_time:10.1f} payloads/s")
+        self.stdout.write(f"Fast path:       {options['iterations'] / fast_time:10.1f} payloads/s")
+        self.stdout.write(self.style.SUCCESS(f"Speed-up: {serializer_time / fast_time:.1f}x (identical output)"))
+
+    def measure(self, build_payload, iterations):
+        body = build_payload() # Warm up (and keep one payload for the comparison)
+        started = time.perf_counter()
+        for _ in range(iterations):
+            build_payload()
+        return body, time.perf_counter() - started
+
+    def seed(self, items, children):
+        parents = MenuItem.objects.bulk_create(
+            MenuItem(
+                title=f"Benchmark Menu {i}", order=i, is_dropdown=True, tool_domain='benchmark',
+                seo_title=f"Benchmark Menu {i}", seo_description="Synthetic item " * 10,
+                analytics_data={'views': i, 'clicks': i // 2},
+            )
+            for i in range(items)
+        )
+        MenuItem.objects.bulk_create(
+            MenuItem(title=f"Benchmark Tool {i}.{j}", order=j, parent_menu=parent, url=f"/tools/{i}/{j}")
+            for i, parent in enumerate(parents)
+            for j in range(children)
+        )
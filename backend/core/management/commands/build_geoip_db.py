@@ -0,0 +1,44 @@
+# backend/core/management/commands/build_geoip_db.py
+import csv
+import ipaddress
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.geo import normalize_region, write_geoip_database
+
+
+def parse_ipv4(value):
+    """'1.2.3.4' or '16909060' -> int; None for IPv6 or anything unparseable."""
+    value = value.strip()
+    try:
+        return int(value) if value.isdigit() else int(ipaddress.IPv4Address(value))
+    except ValueError:
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the memory-mapped IPv4 -> region database used for geo-targeted menus (settings.GEOIP_DATABASE) "
+        "from a CSV of 'range start, range end, country code' rows (dotted or integer IPs, e.g. a DB-IP or "
+        "IP2Location Lite country export). IPv6 and malformed rows are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help="CSV file of start_ip,end_ip,country_code rows.")
+        parser.add_argument('output', help="Database file to write (point GEOIP_DATABASE at it).")
+
+    def handle(self, *args, **options):
+        ranges, skipped = [], 0
+        try:
+            with open(options['source'], newline='', encoding='utf-8') as source:
+                for row in csv.reader(source):
+                    start, end = (parse_ipv4(row[0]), parse_ipv4(row[1])) if len(row) >= 3 else (None, None)
+                    region = normalize_region(row[2]) if len(row) >= 3 else None
+                    if start is None or end is None or region is None or start > end:
+                        skipped += 1
+                        continue
+                    ranges.append((start, end, region))
+            count = write_geoip_database(ranges, options['output'])
+        except OSError as exc:
+            raise CommandError(exc)
+        self.stdout.write(f"Wrote {count} IPv4 range(s) to {options['output']} ({skipped} row(s) skipped).")
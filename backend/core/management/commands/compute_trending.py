@@ -0,0 +1,47 @@
+# backend/core/management/commands/compute_trending.py
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from core.trending import TRENDING_HALF_LIFE_HOURS, TRENDING_TOP_N, TRENDING_WINDOW_DAYS, compute_trending
+
+
+class Command(BaseCommand):
+    help = (
+        "Score menu items by time-decayed usage (core.MenuItemEvent) and mark the top N per "
+        "tool_domain as trending. Runs once, or keeps recomputing with --loop."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=TRENDING_TOP_N, help=f"Trending items per tool domain (default: {TRENDING_TOP_N}).")
+        parser.add_argument('--half-life', type=float, default=TRENDING_HALF_LIFE_HOURS, help=f"Hours for an event's weight to halve (default: {TRENDING_HALF_LIFE_HOURS}).")
+        parser.add_argument('--window', type=float, default=TRENDING_WINDOW_DAYS, help=f"Days of events to read (default: {TRENDING_WINDOW_DAYS}).")
+        parser.add_argument('--loop', action='store_true', help="Keep running, recomputing every --interval seconds.")
+        parser.add_argument('--interval', type=float, default=900, help="Seconds between runs in --loop mode (default: 900).")
+
+    def handle(self, *args, **options):
+        if not options['loop']:
+            self.compute(options)
+            return
+
+        self.stdout.write(f"Recomputing trending items every {options['interval']:g}s (Ctrl+C to stop).")
+        try:
+            while True:
+                self.compute(options)
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write("Stopped.")
+
+    def compute(self, options):
+        started = time.perf_counter()
+        try:
+            turned_on, turned_off = compute_trending(
+                top_n=options['top'], half_life_hours=options['half_life'], window_days=options['window'],
+            )
+        except ImproperlyConfigured as exc:
+            raise CommandError(exc)
+        self.stdout.write(
+            f"Trending updated in {time.perf_counter() - started:.2f}s: "
+            f"{turned_on} item(s) now trending, {turned_off} no longer trending."
+        )
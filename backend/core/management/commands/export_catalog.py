@@ -0,0 +1,32 @@
+# backend/core/management/commands/export_catalog.py
+from django.core.management.base import BaseCommand, CommandError
+
+from core.catalog_io import CATALOG_FORMATS, catalog_format, export_catalog
+
+
+class Command(BaseCommand):
+    help = "Stream all core menu items to a CSV or JSON Lines file (or stdout)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', nargs='?', default='-', help="Output file ('-' for stdout, the default).")
+        parser.add_argument('--format', choices=CATALOG_FORMATS, help="Defaults to the output file's extension, else csv.")
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or catalog_format(options['output'])
+        if options['output'] == '-':
+            self.write_rows(self.stdout, fmt)
+            return
+        try:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+                count = self.write_rows(output, fmt)
+        except OSError as exc:
+            raise CommandError(exc)
+        self.stderr.write(f"Exported {count} menu item(s) to {options['output']}.")
+
+    def write_rows(self, output, fmt):
+        count = -1 if fmt == 'csv' else 0 # The CSV header is not an item
+        write = output.write if output is not self.stdout else lambda line: self.stdout.write(line, ending='')
+        for line in export_catalog(fmt):
+            write(line)
+            count += 1
+        return count
@@ -0,0 +1,40 @@
+# backend/core/management/commands/import_catalog.py
+from django.core.management.base import BaseCommand, CommandError
+
+from core.catalog_io import CATALOG_FORMATS, IMPORT_BATCH_SIZE, catalog_format, import_catalog, read_catalog, text_stream
+
+
+class Command(BaseCommand):
+    help = (
+        "Create or update core menu items from a CSV or JSON Lines file, matched by title. "
+        "Re-running with the same file changes nothing."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV (.csv) or JSON Lines (.jsonl/.ndjson) file to import.")
+        parser.add_argument('--format', choices=CATALOG_FORMATS, help="Defaults to the file's extension, else csv.")
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE, help=f"Rows per write (default: {IMPORT_BATCH_SIZE}).")
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or catalog_format(options['path'])
+        try:
+            with open(options['path'], 'rb') as binary_file:
+                result = import_catalog(
+                    read_catalog(text_stream(binary_file), fmt),
+                    batch_size=options['batch_size'],
+                    progress=self.report_progress,
+                )
+        except (OSError, UnicodeDecodeError) as exc:
+            raise CommandError(exc)
+
+        for error in result.errors:
+            self.stderr.write(f"line {error['line']}: {error['error']}" if error['line'] else error['error'])
+        if result.error_count > len(result.errors):
+            self.stderr.write(f"... and {result.error_count - len(result.errors)} more error(s).")
+        self.stdout.write(
+            f"Imported {result.rows} row(s): {result.created} created, {result.updated} updated, "
+            f"{result.unchanged} unchanged, {result.error_count} error(s)."
+        )
+
+    def report_progress(self, result):
+        self.stderr.write(f"  {result.rows} row(s) processed...")
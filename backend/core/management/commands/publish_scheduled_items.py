@@ -0,0 +1,52 @@
+# backend/core/management/commands/publish_scheduled_items.py
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.menu_cache import invalidate_items
+from core.models import MenuItem
+from core.typeahead import invalidate_typeahead
+from menu.models import MenuItem as MenuAppMenuItem
+
+
+class Command(BaseCommand):
+    help = (
+        "Publish menu items whose scheduled_at has passed (core and menu apps). "
+        "Runs once, or keeps polling with --loop (e.g. as a long-running worker)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help="Keep running, checking every --interval seconds.")
+        parser.add_argument('--interval', type=float, default=60, help="Seconds between checks in --loop mode (default: 60).")
+
+    def handle(self, *args, **options):
+        if not options['loop']:
+            self.publish_due_items()
+            return
+
+        self.stdout.write(f"Publishing scheduled menu items every {options['interval']:g}s (Ctrl+C to stop).")
+        try:
+            while True:
+                self.publish_due_items()
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write("Stopped.")
+
+    def publish_due_items(self):
+        now = timezone.now()
+        # One indexed lookup + one batched UPDATE per model
+        published_regions = MenuItem.objects.publish_due(now)
+        menu_app_published = MenuAppMenuItem.objects.publish_due(now)
+
+        # Only the core navbar is cached (and searchable); leave it alone when nothing was due,
+        # and only refresh the regions the published items target
+        if published_regions:
+            invalidate_items(published_regions)
+            invalidate_typeahead()
+
+        if published_regions or menu_app_published:
+            self.stdout.write(
+                f"{now:%Y-%m-%d %H:%M:%S} published {len(published_regions)} core and {menu_app_published} menu item(s)."
+            )
+        return len(published_regions) + menu_app_published
@@ -0,0 +1,46 @@
+# backend/core/management/commands/refresh_currency_rates.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.currency import rate_provider, refresh_rates
+
+
+class Command(BaseCommand):
+    help = (
+        "Fetch exchange rates from settings.CURRENCY_RATE_PROVIDER and write the memory-mapped rate snapshot "
+        "(settings.CURRENCY_RATE_SNAPSHOT) read by the currency endpoints. Runs once, or keeps refreshing "
+        "with --loop (e.g. as a long-running worker); a failed refresh keeps the previous snapshot."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--provider', help="Provider class (dotted path) instead of CURRENCY_RATE_PROVIDER.")
+        parser.add_argument('--source', help="Provider source (file path or URL) instead of CURRENCY_RATE_SOURCE.")
+        parser.add_argument('--output', help="Snapshot file to write instead of CURRENCY_RATE_SNAPSHOT.")
+        parser.add_argument('--loop', action='store_true', help="Keep running, refreshing every --interval seconds.")
+        parser.add_argument('--interval', type=float, default=3600, help="Seconds between refreshes in --loop mode (default: 3600).")
+
+    def handle(self, *args, **options):
+        provider = rate_provider(options['provider'], options['source'])
+        if not options['loop']:
+            try:
+                self.refresh(provider, options['output'])
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Could not refresh currency rates: {exc}")
+            return
+
+        self.stdout.write(f"Refreshing currency rates every {options['interval']:g}s (Ctrl+C to stop).")
+        try:
+            while True:
+                try:
+                    self.refresh(provider, options['output'])
+                except (OSError, ValueError) as exc:
+                    self.stderr.write(f"Could not refresh currency rates: {exc}")
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write("Stopped.")
+
+    def refresh(self, provider, output):
+        count, as_of = refresh_rates(provider, output)
+        self.stdout.write(f"Wrote rates for {count} currencies as of {as_of:%Y-%m-%d %H:%M:%S %Z}.")
+        return count
@@ -0,0 +1,132 @@
+# backend/core/menu_cache.py
+import gzip
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError: # brotli is optional; responses then fall back to gzip
+    brotli = None
+
+# Bumped whenever menu data changes; every cached payload key embeds it, so a
+# bump makes all stale payloads unreachable (they then age out of the cache).
+MENU_VERSION_KEY = 'core:menu:version'
+# Per-region versions: bumped when an item targeting that region changes, so
+# only that region's variants are rebuilt (see invalidate_menu_cache(regions=...)).
+REGION_VERSION_KEY = 'core:menu:version:{}'
+MENU_CACHE_TIMEOUT = getattr(settings, 'MENU_CACHE_TIMEOUT', 60 * 60 * 24)
+
+# Content codings we precompute, in order of preference
+PAYLOAD_ENCODINGS = ('br', 'gzip') if brotli else ('gzip',)
+
+
+def menu_version(key=MENU_VERSION_KEY):
+    """Current menu data version (seeded from the clock so it never restarts at an old value)."""
+    version = cache.get(key)
+    if version is None:
+        version = int(time.time() * 1000)
+        cache.add(key, version, None)
+        version = cache.get(key, version)
+    return version
+
+
+def bump_version(key=MENU_VERSION_KEY):
+    """Advance a version counter shared by all processes and return the new version."""
+    try:
+        return cache.incr(key)
+    except ValueError: # Version not set (or evicted): start a new one
+        return menu_version(key)
+
+
+def invalidate_menu_cache(regions=None):
+    """
+    Make cached menu payloads stale. Call once per change, not once per row.
+
+    With 'regions' (codes of items that only target those regions), only those
+    regions' variants are invalidated; otherwise every variant is.
+    """
+    keys = [REGION_VERSION_KEY.format(region) for region in regions] if regions else [MENU_VERSION_KEY]
+    for key in keys:
+        bump_version(key)
+
+
+def invalidate_items(geo_regions):
+    """
+    Make stale the payload variants some items appear in, from each item's
+    geo_regions: only their regions if every item is targeted, else all variants.
+    """
+    geo_regions = list(geo_regions)
+    if all(geo_regions):
+        invalidate_menu_cache(regions=sorted(set().union(*geo_regions)))
+    else:
+        invalidate_menu_cache()
+
+
+def payload_version(region=None):
+    """Cache-key version of a payload variant: the global version plus the region's own."""
+    if region is None:
+        return str(menu_version())
+    return f"{menu_version()}.{menu_version(REGION_VERSION_KEY.format(region))}"
+
+
+def compress_payload(body):
+    """Precompute every supported encoding of a rendered payload, plus a (weak) ETag shared by all of them."""
+    encodings = {'identity': body, 'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli:
+        encodings['br'] = brotli.compress(body, quality=11)
+    return {'etag': f'W/"{hashlib.sha256(body).hexdigest()[:32]}"', 'encodings': encodings}
+
+
+def get_compressed_payload(variant, build, cacheable=True, region=None):
+    """
+    Return the precompressed payload for a menu variant, rendering it on a miss.
+
+    'variant' identifies the response (e.g. the selected fields) and 'region' the
+    geo variant it was built for; 'build' returns the rendered bytes. 'cacheable'
+    may be a callable, evaluated on a miss, that returns False to serve the
+    payload without storing it.
+    """
+    key = f"core:menu:{payload_version(region)}:{region or '-'}:{hashlib.sha256(variant.encode()).hexdigest()}"
+    payload = cache.get(key)
+    if payload is None:
+        payload = compress_payload(build())
+        if cacheable() if callable(cacheable) else cacheable:
+            cache.set(key, payload, MENU_CACHE_TIMEOUT)
+    return payload
+
+
+def negotiate_encoding(accept_encoding):
+    """Pick the best precomputed coding allowed by an Accept-Encoding header ('identity' if none)."""
+    accepted = {}
+    for part in (accept_encoding or '').split(','):
+        coding, _, params = part.strip().partition(';')
+        quality = 1.0
+        if params.strip().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    for coding in PAYLOAD_ENCODINGS:
+        if accepted.get(coding, accepted.get('*', 0)) > 0:
+            return coding
+    return 'identity'
+
+
+def payload_response(request, payload, content_type='application/json'):
+    """Serve a precompressed payload in the best encoding the client accepts (304 if unchanged)."""
+    if request.headers.get('If-None-Match') == payload['etag']:
+        response = HttpResponseNotModified()
+    else:
+        coding = negotiate_encoding(request.headers.get('Accept-Encoding'))
+        response = HttpResponse(payload['encodings'][coding], content_type=content_type)
+        if coding != 'identity':
+            response['Content-Encoding'] = coding
+    response['ETag'] = payload['etag']
+    patch_vary_headers(response, ['Accept-Encoding'])
+    return response
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='menuitem',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_archived', False), ('is_deleted', False), ('is_hidden', False), ('is_published', True), ('is_visible', True)), fields=['parent_menu', 'order'], name='core_menuitem_live_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_menuitem_core_menuitem_live_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='menuitem',
+            index=models.Index(condition=models.Q(('is_scheduled', True)), fields=['scheduled_at'], name='core_menuitem_scheduled_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_menuitem_scheduled_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MenuItemEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(choices=[('view', 'View'), ('click', 'Click')], help_text='What happened: the tool was viewed or its menu entry was clicked.', max_length=10)),
+                ('occurred_at', models.DateTimeField(db_index=True, help_text='When the event happened (as reported by the client, clamped to the server clock).')),
+                ('menu_item', models.ForeignKey(help_text='The menu item (tool) the event was recorded for.', on_delete=django.db.models.deletion.CASCADE, related_name='events', to='core.menuitem')),
+            ],
+            options={
+                'verbose_name': 'Menu Item Event',
+                'verbose_name_plural': 'Menu Item Events',
+            },
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:34
+
+import re
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+# A frozen copy of core.geo.region_codes() as it was when this migration was
+# written, so later changes to the aliases don't change what the backfill did.
+GLOBAL_ALIASES = {'global', 'worldwide', 'world', 'all', 'any', 'everywhere', '*'}
+REGION_ALIASES = {
+    'usa': ['US'], 'united states': ['US'], 'united states of america': ['US'], 'america': ['US'],
+    'uk': ['GB'], 'united kingdom': ['GB'], 'great britain': ['GB'], 'britain': ['GB'], 'england': ['GB'],
+    'india': ['IN'], 'canada': ['CA'], 'australia': ['AU'], 'new zealand': ['NZ'], 'germany': ['DE'],
+    'france': ['FR'], 'spain': ['ES'], 'italy': ['IT'], 'netherlands': ['NL'], 'ireland': ['IE'],
+    'japan': ['JP'], 'china': ['CN'], 'singapore': ['SG'], 'brazil': ['BR'], 'mexico': ['MX'],
+    'south africa': ['ZA'], 'uae': ['AE'], 'united arab emirates': ['AE'], 'pakistan': ['PK'],
+    'bangladesh': ['BD'], 'nepal': ['NP'], 'sri lanka': ['LK'],
+    'north america': ['CA', 'MX', 'US'],
+    'europe': [
+        'AT', 'BE', 'BG', 'CH', 'CY', 'CZ', 'DE', 'DK', 'EE', 'ES', 'FI', 'FR', 'GB', 'GR', 'HR', 'HU',
+        'IE', 'IS', 'IT', 'LT', 'LU', 'LV', 'MT', 'NL', 'NO', 'PL', 'PT', 'RO', 'SE', 'SI', 'SK',
+    ],
+    'eu': [
+        'AT', 'BE', 'BG', 'CY', 'CZ', 'DE', 'DK', 'EE', 'ES', 'FI', 'FR', 'GR', 'HR', 'HU', 'IE', 'IT',
+        'LT', 'LU', 'LV', 'MT', 'NL', 'PL', 'PT', 'RO', 'SE', 'SI', 'SK',
+    ],
+    'south asia': ['AF', 'BD', 'BT', 'IN', 'LK', 'MV', 'NP', 'PK'],
+}
+REGION_CODE_RE = re.compile(r'^[A-Z]{2}$')
+UNKNOWN_REGIONS = {'XX', 'T1', 'A1', 'A2', 'ZZ'}
+
+
+def region_codes(geo_location):
+    codes = set()
+    for token in re.split(r'[,;/|]+', geo_location or ''):
+        token = ' '.join(token.split()).lower()
+        if not token:
+            continue
+        if token in GLOBAL_ALIASES:
+            return []
+        if token in REGION_ALIASES:
+            codes.update(REGION_ALIASES[token])
+        elif REGION_CODE_RE.match(token.upper()) and token.upper() not in UNKNOWN_REGIONS:
+            codes.add(token.upper())
+    return sorted(codes)
+
+
+def parse_geo_locations(apps, schema_editor):
+    """Backfill geo_regions from the existing free-text geo_location values."""
+    MenuItem = apps.get_model('core', 'MenuItem')
+    items = list(MenuItem.objects.exclude(geo_location__isnull=True).exclude(geo_location='').only('id', 'geo_location'))
+    for item in items:
+        item.geo_regions = region_codes(item.geo_location)
+    MenuItem.objects.bulk_update(items, ['geo_regions'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_menuitemevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='menuitem',
+            name='geo_regions',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=2), blank=True, default=list, editable=False, help_text="Region codes parsed from geo_location (e.g., ['GB', 'US']); empty means shown everywhere.", size=None),
+        ),
+        migrations.RunPython(parse_geo_locations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+from django.db import DatabaseError, migrations, transaction
+
+TRIGRAM_INDEX = 'core_menuitem_title_trgm_idx'
+
+
+def create_trigram_index(apps, schema_editor):
+    """
+    Typo-tolerant title search needs the pg_trgm extension. It is optional:
+    where it cannot be installed (no permission, not shipped with the server)
+    core.search simply skips its trigram fallback.
+    """
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    except DatabaseError:
+        return
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {TRIGRAM_INDEX} ON core_menuitem USING gin (title gin_trgm_ops)"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    schema_editor.execute(f"DROP INDEX IF EXISTS {TRIGRAM_INDEX}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_menuitem_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
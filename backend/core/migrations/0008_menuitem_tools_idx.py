@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_menuitem_title_trgm_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='menuitem',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_archived', False), ('is_deleted', False), ('is_hidden', False), ('is_published', True), ('is_visible', True), ('is_dropdown', False)), fields=['order', 'id'], name='core_menuitem_tools_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='menuitem',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_archived', False), ('is_deleted', False), ('is_hidden', False), ('is_published', True), ('is_visible', True), ('is_dropdown', False)), fields=['tool_domain', 'order', 'id'], name='core_menuitem_tools_domain_idx'),
+        ),
+    ]
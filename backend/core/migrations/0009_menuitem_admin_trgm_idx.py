@@ -0,0 +1,34 @@
+from django.db import migrations
+
+# Trigram indexes that let the admin search fall back to ILIKE on url and
+# geo_location (title already has core_menuitem_title_trgm_idx).
+TRIGRAM_INDEXES = {
+    'core_menuitem_url_trgm_idx': 'url',
+    'core_menuitem_geo_location_trgm_idx': 'geo_location',
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """Only where 0007 could install pg_trgm; without it the admin skips its ILIKE fallback."""
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+        if not cursor.fetchone()[0]:
+            return
+    for name, column in TRIGRAM_INDEXES.items():
+        schema_editor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON core_menuitem USING gin ({column} gin_trgm_ops)")
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    for name in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_menuitem_tools_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -1,8 +1,13 @@
 # backend/core/models.py
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.utils import timezone # Import timezone for auto_now_add/auto_now
 
+from .geo import region_codes
+
 # Get the custom user model (if defined) or Django's default User
 User = get_user_model()
 
@@ -14,6 +19,86 @@ ACCESS_LEVEL_CHOICES = [
     ('private', 'Private (Accessible by specific users/groups)'),
 ]
 
+# Access levels each kind of caller may see. There are no per-user grants, so
+# 'private' items are limited to staff.
+ROLE_ACCESS_LEVELS = {
+    'anonymous': ('public',),
+    'registered': ('public', 'registered'),
+    'staff': ('public', 'registered', 'admin', 'private'),
+}
+
+
+def access_role(user):
+    """The ROLE_ACCESS_LEVELS key for a request user."""
+    if user is None or not user.is_authenticated:
+        return 'anonymous'
+    return 'staff' if user.is_staff else 'registered'
+
+# Items that may appear in public navigation: active, visible, published and
+# NOT hidden, archived, or deleted. Shared by MenuItem.live and its partial index.
+LIVE_MENU_ITEM_FILTER = models.Q(
+    is_active=True,
+    is_visible=True,
+    is_published=True,
+    is_hidden=False,
+    is_archived=False,
+    is_deleted=False,
+)
+
+
+# Text search configuration of MenuItem.search_vector (queries must use the same one)
+SEARCH_CONFIG = 'english'
+
+
+class MenuItemQuerySet(models.QuerySet):
+    def live(self):
+        """Restrict to items that may be shown publicly."""
+        return self.filter(LIVE_MENU_ITEM_FILTER)
+
+    def for_role(self, role):
+        """Items a caller with this role (see access_role) may see."""
+        return self.filter(access_level__in=ROLE_ACCESS_LEVELS[role])
+
+    def for_region(self, region):
+        """Items shown in a region: untargeted items plus those targeting it (region None: untargeted only)."""
+        everywhere = models.Q(geo_regions=[])
+        return self.filter(everywhere | models.Q(geo_regions__contains=[region]) if region else everywhere)
+
+    def due_for_publication(self, now=None):
+        """
+        Unpublished scheduled items whose scheduled_at has passed (served by the
+        scheduled-items partial index). Items that are already live are left
+        alone, so their published_at/published_by are never overwritten.
+        """
+        return self.filter(is_scheduled=True, is_published=False, scheduled_at__lte=now or timezone.now())
+
+    def publish_due(self, now=None):
+        """
+        Publish every due scheduled item with a single UPDATE and return the
+        geo_regions of each published item (so callers refresh only those regions).
+        published_at is the scheduled time and published_by the user who scheduled the item.
+        """
+        now = now or timezone.now()
+        with transaction.atomic(savepoint=False):
+            # Locked, so the regions returned are those of exactly the rows updated
+            due = dict(self.due_for_publication(now).select_for_update().values_list('pk', 'geo_regions'))
+            if due:
+                self.filter(pk__in=due).update(
+                    is_published=True,
+                    is_scheduled=False,
+                    published_at=models.F('scheduled_at'),
+                    published_by=models.F('scheduled_by'),
+                    updated_at=now,
+                )
+        return list(due.values())
+
+
+class LiveMenuItemManager(models.Manager.from_queryset(MenuItemQuerySet)):
+    """Manager for public read paths: MenuItem.live.filter(...) only ever sees live items."""
+    def get_queryset(self):
+        return super().get_queryset().live()
+
+
 class MenuItem(models.Model):
     """
     Comprehensive model for menu items in a Single Page Application (SPA).
@@ -179,6 +264,17 @@ class MenuItem(models.Model):
         default=True,
         help_text="Indicates if this menu item should be indexed by search engines."
     )
+    search_vector = models.GeneratedField(
+        # Maintained by PostgreSQL on every write, including bulk updates and imports
+        expression=(
+            SearchVector('title', weight='A', config=SEARCH_CONFIG)
+            + SearchVector('seo_title', 'tool_domain', weight='B', config=SEARCH_CONFIG)
+            + SearchVector('seo_description', weight='C', config=SEARCH_CONFIG)
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+        help_text="Weighted full-text vector of the title (A), SEO title and tool domain (B) and SEO description (C)."
+    )
     is_cacheable = models.BooleanField(
         default=True,
         help_text="Indicates if content related to this menu item can be cached for performance."
@@ -191,6 +287,13 @@ class MenuItem(models.Model):
         null=True,
         help_text="Geographical location or target audience for the menu item (e.g., 'USA', 'Europe')."
     )
+    geo_regions = ArrayField(
+        models.CharField(max_length=2),
+        default=list,
+        blank=True,
+        editable=False,
+        help_text="Region codes parsed from geo_location (e.g., ['GB', 'US']); empty means shown everywhere."
+    )
 
     # Analytics & Tracking
     analytics_data = models.JSONField(
@@ -277,10 +380,42 @@ class MenuItem(models.Model):
         help_text="User who deleted this menu item."
     )
 
+    objects = MenuItemQuerySet.as_manager() # Default manager (admin, audit, etc.)
+    live = LiveMenuItemManager() # Public navigation: only live items
+
     class Meta:
         ordering = ['order', 'title'] # Order by 'order' then 'title'
         verbose_name = "Menu Item"
         verbose_name_plural = "Menu Items"
+        indexes = [
+            # Partial index matching MenuItem.live, so the navbar query is an index range scan
+            # no matter how many archived/deleted rows accumulate.
+            models.Index(
+                fields=['parent_menu', 'order'],
+                condition=LIVE_MENU_ITEM_FILTER,
+                name='core_menuitem_live_idx',
+            ),
+            # Lets the scheduled publishing worker find due items without scanning the table
+            models.Index(
+                fields=['scheduled_at'],
+                condition=models.Q(is_scheduled=True),
+                name='core_menuitem_scheduled_idx',
+            ),
+            # Keyset pagination of the tool catalog (/api/tools/), overall and within a domain:
+            # the next page is an index range scan starting right after the last (order, id) seen
+            models.Index(
+                fields=['order', 'id'],
+                condition=LIVE_MENU_ITEM_FILTER & models.Q(is_dropdown=False),
+                name='core_menuitem_tools_idx',
+            ),
+            models.Index(
+                fields=['tool_domain', 'order', 'id'],
+                condition=LIVE_MENU_ITEM_FILTER & models.Q(is_dropdown=False),
+                name='core_menuitem_tools_domain_idx',
+            ),
+            # Full-text search (core.search) without scanning the table
+            GinIndex(fields=['search_vector'], name='core_menuitem_search_idx'),
+        ]
 
     def __str__(self):
         # Improve string representation for nested items
@@ -289,7 +424,8 @@ class MenuItem(models.Model):
         return self.title
 
     def save(self, *args, **kwargs):
-        """Override save to handle timestamps and publication/archive logic."""
+        """Override save to handle timestamps, publication/archive logic and region targeting."""
+        self.geo_regions = region_codes(self.geo_location)
         if self.is_published and not self.published_at:
             self.published_at = timezone.now()
         if self.is_archived and not self.archived_at:
@@ -297,3 +433,41 @@ class MenuItem(models.Model):
         if self.is_deleted and not self.deleted_at:
             self.deleted_at = timezone.now()
         super().save(*args, **kwargs)
+
+
+class MenuItemEvent(models.Model):
+    """
+    Append-only log of usage events (views and clicks) for menu items.
+
+    Rows are only ever bulk-inserted by core.analytics.EventBuffer; per-item
+    totals are rolled up into MenuItem.analytics_data at the same time.
+    """
+    VIEW = 'view'
+    CLICK = 'click'
+    EVENT_TYPE_CHOICES = [
+        (VIEW, 'View'),
+        (CLICK, 'Click'),
+    ]
+
+    menu_item = models.ForeignKey(
+        MenuItem,
+        on_delete=models.CASCADE,
+        related_name='events',
+        help_text="The menu item (tool) the event was recorded for."
+    )
+    event_type = models.CharField(
+        max_length=10,
+        choices=EVENT_TYPE_CHOICES,
+        help_text="What happened: the tool was viewed or its menu entry was clicked."
+    )
+    occurred_at = models.DateTimeField(
+        db_index=True,
+        help_text="When the event happened (as reported by the client, clamped to the server clock)."
+    )
+
+    class Meta:
+        verbose_name = "Menu Item Event"
+        verbose_name_plural = "Menu Item Events"
+
+    def __str__(self):
+        return f"{self.event_type} of menu item {self.menu_item_id} at {self.occurred_at:%Y-%m-%d %H:%M:%S}"
@@ -0,0 +1,126 @@
+# backend/core/navbar.py
+from collections import defaultdict
+
+from django.db import models
+from rest_framework import serializers
+
+from .models import MenuItem
+from .serializers import DropdownMenuItemSerializer, MenuItemSerializer
+
+# Same formatting (timezone + ISO 8601 with 'Z') as the serializer's DateTimeFields
+_datetime_field = serializers.DateTimeField()
+
+
+def navbar_payload(menu_items):
+    """Wrap menu items in the response structure the frontend navbar expects."""
+    return {
+        "navbar": {
+            "brandName": "DailyToolbox",
+            "menuItems": menu_items,
+            "searchBar": True,
+            "loginAvatar": True,
+            "darkModeToggle": True
+        }
+    }
+
+
+def restructure_for_navbar(item_data, is_dropdown):
+    """
+    The frontend expects 'items' for nested items: dropdowns with children get
+    'dropdown_items' renamed to 'items', everything else loses both dropdown keys.
+    """
+    if is_dropdown and item_data.get('dropdown_items'):
+        item_data['items'] = item_data.pop('dropdown_items')
+    else:
+        item_data.pop('dropdown_items', None)
+        item_data.pop('is_dropdown', None)
+    return item_data
+
+
+def visible_items(region=None, role='anonymous'):
+    """Live items shown to a caller: targeted at their region and allowed for their role."""
+    return MenuItem.live.for_region(region).for_role(role)
+
+
+def top_level_queryset(region=None, role='anonymous'):
+    return visible_items(region, role).filter(parent_menu__isnull=True).order_by('order')
+
+
+def serialize_menu_items(region=None, role='anonymous', **projection):
+    """
+    Reference path: serialize live top-level items with MenuItemSerializer.
+
+    Loads only the columns and joins the projection needs (see
+    MenuItemSerializer.model_columns). Kept for admin-facing callers and as the
+    baseline that build_menu_items() must match.
+    """
+    field_names = MenuItemSerializer.select_field_names(**projection)
+    only, select_related = MenuItemSerializer.model_columns(field_names)
+    queryset = top_level_queryset(region, role).only('is_dropdown', *only).select_related(*select_related)
+    if 'dropdown_items' in field_names:
+        dropdown_items = visible_items(region, role).only('parent_menu', *DropdownMenuItemSerializer.Meta.fields)
+        queryset = queryset.prefetch_related(models.Prefetch('dropdown_items', queryset=dropdown_items))
+
+    items = list(queryset)
+    serialized_items = MenuItemSerializer(items, many=True, **projection).data
+    return [
+        restructure_for_navbar(item_data, item.is_dropdown)
+        for item, item_data in zip(items, serialized_items)
+    ]
+
+
+def _column_plan(field_names):
+    """
+    Pair each serializer field with its values() lookup and an optional converter.
+
+    Only datetimes need converting; every other column already comes out of
+    values() exactly as the serializer would render it.
+    """
+    plan = []
+    for name in field_names:
+        if name.endswith('_by_name'):
+            lookup = f"{name[:-len('_name')]}__username"
+        else:
+            lookup = name
+        model_field = MenuItem._meta.get_field(lookup.split('__')[0])
+        convert = _datetime_field.to_representation if isinstance(model_field, models.DateTimeField) else None
+        plan.append((name, lookup, convert))
+    return plan
+
+
+def _rows_to_dicts(rows, plan):
+    """Turn values_list() rows of (key, flag, *columns) into (key, flag, item dict) triples."""
+    for key, flag, *values in rows:
+        yield key, flag, {
+            name: convert(value) if convert is not None and value is not None else value
+            for (name, _, convert), value in zip(plan, values)
+        }
+
+
+def build_menu_items(region=None, role='anonymous', **projection):
+    """
+    Fast path: build the same menu item dicts as serialize_menu_items() straight
+    from values_list() rows, skipping model instances and DRF's per-field machinery.
+
+    Two queries at most (top-level items, then all live dropdown items).
+    """
+    field_names = MenuItemSerializer.select_field_names(**projection)
+    plan = _column_plan([name for name in field_names if name != 'dropdown_items'])
+    rows = top_level_queryset(region, role).values_list('id', 'is_dropdown', *[lookup for _, lookup, _ in plan])
+    menu_items = list(_rows_to_dicts(rows, plan))
+
+    if 'dropdown_items' in field_names and menu_items:
+        dropdown_plan = _column_plan(DropdownMenuItemSerializer.Meta.fields)
+        child_rows = (
+            visible_items(region, role)
+            .filter(parent_menu__in=[pk for pk, _, _ in menu_items])
+            .values_list('parent_menu', 'id', *[lookup for _, lookup, _ in dropdown_plan])
+        )
+        children = defaultdict(list)
+        for parent_id, _, child_data in _rows_to_dicts(child_rows, dropdown_plan):
+            children[parent_id].append(child_data)
+        # 'dropdown_items' is the last serializer field, so appending keeps the key order
+        for pk, _, item_data in menu_items:
+            item_data['dropdown_items'] = children.get(pk, [])
+
+    return [restructure_for_navbar(item_data, is_dropdown) for _, is_dropdown, item_data in menu_items]
@@ -0,0 +1,148 @@
+# backend/core/paginators.py
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import F, Field, Func, QuerySet, Value
+from django.db.models.lookups import GreaterThan
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def table_row_estimate(model, using='default'):
+    """PostgreSQL's estimated row count for a model's table (pg_class.reltuples), or -1 if unknown."""
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)",
+            [connection.ops.quote_name(model._meta.db_table)],
+        )
+        row = cursor.fetchone()
+    return row[0] if row and row[0] is not None and row[0] >= 0 else -1
+
+
+def plan_row_estimate(queryset):
+    """The planner's row estimate for a queryset, from EXPLAIN (no rows are read)."""
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that avoids an exact COUNT(*) on big PostgreSQL tables.
+
+    Tables under ADMIN_ESTIMATED_COUNT_THRESHOLD rows (or never analyzed) are
+    counted exactly. Above it, unfiltered querysets use pg_class.reltuples and
+    filtered ones the planner's estimate, so the last page number is approximate.
+    """
+    threshold = getattr(settings, 'ADMIN_ESTIMATED_COUNT_THRESHOLD', 10000)
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not isinstance(queryset, QuerySet) or connections[queryset.db].vendor != 'postgresql':
+            return super().count
+        estimate = table_row_estimate(queryset.model, queryset.db)
+        if estimate < self.threshold:
+            return super().count
+        if not queryset.query.where:
+            return estimate
+        return plan_row_estimate(queryset)
+
+
+class SearchRankPagination(CursorPagination):
+    """
+    Cursor pagination of search results (see core.search), best rank first.
+    Pages are found by seeking past the last (rank, id) seen, not with OFFSET.
+    """
+    ordering = ('-rank', 'id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class RowValue(Func):
+    """SQL row constructor, e.g. ("order", "id"); rows compare column by column."""
+    template = '(%(expressions)s)'
+    output_field = Field()
+
+
+class KeysetPagination(BasePagination):
+    """
+    Forward-only keyset pagination on integer columns, (order, id) by default.
+
+    Each page seeks past the last row of the previous one with a row-value
+    comparison, ("order", "id") > (5, 1234), which a matching composite index
+    turns into an index range scan: a deep page costs the same as the first,
+    where OFFSET would read and throw away every earlier row. The response is
+    {"next": <url or null>, "results": [...]}.
+    """
+    ordering = ('order', 'id')
+    page_size = 24
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(
+                GreaterThan(RowValue(*map(F, self.ordering)), RowValue(*map(Value, position)))
+            )
+        page = list(queryset[:self.page_size + 1]) # One extra row tells whether there is a next page
+        self.next_position = None
+        if len(page) > self.page_size:
+            page = page[:self.page_size]
+            self.next_position = tuple(getattr(page[-1], name) for name in self.ordering)
+        return page
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(page_size, self.max_page_size) if page_size > 0 else self.page_size
+
+    def decode_cursor(self, request):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor is None:
+            return None
+        try:
+            position = tuple(int(part) for part in base64.urlsafe_b64decode(cursor.encode('ascii')).split(b'.'))
+        except (TypeError, ValueError, UnicodeEncodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def encode_cursor(self, position):
+        return base64.urlsafe_b64encode('.'.join(map(str, position)).encode('ascii')).decode('ascii')
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
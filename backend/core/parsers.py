@@ -0,0 +1,34 @@
+# backend/core/parsers.py
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+try:
+    import orjson
+except ImportError: # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
+
+class FastJSONParser(BaseParser):
+    """
+    JSON parser for bulk payloads such as long arrays of numbers: decodes with
+    orjson when it is installed.
+
+    DRF reads bodies for its JSONParser through request.body, which caps them at
+    DATA_UPLOAD_MAX_MEMORY_SIZE; this parser reads the stream itself and applies
+    the view's 'max_body_size' instead (DATA_UPLOAD_MAX_MEMORY_SIZE if unset).
+    """
+    media_type = 'application/json'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        view = (parser_context or {}).get('view')
+        limit = getattr(view, 'max_body_size', None) or settings.DATA_UPLOAD_MAX_MEMORY_SIZE
+        body = stream.read(limit + 1)
+        if len(body) > limit:
+            raise ParseError(f"Request body exceeds {limit} bytes.")
+        try:
+            return orjson.loads(body) if orjson else json.loads(body)
+        except ValueError as exc: # orjson.JSONDecodeError is a ValueError too
+            raise ParseError(f"JSON parse error - {exc}")
@@ -0,0 +1,135 @@
+# backend/core/passwords.py
+"""
+Bulk password generation for the Random Password Generator tool.
+
+Passwords are cut from one secrets.token_bytes() read per chunk: random bytes
+are mapped onto the policy's alphabet with a single bytes.translate() call,
+and bytes that would bias the mapping (the top 256 % len(alphabet) values)
+are dropped, so every character is uniform. Passwords missing a required
+character class are discarded, which keeps the result uniform over all
+passwords that satisfy the policy; policies under which fewer than
+MIN_ACCEPTANCE of the drawn passwords would qualify are refused, so the
+work per password stays bounded. Only one chunk is held in memory at a time.
+"""
+import secrets
+import string
+from itertools import combinations
+
+try:
+    import numpy as np
+except ImportError: # numpy only speeds up the character class check
+    np = None
+
+# Character classes a policy can combine, in the order they are checked
+CHARACTER_CLASSES = {
+    'lowercase': string.ascii_lowercase,
+    'uppercase': string.ascii_uppercase,
+    'digits': string.digits,
+    'symbols': string.punctuation,
+}
+# Characters that are easily confused when read or typed (excluded with exclude_similar)
+SIMILAR_CHARACTERS = 'Il1|O0o'
+MIN_LENGTH = 4 # Room for one character of every class
+MAX_LENGTH = 256
+# Passwords generated (and streamed) per entropy read
+CHUNK_SIZE = 4096
+# Smallest share of drawn passwords that may contain every class (at most 20 draws per password kept)
+MIN_ACCEPTANCE = 0.05
+
+
+def password_policy(length=16, exclude='', exclude_similar=False, **classes):
+    """
+    Validated policy: password length, plus the character classes to use (keyword
+    flags named after CHARACTER_CLASSES, all on by default) minus the 'exclude'
+    characters. Every selected class appears in each password. Raises ValueError.
+    """
+    unknown = set(classes) - set(CHARACTER_CLASSES)
+    if unknown:
+        raise ValueError(f"Unknown character class(es): {', '.join(sorted(unknown))}.")
+    try:
+        length = int(length)
+    except (TypeError, ValueError):
+        raise ValueError("'length' must be an integer.")
+    if not MIN_LENGTH <= length <= MAX_LENGTH:
+        raise ValueError(f"'length' must be {MIN_LENGTH}-{MAX_LENGTH}.")
+    excluded = set(exclude or '') | (set(SIMILAR_CHARACTERS) if exclude_similar else set())
+    selected = {}
+    for name, characters in CHARACTER_CLASSES.items():
+        if classes.get(name, True):
+            selected[name] = ''.join(char for char in characters if char not in excluded)
+            if not selected[name]:
+                raise ValueError(f"Every {name} character is excluded.")
+    if not selected:
+        raise ValueError("Select at least one character class.")
+    if acceptance(length, list(selected.values())) < MIN_ACCEPTANCE:
+        raise ValueError(
+            "Too few characters are left in some classes for this length: "
+            "exclude fewer characters, make the passwords longer or turn a class off."
+        )
+    return {'length': length, 'classes': list(selected.values())}
+
+
+def acceptance(length, classes):
+    """Share of uniformly drawn passwords over the classes' alphabet that contain every class (inclusion-exclusion)."""
+    total = sum(map(len, classes))
+    return sum(
+        (-1) ** len(missing) * ((total - sum(map(len, missing))) / total) ** length
+        for size in range(len(classes) + 1) for missing in combinations(classes, size)
+    )
+
+
+def _byte_tables(classes):
+    """
+    translate() arguments mapping random bytes uniformly onto the classes'
+    characters: (character table, class bit table, bytes to delete).
+    """
+    alphabet = ''.join(classes)
+    class_bits = [1 << number for number, characters in enumerate(classes) for _ in characters]
+    limit = 256 - 256 % len(alphabet)
+    characters = bytes(ord(alphabet[byte % len(alphabet)]) for byte in range(256))
+    bits = bytes(class_bits[byte % len(alphabet)] for byte in range(256))
+    return characters, bits, bytes(range(limit, 256))
+
+
+def _complete_starts(bits, length, count, classes):
+    """Offsets of the passwords in which every class occurs, from their class bits."""
+    if np is not None:
+        present = np.bitwise_or.reduce(np.frombuffer(bits, np.uint8, count * length).reshape(count, length), axis=1)
+        return (np.flatnonzero(present == (1 << classes) - 1) * length).tolist()
+    return [start for start in range(0, count * length, length) if len(set(bits[start:start + length])) == classes]
+
+
+def _password_chunks(policy, count, chunk_size):
+    length, classes = policy['length'], policy['classes']
+    characters, bits, rejected = _byte_tables(classes)
+    acceptance = 1 - len(rejected) / 256
+    remaining, spare = count, b''
+    while remaining > 0:
+        batch = min(chunk_size, remaining)
+        needed = max(0, batch * length - len(spare))
+        # One read per chunk, sized so rejected bytes rarely leave it short; leftovers carry over to the next chunk
+        accepted = spare + secrets.token_bytes(int(needed / acceptance * 1.05) + 64).translate(None, rejected)
+        text = accepted.translate(characters)
+        usable = min(batch, len(text) // length)
+        if len(classes) > 1:
+            starts = _complete_starts(accepted.translate(bits), length, usable, len(classes))
+        else:
+            starts = range(0, usable * length, length)
+        passwords = [text[start:start + length] for start in starts]
+        spare = accepted[usable * length:]
+        remaining -= len(passwords)
+        if passwords:
+            yield passwords
+
+
+def generate_passwords(policy, count, chunk_size=CHUNK_SIZE):
+    """Yield lists of at most chunk_size passwords following policy, count passwords in all."""
+    for passwords in _password_chunks(policy, count, chunk_size):
+        yield [password.decode('ascii') for password in passwords]
+
+
+def password_stream(policy, count, chunk_size=CHUNK_SIZE):
+    """count passwords as lines of bytes, one chunk per entropy read (for StreamingHttpResponse)."""
+    for passwords in _password_chunks(policy, count, chunk_size):
+        passwords.append(b'')
+        yield b'\n'.join(passwords)
@@ -0,0 +1,351 @@
+# backend/core/qr.py
+"""
+QR code rendering for the QR Code Generator tool.
+
+A code is identified by a hash of its content and render options, and every
+rendering is kept in a content-addressed disk cache (least recently used
+files are evicted beyond QR_CACHE_MAX_BYTES), so a popular payload is drawn
+once per machine and then served from disk. Batches render their cache misses
+on a pool of worker processes. PNG and SVG are written directly from the
+module matrix; the qrcode package is only used to encode it.
+"""
+import hashlib
+import json
+import os
+import re
+import struct
+import tempfile
+import threading
+import time
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import groupby
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+try:
+    import qrcode
+except ImportError: # qrcode is only needed to render (cached codes are served without it)
+    qrcode = None
+
+# Bump when the output of render_qr changes, so cached renderings are not reused
+QR_RENDER_VERSION = 1
+QR_FORMATS = {'png': 'image/png', 'svg': 'image/svg+xml'}
+# Byte-mode capacity of the largest symbol (version 40) per error correction level
+QR_CAPACITY = {'L': 2953, 'M': 2331, 'Q': 1663, 'H': 1273}
+MAX_SCALE = 40
+MAX_BORDER = 16
+_COLOR_RE = re.compile(r'^#?([0-9a-fA-F]{6})$')
+
+
+def qr_options(image_format='png', scale=10, border=4, error_correction='M', dark='000000', light='ffffff'):
+    """Validated, normalised render options (a dict, also part of the cache key). Raises ValueError."""
+    image_format = str(image_format).lower()
+    if image_format not in QR_FORMATS:
+        raise ValueError(f"Unknown image_format '{image_format}'. Choose from: {', '.join(QR_FORMATS)}.")
+    error_correction = str(error_correction).upper()
+    if error_correction not in QR_CAPACITY:
+        raise ValueError(f"Unknown error_correction '{error_correction}'. Choose from: {', '.join(QR_CAPACITY)}.")
+    try:
+        scale, border = int(scale), int(border)
+    except (TypeError, ValueError):
+        raise ValueError("'scale' and 'border' must be integers.")
+    if not 1 <= scale <= MAX_SCALE or not 0 <= border <= MAX_BORDER:
+        raise ValueError(f"'scale' must be 1-{MAX_SCALE} and 'border' 0-{MAX_BORDER}.")
+    colors = [_COLOR_RE.match(str(color)) for color in (dark, light)]
+    if not all(colors):
+        raise ValueError("Colors must be hex RGB values such as '1a2b3c'.")
+    dark, light = (color.group(1).lower() for color in colors)
+    return {
+        'image_format': image_format, 'scale': scale, 'border': border,
+        'error_correction': error_correction, 'dark': dark, 'light': light,
+    }
+
+
+def qr_key(content, options):
+    """Cache key of a rendering: a hash of the content and options. Raises ValueError for content that can't fit."""
+    if not isinstance(content, str) or not content:
+        raise ValueError("QR content must be a non-empty string.")
+    if len(content.encode()) > QR_CAPACITY[options['error_correction']]:
+        raise ValueError(
+            f"Content is too long for a QR code with error correction {options['error_correction']} "
+            f"(at most {QR_CAPACITY[options['error_correction']]} bytes)."
+        )
+    payload = json.dumps([QR_RENDER_VERSION, content, options], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def render_qr(content, options):
+    """Render a code as PNG or SVG bytes. Runs in batch worker processes, so it only touches its arguments."""
+    if qrcode is None:
+        raise ImproperlyConfigured("Rendering QR codes requires qrcode (pip install qrcode).")
+    code = qrcode.QRCode(
+        error_correction=getattr(qrcode.constants, f"ERROR_CORRECT_{options['error_correction']}"),
+        border=options['border'],
+    )
+    code.add_data(content)
+    code.make(fit=True)
+    matrix = code.get_matrix()
+    draw = _png if options['image_format'] == 'png' else _svg
+    return draw(matrix, options['scale'], options['dark'], options['light'])
+
+
+def _png_chunk(tag, data):
+    return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data))
+
+
+def _png(matrix, scale, dark, light):
+    # 1-bit palette image: index 0 is the light color, 1 the dark one
+    size = len(matrix) * scale
+    width = (size + 7) // 8
+    rows = []
+    for row in matrix:
+        bits = ''.join(('1' if module else '0') * scale for module in row).ljust(width * 8, '0')
+        rows.append((b'\0' + int(bits, 2).to_bytes(width, 'big')) * scale)
+    return b''.join((
+        b'\x89PNG\r\n\x1a\n',
+        _png_chunk(b'IHDR', struct.pack('>IIBBBBB', size, size, 1, 3, 0, 0, 0)),
+        _png_chunk(b'PLTE', bytes.fromhex(light + dark)),
+        _png_chunk(b'IDAT', zlib.compress(b''.join(rows), 9)),
+        _png_chunk(b'IEND', b''),
+    ))
+
+
+def _svg(matrix, scale, dark, light):
+    # One path of horizontal runs of dark modules, in module units scaled by the viewBox
+    size = len(matrix)
+    runs = []
+    for y, row in enumerate(matrix):
+        x = 0
+        for is_dark, modules in groupby(row):
+            length = len(list(modules))
+            if is_dark:
+                runs.append(f'M{x} {y}h{length}v1h-{length}z')
+            x += length
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {size} {size}" width="{size * scale}" '
+        f'height="{size * scale}" shape-rendering="crispEdges"><rect width="{size}" height="{size}" fill="#{light}"/>'
+        f'<path fill="#{dark}" d="{"".join(runs)}"/></svg>\n'
+    ).encode()
+
+
+class QRCache:
+    """
+    Content-addressed renderings on disk ('<dir>/ab/abcdef....png'), shared by
+    every process. Files are written atomically; a hit refreshes the file's
+    mtime, and once writes pass a twentieth of max_bytes the directory is
+    scanned and the least recently used files are removed. Thread-safe.
+    """
+    TOUCH_INTERVAL = 60 # Don't rewrite the mtime of a file used within the last minute
+    LOCK_STRIPES = 64
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._written = None # Bytes written since the last eviction scan (None: no scan yet)
+        self._locks = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+        self._evict_lock = threading.Lock()
+
+    def path(self, key, image_format):
+        return os.path.join(self.directory, key[:2], f'{key}.{image_format}')
+
+    def get(self, key, image_format):
+        """The cached rendering, or None."""
+        path = self.path(key, image_format)
+        try:
+            with open(path, 'rb') as cached:
+                modified = os.fstat(cached.fileno()).st_mtime
+                data = cached.read()
+        except FileNotFoundError:
+            return None
+        if time.time() - modified > self.TOUCH_INTERVAL:
+            try:
+                os.utime(path)
+            except OSError: # Evicted meanwhile
+                pass
+        return data
+
+    def put(self, key, image_format, data):
+        path = self.path(key, image_format)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temporary_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.qr-')
+        try:
+            with os.fdopen(fd, 'wb') as output:
+                output.write(data)
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+        with self._evict_lock:
+            due = self._written is None or self._written + len(data) > self.max_bytes // 20
+            self._written = 0 if due else self._written + len(data)
+        if due:
+            self.evict()
+
+    def fetch(self, key, image_format, render):
+        """The cached rendering, else render() stored. Concurrent misses for one key in a process render it once."""
+        data = self.get(key, image_format)
+        if data is None:
+            with self._locks[int(key[:8], 16) % self.LOCK_STRIPES]:
+                data = self.get(key, image_format)
+                if data is None:
+                    data = render()
+                    self.put(key, image_format, data)
+        return data
+
+    def evict(self):
+        """Remove least recently used files until the cache is at most 90% of max_bytes."""
+        files, total = [], 0
+        for shard in _scandir(self.directory):
+            if shard.is_dir():
+                for entry in _scandir(shard.path):
+                    if entry.is_file() and not entry.name.startswith('.'):
+                        stat = entry.stat()
+                        files.append((stat.st_mtime, stat.st_size, entry.path))
+                        total += stat.st_size
+        if total <= self.max_bytes:
+            return 0
+        removed = 0
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes * 0.9:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError: # Evicted by another process
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+
+def _scandir(path):
+    try:
+        with os.scandir(path) as entries:
+            return list(entries)
+    except FileNotFoundError:
+        return []
+
+
+_cache = None
+
+
+def qr_cache():
+    """The QR_CACHE_DIR cache of this process."""
+    global _cache
+    directory = getattr(settings, 'QR_CACHE_DIR', None) or os.path.join(tempfile.gettempdir(), 'dailytoolbox-qr')
+    if _cache is None or _cache.directory != directory:
+        _cache = QRCache(directory, getattr(settings, 'QR_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+    return _cache
+
+
+def get_qr(content, options):
+    """(key, bytes) of a code, rendered only if it isn't cached. Raises ValueError for invalid content."""
+    key = qr_key(content, options)
+    return key, qr_cache().fetch(key, options['image_format'], lambda: render_qr(content, options))
+
+
+# --- Batches -----------------------------------------------------------------
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def render_pool():
+    """Worker processes for batch rendering (QR_RENDER_PROCESSES, default one per CPU; 0 renders in-process)."""
+    global _pool
+    processes = getattr(settings, 'QR_RENDER_PROCESSES', None)
+    if processes == 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=processes)
+    return _pool
+
+
+def _discard_pool(pool):
+    """Drop a broken pool, so the next batch starts a fresh one."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _render_misses(misses):
+    """
+    Yield (key, bytes) for a {key: (content, options)} dict of misses, in order:
+    on the process pool if there is one, else (or from wherever a worker died
+    and broke the pool) in this process.
+    """
+    jobs = list(misses.items())
+    done = 0
+    pool = render_pool() if len(jobs) > 1 else None
+    if pool is not None:
+        contents, options = [content for _, (content, _) in jobs], [option for _, (_, option) in jobs]
+        try:
+            for data in pool.map(render_qr, contents, options, chunksize=8):
+                yield jobs[done][0], data
+                done += 1
+        except BrokenProcessPool:
+            _discard_pool(pool)
+    for key, (content, option) in jobs[done:]:
+        yield key, render_qr(content, option)
+
+
+def render_many(jobs):
+    """
+    Yield the bytes of (key, content, options) jobs (keys from qr_key()), in
+    order. Cache hits are read from disk; each distinct miss is rendered once,
+    on the process pool (in-process if the pool breaks), and stored.
+    """
+    cache = qr_cache()
+    found, misses = {}, {}
+    for key, content, options in jobs:
+        if key not in found and key not in misses:
+            data = cache.get(key, options['image_format'])
+            if data is None:
+                misses[key] = (content, options)
+            else:
+                found[key] = data
+
+    rendered = _render_misses(misses)
+    for key, _, _ in jobs:
+        while key not in found: # Misses come back in order of first use, so the next one is never far away
+            rendered_key, data = next(rendered)
+            cache.put(rendered_key, misses[rendered_key][1]['image_format'], data)
+            found[rendered_key] = data
+        yield found[key]
+
+
+class _ZipStream:
+    """Write-only file for zipfile whose contents are taken out after each member."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def zip_stream(members):
+    """Stream a ZIP archive of (name, bytes) members, one chunk per member. PNGs are stored, SVGs deflated."""
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, 'w') as archive:
+        for name, data in members:
+            info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+            info.compress_type = zipfile.ZIP_STORED if name.endswith('.png') else zipfile.ZIP_DEFLATED
+            archive.writestr(info, data)
+            yield stream.drain()
+    yield stream.drain()
@@ -0,0 +1,60 @@
+# backend/core/renderers.py
+import re
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError: # orjson is optional; fall back to DRF's stdlib-based renderer
+    orjson = None
+
+# orjson writes exponent floats as '1e16' where json.dumps writes '1e+16'
+_EXPONENT_NUMBER = re.compile(rb'\d[eE][+-]?\d')
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Drop-in replacement for DRF's JSONRenderer that encodes with orjson when it
+    is installed.
+
+    Output is byte-for-byte what JSONRenderer produces with the default
+    settings (compact separators, UTF-8, U+2028/U+2029 escaped). Anything
+    orjson can't encode the same way (indented output for the browsable API,
+    types it doesn't know, floats in exponent notation) goes through
+    JSONRenderer.
+    """
+    _encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None or data is None
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            # Datetimes and decimals are handed to DRF's encoder so they format the same way
+            ret = orjson.dumps(data, default=self._encoder.default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+        except TypeError: # orjson.JSONEncodeError: e.g. integers beyond 64 bits
+            return super().render(data, accepted_media_type, renderer_context)
+        if _EXPONENT_NUMBER.search(ret):
+            # Rare (may also be a false positive inside a string): let json.dumps format it
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Escape the JavaScript line terminators exactly like JSONRenderer does
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+class NumpyJSONRenderer(JSONRenderer):
+    """
+    Renderer for bulk numeric responses: NumPy arrays in the data are written
+    as JSON arrays straight from their buffers by orjson, without building a
+    Python float per element. Number formatting may differ from JSONRenderer
+    (e.g. '1e-05'); without orjson, JSONRenderer converts arrays with tolist().
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
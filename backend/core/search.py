@@ -0,0 +1,89 @@
+# backend/core/search.py
+"""
+Ranked full-text search over menu items.
+
+MenuItem.search_vector is a stored, generated tsvector of the title (weight A),
+SEO title and tool domain (B) and SEO description (C), so PostgreSQL keeps it
+in sync and a GIN index serves every query. Every query word matches as a
+prefix: 'conv cels' finds 'Convert Celsius to Fahrenheit'. If the pg_trgm
+extension is installed, a query without full-text matches falls back to
+trigram similarity of titles, which forgives typos ('celcius').
+"""
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db import connection, models
+from django.db.models.functions import Cast
+
+from .models import SEARCH_CONFIG
+
+MAX_QUERY_WORDS = 8
+# Words only: nothing the user types can inject tsquery operators
+_WORD_RE = re.compile(r'[^\W_]+')
+
+_trigram_available = None
+
+
+def prefix_query(text):
+    """'Convert celsius!' -> a SearchQuery for 'convert:* & celsius:*' (None if there are no words)."""
+    words = _WORD_RE.findall(text.lower())[:MAX_QUERY_WORDS]
+    if not words:
+        return None
+    return SearchQuery(' & '.join(f'{word}:*' for word in words), search_type='raw', config=SEARCH_CONFIG)
+
+
+def search_items(queryset, text):
+    """
+    Items of queryset matching every word of 'text', annotated with 'rank'
+    and ordered best first (then by id). Rank is a float8 so that it survives
+    a round trip through a pagination cursor unchanged.
+    """
+    query = prefix_query(text)
+    if query is None:
+        return _no_results(queryset)
+    return (
+        queryset
+        .filter(search_vector=query)
+        .annotate(rank=Cast(SearchRank(models.F('search_vector'), query), models.FloatField()))
+        .order_by('-rank', 'id')
+    )
+
+
+def _no_results(queryset):
+    # Still annotated, so it can be ordered and paginated like real results
+    return queryset.none().annotate(rank=models.Value(0.0, output_field=models.FloatField()))
+
+
+def trigram_available():
+    """Whether the pg_trgm extension is installed (checked once per process)."""
+    global _trigram_available
+    if _trigram_available is None:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+            _trigram_available = cursor.fetchone()[0]
+    return _trigram_available
+
+
+def fuzzy_search_items(queryset, text):
+    """
+    Items whose title contains something similar to 'text' (pg_trgm word
+    similarity, served by the title trigram index), annotated and ordered like
+    search_items(). Requires trigram_available().
+    """
+    text = ' '.join(_WORD_RE.findall(text))
+    if not text:
+        return _no_results(queryset)
+    return (
+        queryset
+        .filter(title__trigram_word_similar=text)
+        .annotate(rank=Cast(TrigramWordSimilarity(text, 'title'), models.FloatField()))
+        .order_by('-rank', 'id')
+    )
+
+
+def ranked_search(queryset, text):
+    """Full-text matches, or trigram matches if there are none and pg_trgm is available."""
+    results = search_items(queryset, text)
+    if trigram_available() and not results.exists():
+        return fuzzy_search_items(queryset, text)
+    return results
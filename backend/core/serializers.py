@@ -2,6 +2,20 @@
 from rest_framework import serializers
 from .models import MenuItem
 
+
+# Named field sets for MenuItemSerializer(profile=...). None means every field.
+MENU_ITEM_PROFILES = {
+    'navbar': [
+        'id', 'title', 'url', 'order', 'icon', 'is_external', 'target', 'is_dropdown',
+        'dropdown_items',
+    ],
+    'card': [
+        'id', 'title', 'url', 'icon', 'tool_domain', 'seo_description',
+        'is_featured_image', 'featured_image_url', 'is_trending', 'is_promoted', 'is_featured',
+    ],
+    'admin': None,
+}
+
 class DropdownMenuItemSerializer(serializers.ModelSerializer):
     """
     Serializer for nested dropdown menu items.
@@ -47,3 +61,55 @@ class MenuItemSerializer(serializers.ModelSerializer):
             'dropdown_items', # This will include the nested items from DropdownMenuItemSerializer
         ]
 
+    def __init__(self, *args, fields=None, exclude=None, profile=None, **kwargs):
+        """
+        Optional projection, e.g. MenuItemSerializer(items, many=True, profile='navbar', exclude=['icon']).
+        'fields' and 'exclude' are lists of field names; unknown names are ignored.
+        """
+        super().__init__(*args, **kwargs)
+        selected = set(self.select_field_names(fields=fields, exclude=exclude, profile=profile))
+        for field_name in list(self.fields):
+            if field_name not in selected:
+                self.fields.pop(field_name)
+
+    @classmethod
+    def select_field_names(cls, fields=None, exclude=None, profile=None):
+        """Field names kept by a projection, in Meta.fields order."""
+        selected = MENU_ITEM_PROFILES[profile] if profile else None
+        selected = cls.Meta.fields if selected is None else selected
+        if fields:
+            selected = [name for name in selected if name in fields]
+        if exclude:
+            selected = [name for name in selected if name not in exclude]
+        return [name for name in cls.Meta.fields if name in selected]
+
+    @classmethod
+    def model_columns(cls, field_names):
+        """
+        Map serializer fields to what the queryset must load for them.
+
+        Returns (only, select_related): the column list for QuerySet.only() and the
+        user foreign keys to join for '<name>_by_name' fields. 'dropdown_items' is
+        a reverse relation and has to be prefetched separately.
+        """
+        only = ['id']
+        select_related = []
+        for name in field_names:
+            if name == 'dropdown_items' or name == 'id':
+                continue
+            if name.endswith('_by_name'):
+                user_field = name[:-len('_name')]
+                select_related.append(user_field)
+                only.append(f'{user_field}__username')
+            else:
+                only.append(name)
+        return only, select_related
+
+
+class SearchResultSerializer(serializers.ModelSerializer):
+    """A search hit: what a result card needs plus its relevance ('rank', higher is better)."""
+    rank = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = MenuItem
+        fields = ['id', 'title', 'url', 'icon', 'tool_domain', 'seo_title', 'seo_description', 'rank']
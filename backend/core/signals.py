@@ -0,0 +1,38 @@
+# backend/core/signals.py
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .menu_cache import invalidate_items
+from .models import MenuItem
+from .typeahead import item_changed
+
+
+@receiver(pre_save, sender=MenuItem)
+def remember_geo_regions(sender, instance, **kwargs):
+    """Keep the regions an item targeted before this save, so their variants are refreshed too."""
+    if instance.pk and not instance._state.adding:
+        instance._previous_geo_regions = (
+            MenuItem.objects.filter(pk=instance.pk).values_list('geo_regions', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=MenuItem)
+@receiver(post_delete, sender=MenuItem)
+def menu_item_changed(sender, instance, **kwargs):
+    """
+    A saved or deleted menu item makes cached navbar payloads stale: only the
+    variants of the regions it targets (before and after the change), or every
+    variant if it is (or was) shown everywhere.
+    """
+    targeted = [instance.geo_regions]
+    previous = instance.__dict__.pop('_previous_geo_regions', None)
+    if previous is not None:
+        targeted.append(previous)
+    invalidate_items(targeted)
+
+
+@receiver(post_save, sender=MenuItem)
+@receiver(post_delete, sender=MenuItem)
+def update_typeahead(sender, instance, **kwargs):
+    """Every process's search index re-reads just this item (see core.typeahead)."""
+    item_changed(instance.pk)
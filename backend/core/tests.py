@@ -1,3 +1,1332 @@
-from django.test import TestCase
+import gzip
+import io
+import json
+import os
+import string
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import warnings
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+from functools import wraps
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from firebase_admin import auth
+from rest_framework.renderers import JSONRenderer
+
+from .analytics import EventBuffer, event_buffer
+from .backends import VerifiedTokenCache, token_cache, verify_firebase_token
+from .checks import check_shared_cache
+from .catalog_io import export_catalog, import_catalog, read_catalog
+from .expressions import compile_expression
+from . import currency
+from .geo import GeoIPDatabase, region_codes
+from .menu_cache import invalidate_menu_cache, menu_version, negotiate_encoding
+from .models import MenuItem, MenuItemEvent
+from .navbar import build_menu_items, navbar_payload, serialize_menu_items
+from .paginators import EstimatedCountPaginator
+from .passwords import acceptance, generate_passwords, password_policy
+from .search import search_items, trigram_available
+from .renderers import FastJSONRenderer
+from .trending import compute_trending, rank_within_groups
+from . import qr, typeahead
+from .typeahead import PrefixIndex, invalidate_typeahead
+from .units import convert, convert_many
+from .views import CurrencyBatchConversionView, UnitBatchConversionView
+
+try:
+    import numpy as np
+except ImportError: # Batch conversions, batch evaluation and trending need numpy; their tests are skipped
+    np = None
+
+User = get_user_model()
+IN_PROCESS_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def in_process_cache(test):
+    """Run a query-count test on an empty in-memory cache, so queries to the shared database cache aren't counted."""
+    @override_settings(CACHES=IN_PROCESS_CACHE)
+    @wraps(test)
+    def wrapper(self, *args, **kwargs):
+        cache.clear()
+        return test(self, *args, **kwargs)
+    return wrapper
+
+
+def create_menu(top_level_count, children_per_item, user=None, prefix="Menu"):
+    """Create a navbar of dropdown parents, each with a few live children."""
+    audit = dict(
+        created_by=user, updated_by=user, published_by=user,
+        archived_by=user, deleted_by=user, scheduled_by=user,
+    )
+    for i in range(top_level_count):
+        parent = MenuItem.objects.create(title=f"{prefix} {i}", order=i, is_dropdown=True, **audit)
+        for j in range(children_per_item):
+            MenuItem.objects.create(title=f"{prefix} {i}.{j}", order=j, parent_menu=parent, **audit)
+
+
+class CrossProcessTestCase(TransactionTestCase):
+    """Tests where another process (a worker or management command) changes data this one serves."""
+
+    def setUp(self):
+        cache.clear() # The database cache is not flushed between tests
+
+    def run_in_subprocess(self, code):
+        """Run Python code in a fresh Django process using the test database."""
+        setup = (
+            "import django\nfrom django.conf import settings\n"
+            f"settings.DATABASES['default']['NAME'] = {connection.settings_dict['NAME']!r}\ndjango.setup()\n"
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', setup + code], cwd=settings.BASE_DIR, capture_output=True, text=True, timeout=120,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return result.stdout
+
+
+class MenuItemsListViewTests(TestCase):
+    url = reverse('menu_items_list')
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='editor')
+
+    @in_process_cache
+    def test_query_count_is_constant(self):
+        create_menu(2, 2, user=self.user)
+        with CaptureQueriesContext(connection) as small_menu:
+            self.client.get(self.url)
+
+        create_menu(10, 8, user=self.user, prefix="Tool")
+        with CaptureQueriesContext(connection) as large_menu:
+            response = self.client.get(self.url)
+
+        self.assertEqual(len(response.json()['navbar']['menuItems']), 12)
+        self.assertEqual(len(small_menu), len(large_menu))
+        # Cache miss: top-level items, dropdown items and the is_cacheable check
+        invalidate_menu_cache()
+        with self.assertNumQueries(3):
+            self.client.get(self.url)
+        # Cache hit: no queries at all
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+    def test_dropdown_items_are_filtered_like_top_level_items(self):
+        parent = MenuItem.objects.create(title="Tools", is_dropdown=True)
+        MenuItem.objects.create(title="Calculator", parent_menu=parent, order=1)
+        MenuItem.objects.create(title="Old Tool", parent_menu=parent, is_archived=True)
+        MenuItem.objects.create(title="Secret Tool", parent_menu=parent, is_hidden=True)
+        MenuItem.objects.create(title="Draft Tool", parent_menu=parent, is_published=False)
+        MenuItem.objects.create(title="Hidden Menu", is_deleted=True)
+
+        menu_items = self.client.get(self.url).json()['navbar']['menuItems']
+
+        self.assertEqual([item['title'] for item in menu_items], ["Tools"])
+        self.assertEqual([item['title'] for item in menu_items[0]['items']], ["Calculator"])
+        self.assertEqual(menu_items[0]['created_by_name'], None)
+
+
+    def test_navbar_profile_narrows_payload_and_columns(self):
+        create_menu(2, 2, user=self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            menu_items = self.client.get(self.url, {'profile': 'navbar'}).json()['navbar']['menuItems']
+
+        self.assertEqual(
+            list(menu_items[0]), ['id', 'title', 'url', 'order', 'icon', 'is_external', 'target', 'is_dropdown', 'items']
+        )
+        self.assertNotIn('custom_css', queries[0]['sql'])
+        self.assertNotIn('auth_user', queries[0]['sql'])
+
+    @in_process_cache
+    def test_fields_and_exclude_parameters(self):
+        create_menu(1, 1, user=self.user)
+
+        for _ in range(2): # Custom field sets are never stored, so no is_cacheable check either
+            with self.assertNumQueries(1): # Menu items (no dropdown prefetch)
+                response = self.client.get(self.url, {'fields': 'id,title,created_by_name,icon', 'exclude': 'icon'})
+
+        menu_id = MenuItem.objects.get(title="Menu 0").pk
+        self.assertEqual(
+            response.json()['navbar']['menuItems'], [{'id': menu_id, 'title': 'Menu 0', 'created_by_name': 'editor'}]
+        )
+
+    @in_process_cache
+    def test_profile_field_sets_share_one_cache_entry(self):
+        create_menu(1, 1)
+        etag = self.client.get(self.url, {'profile': 'navbar'})['ETag']
+        fields = 'dropdown_items,target,title,title,id,url,order,icon,is_external,is_dropdown,bogus'
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url, {'fields': fields})['ETag'], etag)
+
+    def test_unknown_profile_is_rejected(self):
+        self.assertEqual(self.client.get(self.url, {'profile': 'everything'}).status_code, 400)
+
+class PrecompressedNavbarTests(TestCase):
+    url = reverse('menu_items_list')
+
+    def setUp(self):
+        cache.clear()
+        create_menu(3, 2)
+
+    def test_served_in_the_accepted_encoding(self):
+        plain = self.client.get(self.url)
+        compressed = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(compressed.content), plain.content)
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        self.assertIn('Accept-Encoding', compressed['Vary'])
+
+    def test_payload_is_rebuilt_only_when_menu_changes(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        MenuItem.objects.filter(title="Menu 0").get().save()
+
+        self.assertNotEqual(self.client.get(self.url)['ETag'], etag)
+
+    @in_process_cache
+    def test_uncacheable_items_are_not_stored(self):
+        MenuItem.objects.filter(title="Menu 0.0").update(is_cacheable=False)
+        self.client.get(self.url)
+        with self.assertNumQueries(3):
+            self.client.get(self.url)
+
+    def test_negotiate_encoding(self):
+        self.assertEqual(negotiate_encoding('gzip;q=0, identity'), 'identity')
+        self.assertEqual(negotiate_encoding('*'), negotiate_encoding('br, gzip'))
+        self.assertEqual(negotiate_encoding(None), 'identity')
+
+
+class PublishScheduledItemsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.editor = User.objects.create_user(username='editor')
+        self.past = timezone.now() - timedelta(minutes=5)
+        self.due = MenuItem.objects.create(
+            title="Due Tool", is_published=False, is_scheduled=True, scheduled_at=self.past, scheduled_by=self.editor
+        )
+        self.later = MenuItem.objects.create(
+            title="Later Tool", is_published=False, is_scheduled=True, scheduled_at=timezone.now() + timedelta(days=1)
+        )
+
+    @in_process_cache
+    def test_due_items_are_published_in_one_update(self):
+        url = reverse('menu_items_list')
+        self.assertEqual(self.client.get(url).json()['navbar']['menuItems'], [])
+
+        with self.assertNumQueries(3): # Lock the due core rows + one UPDATE per app
+            call_command('publish_scheduled_items', stdout=StringIO())
+
+        self.due.refresh_from_db()
+        self.assertTrue(self.due.is_published)
+        self.assertFalse(self.due.is_scheduled)
+        self.assertEqual(self.due.published_at, self.past)
+        self.assertEqual(self.due.published_by, self.editor)
+        self.assertFalse(MenuItem.objects.get(pk=self.later.pk).is_published)
+        self.assertEqual([item['title'] for item in self.client.get(url).json()['navbar']['menuItems']], ["Due Tool"])
+
+    def test_live_items_keep_their_publication(self):
+        published_at = timezone.now() - timedelta(days=3)
+        live = MenuItem.objects.create(
+            title="Live Tool", is_published=True, published_at=published_at,
+            is_scheduled=True, scheduled_at=self.past, scheduled_by=self.editor,
+        )
+        call_command('publish_scheduled_items', stdout=StringIO())
+        live.refresh_from_db()
+        self.assertEqual((live.published_at, live.published_by), (published_at, None))
+
+    def test_nothing_due_keeps_the_cache(self):
+        call_command('publish_scheduled_items', stdout=StringIO())
+        with mock.patch('core.management.commands.publish_scheduled_items.invalidate_items') as invalidate:
+            call_command('publish_scheduled_items', stdout=StringIO())
+        invalidate.assert_not_called()
+
+    def test_only_the_published_regions_are_invalidated(self):
+        MenuItem.objects.filter(pk=self.due.pk).update(geo_regions=['IN'])
+        with mock.patch('core.menu_cache.invalidate_menu_cache') as invalidate:
+            call_command('publish_scheduled_items', stdout=StringIO())
+        invalidate.assert_called_once_with(regions=['IN'])
+
+
+class MenuItemAdminActionsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser(username='admin', password='pw')
+        self.client.force_login(self.admin)
+        create_menu(3, 0, prefix="Bulk")
+        self.url = reverse('admin:core_menuitem_changelist')
+        self.pks = list(MenuItem.objects.values_list('pk', flat=True))
+
+    def run_action(self, action, **extra):
+        return self.client.post(self.url, {'action': action, '_selected_action': self.pks, **extra})
+
+    def test_archive_is_one_update_and_one_invalidation(self):
+        with mock.patch('core.admin.invalidate_menu_cache') as invalidate, \
+                CaptureQueriesContext(connection) as queries:
+            self.run_action('archive_selected')
+        invalidate.assert_called_once_with()
+        self.assertEqual(sum(query['sql'].startswith('UPDATE') for query in queries), 1)
+        self.assertEqual(MenuItem.objects.filter(is_archived=True, archived_by=self.admin).count(), 3)
+        self.assertEqual(self.client.get(reverse('menu_items_list')).json()['navbar']['menuItems'], [])
+
+    def test_restore_and_publish_keep_existing_timestamps(self):
+        published_at = MenuItem.objects.get(pk=self.pks[0]).published_at
+        self.run_action('soft_delete_selected')
+        self.run_action('restore_selected')
+        self.run_action('publish_selected')
+
+        item = MenuItem.objects.get(pk=self.pks[0])
+        self.assertFalse(item.is_deleted)
+        self.assertIsNone(item.deleted_at)
+        self.assertEqual(item.published_at, published_at)
+        self.assertEqual(item.published_by, self.admin)
+
+    def test_set_domain_and_flags(self):
+        self.run_action('set_tool_domain', tool_domain='finance')
+        self.run_action('mark_promoted')
+        self.assertEqual(MenuItem.objects.filter(tool_domain='finance', is_promoted=True).count(), 3)
+
+        response = self.run_action('set_tool_domain', tool_domain='')
+        self.assertEqual(MenuItem.objects.filter(tool_domain='finance').count(), 3)
+        self.assertEqual(response.status_code, 302)
+
+
+class MenuItemAdminChangelistTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='admin', password='pw')
+        self.client.force_login(self.admin)
+        self.url = reverse('admin:core_menuitem_changelist')
+
+    def changelist_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_query_budget_does_not_grow_with_rows(self):
+        create_menu(2, 2, user=self.admin, prefix="Small")
+        small = self.changelist_queries()
+        create_menu(10, 5, user=self.admin, prefix="Large")
+        self.assertEqual(self.changelist_queries(), small)
+        self.assertLessEqual(small, 6) # session, user, parent filter, row estimate, count, rows
+
+    def test_parent_filter_lists_only_parents(self):
+        create_menu(2, 2, prefix="Filter")
+        parent = MenuItem.objects.get(title="Filter 1")
+        response = self.client.get(self.url, {'parent_menu__id__exact': parent.pk})
+        self.assertEqual(
+            sorted(item.title for item in response.context['cl'].result_list), ["Filter 1.0", "Filter 1.1"]
+        )
+        lookups = dict(response.context['cl'].filter_specs[-1].lookup_choices)
+        self.assertEqual(sorted(lookups.values()), ["Filter 0", "Filter 1"])
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    def setUp(self):
+        create_menu(4, 4, prefix="Count")
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE core_menuitem")
+
+    def test_small_tables_are_counted_exactly(self):
+        paginator = EstimatedCountPaginator(MenuItem.objects.filter(is_dropdown=True), 10)
+        self.assertEqual(paginator.count, 4)
+
+    def test_big_tables_use_estimates(self):
+        with mock.patch.object(EstimatedCountPaginator, 'threshold', 10):
+            with self.assertNumQueries(1):
+                self.assertEqual(EstimatedCountPaginator(MenuItem.objects.all(), 10).count, 20)
+            filtered = EstimatedCountPaginator(MenuItem.objects.filter(is_dropdown=True), 10)
+            with CaptureQueriesContext(connection) as queries:
+                self.assertGreater(filtered.count, 0)
+            self.assertFalse(any('COUNT(' in query['sql'] for query in queries))
+
+
+class CatalogImportExportTests(TestCase):
+    CSV = (
+        "title,parent,url,order,is_dropdown,is_trending,analytics_data\n"
+        "Area,Tools > Converters,/area,2,false,yes,\n"          # Parent defined further down
+        "Tools,,,1,true,no,\n"
+        "Converters,Tools,,1,true,no,\"{\"\"views\"\": 3}\"\n"
+        ",Tools,/missing-title,1,false,no,\n"
+        "Broken,Tools,,soon,false,no,\n"
+    )
+
+    def import_csv(self, text, **kwargs):
+        return import_catalog(read_catalog(StringIO(text), 'csv'), **kwargs)
+
+    def test_import_upserts_and_links_parents(self):
+        result = self.import_csv(self.CSV, batch_size=2)
+        self.assertEqual((result.created, result.updated, result.error_count), (3, 0, 2))
+        self.assertEqual([error['line'] for error in result.errors], [5, 6])
+
+        area = MenuItem.objects.get(title="Area")
+        self.assertEqual(str(area), "Converters > Area")
+        self.assertTrue(area.is_trending)
+        self.assertEqual(MenuItem.objects.get(title="Converters").analytics_data, {"views": 3})
+
+        again = self.import_csv(self.CSV)
+        self.assertEqual((again.created, again.updated, again.unchanged, again.linked), (0, 0, 3, 0))
+
+    def test_parent_paths_must_match_the_menu(self):
+        self.import_csv(self.CSV)
+        result = self.import_csv(
+            "title,parent\n"
+            "Length,Tools > Converters\n"
+            "Volume,Converters\n"               # A single title names the parent anywhere
+            "Finance,\n"
+            "Loan,Finance > Converters\n"       # Converters is under Tools, not Finance
+            "Weight,Converters > Tools\n"
+            "Speed,Tools > Ghost > Converters\n"
+        )
+        self.assertEqual((result.created, result.error_count), (6, 3))
+        self.assertEqual(
+            [error['error'] for error in result.errors],
+            [
+                "Loan: parent path 'Finance > Converters' does not match the menu.",
+                "Weight: parent path 'Converters > Tools' does not match the menu.",
+                "Speed: parent 'Ghost' does not exist.",
+            ],
+        )
+        converters = MenuItem.objects.get(title="Converters")
+        self.assertEqual(
+            set(MenuItem.objects.filter(parent_menu=converters).values_list('title', flat=True)),
+            {"Area", "Length", "Volume"},
+        )
+        self.assertIsNone(MenuItem.objects.get(title="Loan").parent_menu)
+
+    def test_export_round_trips(self):
+        self.import_csv(self.CSV)
+        for fmt in ('csv', 'jsonl'):
+            exported = ''.join(export_catalog(fmt))
+            result = import_catalog(read_catalog(StringIO(exported), fmt))
+            self.assertEqual((result.rows, result.unchanged, result.error_count), (3, 3, 0), fmt)
+
+    def test_endpoints_are_admin_only_and_stream(self):
+        export_url, import_url = reverse('catalog_export'), reverse('catalog_import')
+        self.assertEqual(self.client.get(export_url).status_code, 401)
+
+        self.client.force_login(User.objects.create_superuser(username='admin', password='pw'))
+        upload = SimpleUploadedFile("catalog.csv", self.CSV.encode())
+        response = self.client.post(import_url, {'file': upload})
+        self.assertEqual(response.json()['created'], 3)
+
+        response = self.client.get(export_url, {'file_format': 'jsonl'})
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)['title'] for line in lines], ["Tools", "Converters", "Area"])
+
+
+class AnalyticsEventBufferTests(TestCase):
+    def setUp(self):
+        self.converter = MenuItem.objects.create(title="Converter", analytics_data={"owner": "seo"})
+        self.timer = MenuItem.objects.create(title="Timer")
+        event_buffer.flush()
+
+    def test_endpoint_buffers_until_flush(self):
+        url = reverse('analytics_events')
+        events = [
+            {"item": self.converter.pk, "type": "view"},
+            {"item": self.converter.pk, "type": "click", "ts": time.time() * 1000 - 1000},
+            {"item": self.timer.pk, "type": "view"},
+            {"item": self.timer.pk, "type": "scroll"},
+            {"type": "view"},
+        ]
+        with self.assertNumQueries(0):
+            response = self.client.post(url, {"events": events}, content_type='application/json')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json(), {"accepted": 3, "rejected": 2})
+        self.assertEqual(MenuItemEvent.objects.count(), 0)
+
+        with self.assertNumQueries(5): # Savepoint, lock rows, insert events, update counters, release
+            self.assertEqual(event_buffer.flush(), 3)
+        self.converter.refresh_from_db()
+        self.assertEqual(
+            {key: self.converter.analytics_data[key] for key in ("owner", "views", "clicks")},
+            {"owner": "seo", "views": 1, "clicks": 1},
+        )
+        self.assertEqual(MenuItem.objects.get(pk=self.timer.pk).analytics_data["views"], 1)
+
+    def test_rollup_overwrites_malformed_last_event_at(self):
+        MenuItem.objects.filter(pk=self.converter.pk).update(analytics_data={"last_event_at": 1700000000})
+        MenuItem.objects.filter(pk=self.timer.pk).update(analytics_data={"last_event_at": None, "views": 2})
+        now = timezone.now()
+        buffer = EventBuffer(max_size=100, flush_interval=60)
+        buffer.add([(self.converter.pk, 'view', now), (self.timer.pk, 'view', now)])
+        self.assertEqual(buffer.flush(), 2)
+        for pk in (self.converter.pk, self.timer.pk):
+            self.assertEqual(MenuItem.objects.get(pk=pk).analytics_data["last_event_at"], now.isoformat())
+        self.assertEqual(MenuItem.objects.get(pk=self.timer.pk).analytics_data["views"], 3)
+
+    def test_flush_drops_unknown_items(self):
+        buffer = EventBuffer(max_size=100, flush_interval=60)
+        now = timezone.now()
+        buffer.add([(self.timer.pk, 'view', now), (self.timer.pk + 1000, 'view', now), (self.timer.pk, 'click', now)])
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(buffer.flush(), 2)
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(MenuItemEvent.objects.filter(menu_item=self.timer).count(), 2)
+        self.assertEqual(MenuItemEvent.objects.count(), 2)
+
+    def flush_in_background(self, buffer, *batches):
+        """Add the batches and return the events and thread of the first flush (None if there was none)."""
+        flushed, calls = threading.Event(), []
+        def write(events):
+            calls.append((events, threading.current_thread()))
+            flushed.set()
+            return len(events)
+        with mock.patch('core.analytics.write_events', side_effect=write):
+            for batch in batches:
+                buffer.add(batch)
+            flushed.wait(5)
+        return calls[0] if calls else (None, None)
+
+    def test_full_buffer_is_flushed_off_the_request_thread(self):
+        now = timezone.now()
+        batch = [(self.timer.pk, 'view', now)] * 2
+        events, thread = self.flush_in_background(EventBuffer(max_size=3, flush_interval=60), batch, batch)
+        self.assertEqual(len(events), 4)
+        self.assertNotEqual(thread, threading.current_thread())
+
+    def test_quiet_buffer_is_flushed_after_the_interval(self):
+        started = time.monotonic()
+        events, _ = self.flush_in_background(
+            EventBuffer(max_size=100, flush_interval=0.2), [(self.timer.pk, 'view', timezone.now())]
+        )
+        self.assertEqual(len(events), 1)
+        self.assertGreaterEqual(time.monotonic() - started, 0.2)
+
+    def test_rejects_malformed_batches(self):
+        url = reverse('analytics_events')
+        self.assertEqual(self.client.post(url, [], content_type='application/json').status_code, 400)
+        too_many = {"events": [{"item": 1, "type": "view"}] * 501}
+        self.assertEqual(self.client.post(url, too_many, content_type='application/json').status_code, 400)
+
+
+@skipUnless(np, "numpy is not installed")
+class TrendingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.now = timezone.now()
+        self.items = {
+            title: MenuItem.objects.create(title=title, tool_domain=domain, is_trending=title == "Stale")
+            for title, domain in [
+                ("Loan", "finance"), ("Tax", "finance"), ("Budget", "finance"), ("Stale", "finance"),
+                ("Area", "converters"), ("Hidden Hit", "converters"),
+            ]
+        }
+        self.items["Hidden Hit"].is_hidden = True
+        self.items["Hidden Hit"].save()
+
+    def record(self, title, event_type, count, hours_ago=0):
+        occurred_at = self.now - timedelta(hours=hours_ago)
+        MenuItemEvent.objects.bulk_create(
+            MenuItemEvent(menu_item=self.items[title], event_type=event_type, occurred_at=occurred_at)
+            for _ in range(count)
+        )
+
+    def test_rank_within_groups(self):
+        ranks = rank_within_groups(np.array([0, 1, 0, 0, 1]), np.array([1.0, 5.0, 3.0, 1.0, 2.0]))
+        self.assertEqual(ranks.tolist(), [1, 0, 0, 2, 1])
+
+    @in_process_cache
+    def test_top_items_per_domain_become_trending(self):
+        self.record("Loan", 'view', 10, hours_ago=96) # Two half-lives: worth 2.5
+        self.record("Tax", 'click', 1)                # Worth 3
+        self.record("Budget", 'view', 2)
+        self.record("Area", 'view', 1)
+        self.record("Hidden Hit", 'view', 50)
+        self.record("Stale", 'view', 1, hours_ago=24 * 30) # Outside the window
+
+        self.assertEqual(compute_trending(top_n=2, now=self.now), (3, 1))
+        trending = set(MenuItem.objects.filter(is_trending=True).values_list('title', flat=True))
+        self.assertEqual(trending, {"Tax", "Loan", "Area"})
+
+        response = self.client.get(reverse('trending'), {'domain': 'finance', 'limit': 2}).json()
+        self.assertEqual([(item['title'], item['score']) for item in response['items']], [("Tax", 3.0), ("Loan", 2.5)])
+
+        with self.assertNumQueries(2): # Live items and current flags (events are COPYed on the raw cursor)
+            self.assertEqual(compute_trending(top_n=2, now=self.now), (0, 0))
+
+    @mock.patch('core.geo.GEO_REGION_HEADERS', ('CF-IPCountry',))
+    def test_rankings_follow_region_and_role(self):
+        members = MenuItem.objects.create(title="Members Budget", tool_domain="finance", access_level='registered')
+        india = MenuItem.objects.create(title="India Tax", tool_domain="finance", geo_location="India")
+        for item in (members, india):
+            MenuItemEvent.objects.create(menu_item=item, event_type='click', occurred_at=self.now)
+        self.record("Loan", 'view', 1)
+        compute_trending(now=self.now)
+
+        def titles(**extra):
+            response = self.client.get(reverse('trending'), **extra)
+            self.assertIn('Authorization', response['Vary'])
+            return [item['title'] for item in response.json()['items']]
+        self.assertEqual(titles(), ["Loan"])
+        self.assertEqual(titles(HTTP_CF_IPCOUNTRY="IN"), ["India Tax", "Loan"])
+        self.client.force_login(User.objects.create_user(username='editor', is_staff=True))
+        self.assertEqual(titles(), ["Members Budget", "Loan"])
+
+
+@mock.patch('core.geo.GEO_REGION_HEADERS', ('CF-IPCountry',))
+class GeoTargetedMenuTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('menu_items_list')
+        MenuItem.objects.create(title="Everywhere", order=1)
+        MenuItem.objects.create(title="India Only", order=2, geo_location="India")
+        self.us_item = MenuItem.objects.create(title="US Only", order=3, geo_location="USA, Canada")
+
+    def titles(self, **headers):
+        return [item['title'] for item in self.client.get(self.url, headers=headers).json()['navbar']['menuItems']]
+
+    def test_region_codes(self):
+        self.assertEqual(region_codes(" usa ; uk|in "), ["GB", "IN", "US"])
+        self.assertEqual(region_codes("North America, Global"), [])
+        self.assertEqual(region_codes(""), [])
+        self.assertEqual(region_codes("in, xx, qq"), ["IN"])
+        self.assertEqual(self.us_item.geo_regions, ["CA", "US"])
+
+    def test_variants_per_region(self):
+        self.assertEqual(self.titles(), ["Everywhere"])
+        self.assertEqual(self.titles(CF_IPCountry="in"), ["Everywhere", "India Only"])
+        self.assertEqual(self.titles(CF_IPCountry="US"), ["Everywhere", "US Only"])
+        self.assertEqual(self.titles(CF_IPCountry="XX"), ["Everywhere"])
+        self.assertEqual(self.titles(CF_IPCountry="QQ"), ["Everywhere"])
+
+    def test_untrusted_headers_are_ignored(self):
+        self.assertEqual(self.titles(X_Region="IN"), ["Everywhere"])
+        with mock.patch('core.geo.GEO_REGION_HEADERS', ()):
+            self.assertEqual(self.titles(CF_IPCountry="IN"), ["Everywhere"])
+
+    @in_process_cache
+    def test_only_targeted_regions_are_rebuilt(self):
+        self.titles(CF_IPCountry="IN")
+        self.us_item.title = "US Tools"
+        self.us_item.save()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.titles(CF_IPCountry="IN"), ["Everywhere", "India Only"])
+        self.assertEqual(self.titles(CF_IPCountry="US"), ["Everywhere", "US Tools"])
+
+        self.us_item.geo_location = "India" # Moving regions refreshes both the old and the new one
+        self.us_item.save()
+        self.assertEqual(self.titles(CF_IPCountry="IN"), ["Everywhere", "India Only", "US Tools"])
+        self.assertEqual(self.titles(CF_IPCountry="US"), ["Everywhere"])
+
+    def test_geoip_database(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source, database = os.path.join(directory, 'ranges.csv'), os.path.join(directory, 'geo.bin')
+            with open(source, 'w') as ranges:
+                ranges.write("start,end,country\n10.0.0.0,10.0.0.255,in\n167772416,167772671,US\n::1,::2,DE\n")
+            call_command('build_geoip_db', source, database, stdout=StringIO())
+
+            geoip = GeoIPDatabase(database)
+            self.assertEqual([geoip.lookup(ip) for ip in ("10.0.0.7", "10.0.1.1", "10.0.2.0", "9.9.9.9", "::1")],
+                             ["IN", "US", None, None, None])
+            geoip.close()
+
+            with mock.patch('core.geo._database', None), self.settings(GEOIP_DATABASE=database):
+                response = self.client.get(self.url, REMOTE_ADDR="10.0.0.7")
+                self.assertEqual([item['title'] for item in response.json()['navbar']['menuItems']], ["Everywhere", "India Only"])
+
+
+class AccessLevelMenuTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        token_cache.clear()
+        self.url = reverse('menu_items_list')
+        for order, level in enumerate(['public', 'registered', 'admin', 'private']):
+            parent = MenuItem.objects.create(title=level.title(), order=order, access_level=level, is_dropdown=True)
+            MenuItem.objects.create(title=f"{level.title()} Child", parent_menu=parent)
+            MenuItem.objects.create(title=f"Members Child of {level.title()}", parent_menu=parent, access_level='registered')
+
+    def menu(self, **extra):
+        return self.client.get(self.url, **extra).json()['navbar']['menuItems']
+
+    @mock.patch('core.backends.auth.verify_id_token')
+    def test_each_role_sees_its_tree(self, verify_id_token):
+        verify_id_token.return_value = {'uid': 'member', 'exp': int(time.time()) + 3600}
+        anonymous = self.menu()
+        self.assertEqual([item['title'] for item in anonymous], ["Public"])
+        self.assertEqual([child['title'] for child in anonymous[0]['items']], ["Public Child"])
+
+        member = self.menu(HTTP_AUTHORIZATION='Bearer member-token')
+        self.assertEqual([item['title'] for item in member], ["Public", "Registered"])
+        self.assertEqual(len(member[0]['items']), 2)
+
+        self.client.force_login(User.objects.create_user(username='editor', is_staff=True))
+        self.assertEqual([item['title'] for item in self.menu()], ["Public", "Registered", "Admin", "Private"])
+
+    @mock.patch('core.backends.auth.verify_id_token')
+    @in_process_cache
+    def test_signed_in_callers_are_served_from_the_cache(self, verify_id_token):
+        verify_id_token.return_value = {'uid': 'member', 'exp': int(time.time()) + 3600}
+        self.menu(HTTP_AUTHORIZATION='Bearer member-token')
+        with self.assertNumQueries(1): # Only the Firebase user lookup; no menu queries
+            response = self.client.get(self.url, HTTP_AUTHORIZATION='Bearer member-token')
+        self.assertIn('Authorization', response['Vary'])
+
+
+class ToolCatalogTests(TestCase):
+    url = reverse('tool_catalog')
+
+    def setUp(self):
+        tools = MenuItem.objects.create(title="Tools", is_dropdown=True)
+        for i in range(25):
+            MenuItem.objects.create(
+                title=f"Tool {i:02}", order=i % 3, parent_menu=tools,
+                tool_domain='converter' if i % 2 else 'calculator', is_featured=i < 4,
+            )
+        MenuItem.objects.create(title="Retired Tool", is_archived=True)
+
+    def pages(self, params):
+        response = self.client.get(self.url, params).json()
+        yield response
+        while response['next']:
+            response = self.client.get(response['next']).json()
+            yield response
+
+    def test_pages_cover_every_tool_once_in_order(self):
+        pages = list(self.pages({'page_size': 4}))
+        items = [item for page in pages for item in page['results']]
+        self.assertEqual(len(pages), 7)
+        expected = MenuItem.live.filter(is_dropdown=False).order_by('order', 'id')
+        self.assertEqual([item['id'] for item in items], list(expected.values_list('id', flat=True)))
+        self.assertIn('seo_description', items[0]) # Card-shaped
+        self.assertNotIn('custom_js', items[0])
+
+    def test_filters(self):
+        items = [item for page in self.pages({'tool_domain': 'converter', 'is_featured': 'true'}) for item in page['results']]
+        self.assertEqual([item['title'] for item in items], ["Tool 03", "Tool 01"]) # order 0, then 1
+        self.assertEqual(self.client.get(self.url, {'is_promoted': 'maybe'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'cursor': 'not-a-cursor'}).status_code, 404)
+
+    def test_deep_pages_cost_the_same_as_the_first(self):
+        first = self.client.get(self.url, {'page_size': 2}).json()
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(first['next'])
+        self.assertEqual(len(queries), 1)
+        # The page seeks with a row comparison the (order, id) index can serve, not OFFSET
+        sql = queries[0]['sql']
+        self.assertIn('("core_menuitem"."order", "core_menuitem"."id") >', sql)
+        self.assertNotIn('OFFSET', sql)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE core_menuitem") # Fresh statistics, whatever earlier tests left behind
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(f"EXPLAIN {sql}")
+            plan = '\n'.join(row[0] for row in cursor.fetchall())
+        self.assertIn('core_menuitem_tools_idx', plan)
+
+
+class UnitConversionTests(TestCase):
+    def test_conversions_are_exact_where_the_definitions_are(self):
+        self.assertEqual(convert(100, 'C', 'F'), 212.0)
+        self.assertEqual(convert(212, 'fahrenheit', '°C'), 100.0)
+        self.assertEqual(convert(1, 'mi', 'km'), 1.609344)
+        self.assertEqual(convert(1, 'Acre', 'm2'), 4046.8564224)
+        self.assertEqual(convert(1, 'cup', 'tbsp'), 16.0)
+        with self.assertRaisesMessage(ValueError, "Cannot convert length (m) to mass (kg)."):
+            convert(1, 'm', 'kg')
+
+    def test_single_value_endpoint(self):
+        response = self.client.get(reverse('unit_convert'), {'value': '5', 'from': 'kilometres', 'to': 'm'})
+        self.assertEqual(response.json(), {'dimension': 'length', 'from': 'km', 'to': 'm', 'value': 5.0, 'result': 5000.0})
+        self.assertEqual(self.client.get(reverse('unit_convert'), {'value': 'x', 'from': 'm', 'to': 'ft'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('unit_convert'), {'value': '1', 'from': 'm', 'to': 'parsec'}).status_code, 400)
+        overflow = self.client.get(reverse('unit_convert'), {'value': '1e308', 'from': 'km', 'to': 'm'})
+        self.assertEqual(overflow.json(), {'detail': "Result is not a finite number."})
+        self.assertIn('gal', self.client.get(reverse('unit_catalog')).json()['dimensions']['volume'])
+
+    @skipUnless(np, "numpy is not installed")
+    def test_batch_endpoint(self):
+        np.testing.assert_allclose(convert_many([0, -40, 37], 'C', 'F'), [32, -40, 98.6])
+        url = reverse('unit_convert_batch')
+        response = self.client.post(url, {'from': 'kg', 'to': 'g', 'values': [1, 2.5, -3]}, content_type='application/json')
+        self.assertEqual(response.json(), {'dimension': 'mass', 'from': 'kg', 'to': 'g', 'results': [1000.0, 2500.0, -3000.0]})
+        for bad_values in ([1, 'two'], ["1.5"], [1, None], [True, 2], [[1, 2]]):
+            with self.subTest(values=bad_values):
+                response = self.client.post(url, {'from': 'kg', 'to': 'g', 'values': bad_values}, content_type='application/json')
+                self.assertEqual(response.status_code, 400)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error') # No RuntimeWarning from the overflow
+            overflow = self.client.post(url, {'from': 'km', 'to': 'm', 'values': [1, 1e308]}, content_type='application/json')
+        self.assertEqual(overflow.json(), {'detail': "Result is not a finite number for value #2."})
+        with mock.patch.object(UnitBatchConversionView, 'max_values', 2):
+            self.assertEqual(
+                self.client.post(url, {'from': 'kg', 'to': 'g', 'values': [1, 2, 3]}, content_type='application/json').status_code,
+                400,
+            )
+
+
+class CurrencyConversionTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.source = os.path.join(directory.name, 'rates.json')
+        self.snapshot = os.path.join(directory.name, 'rates.bin')
+        self.write_source({'EUR': 0.8, 'INR': 80, 'JPY': 150}, timestamp=time.time() - 60)
+        call_command('refresh_currency_rates', source=self.source, output=self.snapshot, stdout=StringIO())
+        settings_override = override_settings(CURRENCY_RATE_SNAPSHOT=self.snapshot)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def write_source(self, rates, timestamp):
+        with open(self.source, 'w', encoding='utf-8') as source:
+            json.dump({'base': 'USD', 'timestamp': timestamp, 'rates': rates}, source)
+
+    def test_snapshot_holds_every_pairwise_rate(self):
+        snapshot = currency.rate_snapshot()
+        self.assertEqual(snapshot.codes, ['EUR', 'INR', 'JPY', 'USD'])
+        self.assertEqual(snapshot.rate('USD', 'INR'), 80.0)
+        self.assertEqual(snapshot.rate('eur', 'USD'), 1.25)
+        self.assertEqual(snapshot.rate('EUR', 'INR'), 100.0)
+        with self.assertRaisesMessage(ValueError, "Unknown currency 'XYZ'."):
+            snapshot.rate('USD', 'XYZ')
+
+    def test_single_conversion_endpoint(self):
+        response = self.client.get(reverse('currency_convert'), {'amount': '10', 'from': 'usd', 'to': 'EUR'}).json()
+        self.assertEqual({key: response[key] for key in ('from', 'to', 'amount', 'rate', 'result')},
+                         {'from': 'USD', 'to': 'EUR', 'amount': 10.0, 'rate': 0.8, 'result': 8.0})
+        self.assertFalse(response['snapshot']['stale'])
+        self.assertGreaterEqual(response['snapshot']['age_seconds'], 60)
+        self.assertEqual(self.client.get(reverse('currency_convert'), {'amount': '1', 'from': 'USD', 'to': 'XYZ'}).status_code, 400)
+        overflow = self.client.get(reverse('currency_convert'), {'amount': '1e307', 'from': 'USD', 'to': 'JPY'})
+        self.assertEqual(overflow.json(), {'detail': "Result is not a finite number."})
+        with override_settings(CURRENCY_RATE_SNAPSHOT=None):
+            self.assertEqual(self.client.get(reverse('currency_catalog')).status_code, 503)
+
+    @skipUnless(np, "numpy is not installed")
+    def test_batch_endpoint(self):
+        url = reverse('currency_convert_batch')
+        response = self.client.post(
+            url, {'from': 'USD', 'to': ['EUR', 'INR', 'USD'], 'amounts': [10, 2, 3]}, content_type='application/json',
+        ).json()
+        self.assertEqual(response['results'], [8.0, 160.0, 3.0])
+        self.assertEqual(response['rates'], [0.8, 80.0, 1.0])
+        mismatched = self.client.post(url, {'from': ['USD'], 'to': 'EUR', 'amounts': [1, 2]}, content_type='application/json')
+        self.assertEqual(mismatched.status_code, 400)
+        not_numbers = self.client.post(url, {'from': 'USD', 'to': 'EUR', 'amounts': ["10", None]}, content_type='application/json')
+        self.assertEqual(not_numbers.status_code, 400)
+        overflow = self.client.post(url, {'from': 'USD', 'to': 'JPY', 'amounts': [1, 1e307]}, content_type='application/json')
+        self.assertEqual(overflow.json(), {'detail': "Result is not a finite number for amount #2."})
+        with mock.patch.object(CurrencyBatchConversionView, 'max_amounts', 1):
+            too_many = self.client.post(url, {'from': 'USD', 'to': 'EUR', 'amounts': [1, 2]}, content_type='application/json')
+            self.assertEqual(too_many.status_code, 400)
+
+    def test_workers_pick_up_a_refreshed_snapshot(self):
+        self.assertEqual(currency.rate_snapshot().rate('USD', 'EUR'), 0.8)
+        self.write_source({'EUR': 0.9}, timestamp=time.time() - 7 * 60 * 60)
+        call_command('refresh_currency_rates', source=self.source, output=self.snapshot, stdout=StringIO())
+        with mock.patch.object(currency, 'SNAPSHOT_CHECK_INTERVAL', 0):
+            response = self.client.get(reverse('currency_catalog')).json()
+        self.assertEqual(response['currencies'], ['EUR', 'USD'])
+        self.assertTrue(response['snapshot']['stale'])
+
+    def test_invalid_rates_keep_the_previous_snapshot(self):
+        self.write_source({'EUR': -1}, timestamp=time.time())
+        with self.assertRaisesMessage(CommandError, "Invalid rate for EUR"):
+            call_command('refresh_currency_rates', source=self.source, output=self.snapshot, stdout=StringIO())
+        self.assertEqual(currency.RateSnapshot(self.snapshot).rate('USD', 'EUR'), 0.8)
+        for rates in ({'EUR\n': 0.9}, {'eur': 0.9}, {'EUR': True}, {'EUR': float('nan')}):
+            with self.subTest(rates=rates), self.assertRaises(ValueError):
+                currency.write_rate_snapshot('USD', rates, timezone.now(), self.snapshot)
+        with open(self.source, 'w', encoding='utf-8') as source:
+            json.dump({'base': 840, 'rates': {'EUR': 0.9}}, source)
+        with self.assertRaisesMessage(CommandError, "Invalid currency code 840."):
+            call_command('refresh_currency_rates', source=self.source, output=self.snapshot, stdout=StringIO())
+
+
+class PasswordGeneratorTests(TestCase):
+    def test_passwords_follow_the_policy(self):
+        policy = password_policy(length=8, symbols=False, exclude='abc', exclude_similar=True)
+        passwords = [password for chunk in generate_passwords(policy, 1000, chunk_size=64) for password in chunk]
+        self.assertEqual(len(passwords), 1000)
+        self.assertGreater(len(set(passwords)), 990)
+        for password in passwords:
+            self.assertEqual(len(password), 8)
+            self.assertTrue(password.isalnum() and not set(password) & set('abcIl1O0o'))
+            self.assertTrue(any(c.islower() for c in password) and any(c.isupper() for c in password))
+            self.assertTrue(any(c.isdigit() for c in password))
+        with self.assertRaisesMessage(ValueError, "'length' must be 4-256."):
+            password_policy(length=3)
+        with self.assertRaisesMessage(ValueError, "Every digits character is excluded."):
+            password_policy(exclude='0123456789')
+
+    def test_policies_that_would_reject_most_passwords_are_refused(self):
+        self.assertAlmostEqual(acceptance(2, ['ab', 'cd']), 0.5)
+        # One uppercase letter, digit and symbol left: about 0.09% of 4-character draws contain all three
+        exclude = string.ascii_uppercase[1:] + string.digits[1:] + string.punctuation[1:]
+        with self.assertRaisesMessage(ValueError, "Too few characters are left"):
+            password_policy(length=4, exclude=exclude)
+        self.assertEqual(len(password_policy(length=40, exclude=exclude)['classes']), 4) # Long enough to find them
+        password_policy(length=4, exclude_similar=True) # The shortest default policy still qualifies
+
+    def test_endpoint_streams_one_password_per_line(self):
+        response = self.client.get(reverse('password_generator'), {'count': '5000', 'length': '12', 'symbols': 'false'})
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Cache-Control'], 'no-store')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 5000)
+        self.assertTrue(all(len(line) == 12 and line.isalnum() for line in lines))
+        self.assertEqual(self.client.get(reverse('password_generator'), {'count': '0'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('password_generator'), {'digits': 'maybe'}).status_code, 400)
+
+
+class QRCodeTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache_dir = directory.name
+        settings_override = override_settings(QR_CACHE_DIR=self.cache_dir, QR_RENDER_PROCESSES=0)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_renderings_are_cached_and_immutable(self):
+        params = {'data': 'https://dailytoolbox.example/qr', 'scale': '4'}
+        with mock.patch.object(qr, 'render_qr', wraps=qr.render_qr) as render:
+            first = self.client.get(reverse('qr_code'), params)
+            second = self.client.get(reverse('qr_code'), params)
+        self.assertEqual(render.call_count, 1)
+        self.assertEqual(first['Content-Type'], 'image/png')
+        self.assertTrue(first.content.startswith(b'\x89PNG\r\n\x1a\n'))
+        self.assertEqual(second.content, first.content)
+        self.assertIn('immutable', first['Cache-Control'])
+        revalidated = self.client.get(reverse('qr_code'), params, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(revalidated.status_code, 304)
+
+        svg = self.client.get(reverse('qr_code'), {**params, 'image_format': 'svg', 'dark': '#336699'})
+        self.assertEqual(svg['Content-Type'], 'image/svg+xml')
+        self.assertIn(b'fill="#336699"', svg.content)
+        self.assertEqual(self.client.get(reverse('qr_code'), {**params, 'scale': '0'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('qr_code'), {'data': 'x' * 1300, 'error_correction': 'H'}).status_code, 400)
+
+    def test_batch_streams_a_zip_and_renders_each_payload_once(self):
+        items = ['https://a.example', {'data': 'https://b.example', 'name': 'b/guest wifi'}, 'https://a.example']
+        with mock.patch.object(qr, 'render_qr', wraps=qr.render_qr) as render:
+            response = self.client.post(reverse('qr_batch'), {'items': items, 'image_format': 'svg'}, content_type='application/json')
+            archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(render.call_count, 2)
+        self.assertEqual(archive.namelist(), ['qr-0001.svg', 'b-guest-wifi.svg', 'qr-0003.svg'])
+        self.assertEqual(archive.read('qr-0001.svg'), archive.read('qr-0003.svg'))
+        single = self.client.get(reverse('qr_code'), {'data': 'https://b.example', 'image_format': 'svg'})
+        self.assertEqual(archive.read('b-guest-wifi.svg'), single.content)
+        bad_item = self.client.post(reverse('qr_batch'), {'items': ['ok', '']}, content_type='application/json')
+        self.assertEqual(bad_item.json()['detail'], "Item 2: QR content must be a non-empty string.")
+
+    def test_batch_renders_on_the_process_pool(self):
+        items = [f'https://example.com/{index}' for index in range(20)]
+        with override_settings(QR_RENDER_PROCESSES=2):
+            response = self.client.post(reverse('qr_batch'), {'items': items}, content_type='application/json')
+            archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(len(archive.namelist()), 20)
+        self.assertEqual(archive.read('qr-0005.png'), qr.render_qr(items[4], qr.qr_options()))
+
+    def test_batch_survives_a_broken_process_pool(self):
+        broken = ProcessPoolExecutor(max_workers=1)
+        with self.assertRaises(BrokenProcessPool):
+            broken.submit(os._exit, 1).result() # A worker dying breaks the whole pool
+        items = [f'https://example.com/{index}' for index in range(3)]
+        with override_settings(QR_RENDER_PROCESSES=2), mock.patch.object(qr, '_pool', broken):
+            response = self.client.post(reverse('qr_batch'), {'items': items}, content_type='application/json')
+            archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+            self.assertIsNone(qr._pool) # Replaced by a fresh pool on the next batch
+        self.assertEqual(archive.read('qr-0003.png'), qr.render_qr(items[2], qr.qr_options()))
+
+    def test_least_recently_used_files_are_evicted(self):
+        cache = qr.QRCache(self.cache_dir, max_bytes=10 ** 6)
+        for index, key in enumerate(('aa01', 'bb02', 'cc03')):
+            cache.put(key, 'png', b'x' * 1000)
+            os.utime(cache.path(key, 'png'), (1000 + index, 1000 + index))
+        cache.get('aa01', 'png') # Used: now the most recent
+        cache.max_bytes = 2500
+        self.assertEqual(cache.evict(), 1)
+        self.assertIsNone(cache.get('bb02', 'png'))
+        self.assertIsNotNone(cache.get('aa01', 'png'))
+
+
+class ExpressionEvaluationTests(TestCase):
+    def test_expressions_are_compiled_once_and_sandboxed(self):
+        compile_expression.cache_clear()
+        self.assertEqual(compile_expression('2 * (x + 1)^2').evaluate(x=3), 32.0)
+        self.assertEqual(compile_expression('2 * (x + 1)^2').variables, ('x',))
+        self.assertEqual(compile_expression.cache_info().hits, 1)
+        self.assertAlmostEqual(compile_expression('sqrt(16) + log(8, 2) + sin(pi / 2)').evaluate(), 8.0)
+        for text, message in [
+            ('__import__("os")', "Unknown function."),
+            ('(1).__class__', "Unsupported syntax: Attribute."),
+            ('x if x else 1', "Unsupported syntax: IfExp."),
+            ('9 ** 9 ** 9', "Result is too large."),
+            ('-' * 250 + '1', "Expression is too complex"),
+            ('1 +', "Invalid expression."),
+        ]:
+            with self.subTest(text=text), self.assertRaisesMessage(ValueError, message):
+                compile_expression(text).evaluate(x=1)
+        with self.assertRaisesMessage(ValueError, "Division by zero."):
+            compile_expression('1 / (x - 1)').evaluate(x=1)
+
+    @skipUnless(np, "numpy is not installed")
+    def test_batch_evaluation_is_vectorised_and_time_limited(self):
+        expression = compile_expression('a * x + b / x')
+        np.testing.assert_allclose(expression.evaluate_many({'x': [1, 2, 0], 'a': 2, 'b': [1, 1, 1]}), [3, 4.5, np.inf])
+        with self.assertRaisesMessage(ValueError, "Evaluation took too long."):
+            compile_expression('sin(x) + cos(x)').evaluate_many({'x': np.zeros(10)}, time_limit=-1)
+
+    def test_endpoints(self):
+        single = self.client.get(reverse('expression_evaluate'), {'expression': 'x^2 + y', 'x': '3', 'y': '1'})
+        self.assertEqual(single.json(), {'expression': 'x^2 + y', 'result': 10.0})
+        self.assertEqual(self.client.get(reverse('expression_evaluate'), {'expression': 'x + 1'}).status_code, 400)
+
+    @skipUnless(np, "numpy is not installed")
+    def test_batch_endpoint(self):
+        batch = self.client.post(
+            reverse('expression_evaluate_batch'), {'expression': 'x / y', 'variables': {'x': [1, 1], 'y': [4, 0]}},
+            content_type='application/json',
+        )
+        self.assertEqual(batch.json(), {'results': [0.25, None]}) # Infinity has no JSON form
+        for variables in ({'x': [1, 'a']}, {'x': ["1.5"]}, {'x': [1, None]}, {'x': True}):
+            with self.subTest(variables=variables):
+                self.assertEqual(self.client.post(
+                    reverse('expression_evaluate_batch'), {'expression': 'x', 'variables': variables},
+                    content_type='application/json',
+                ).status_code, 400)
+
+
+class SharedCacheTests(CrossProcessTestCase):
+    def test_process_local_cache_fails_the_system_check(self):
+        self.assertEqual(check_shared_cache(None), [])
+        with override_settings(CACHES=IN_PROCESS_CACHE):
+            self.assertEqual([error.id for error in check_shared_cache(None)], ['core.E001'])
+
+    def test_menu_invalidation_reaches_other_processes(self):
+        version = menu_version()
+        self.run_in_subprocess("from core.menu_cache import invalidate_menu_cache\ninvalidate_menu_cache()")
+        self.assertNotEqual(menu_version(), version)
+
+
+class PublishScheduledItemsWorkerTests(CrossProcessTestCase):
+    def test_publishing_in_a_worker_refreshes_the_navbar(self):
+        MenuItem.objects.create(
+            title="Due Tool", is_published=False, is_scheduled=True, scheduled_at=timezone.now() - timedelta(minutes=5)
+        )
+        url = reverse('menu_items_list')
+        self.assertEqual(self.client.get(url).json()['navbar']['menuItems'], []) # Cached as empty
+
+        self.run_in_subprocess(
+            "from django.core.management import call_command\ncall_command('publish_scheduled_items')"
+        )
+        self.assertEqual([item['title'] for item in self.client.get(url).json()['navbar']['menuItems']], ["Due Tool"])
+
+
+class CatalogImportWorkerTests(CrossProcessTestCase):
+    def test_importing_in_a_worker_refreshes_the_navbar_and_typeahead(self):
+        typeahead._index.version = None
+        navbar_url, suggest_url = reverse('menu_items_list'), reverse('search_suggest')
+        self.assertEqual(self.client.get(navbar_url).json()['navbar']['menuItems'], [])
+        self.assertEqual(self.client.get(suggest_url, {'q': 'conv'}).json()['items'], [])
+
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as catalog:
+            catalog.write(CatalogImportExportTests.CSV)
+        self.addCleanup(os.unlink, catalog.name)
+        self.run_in_subprocess(
+            f"from django.core.management import call_command\ncall_command('import_catalog', {catalog.name!r})"
+        )
+        menu = self.client.get(navbar_url).json()['navbar']['menuItems']
+        self.assertEqual([item['title'] for item in menu], ["Tools"])
+        suggestions = self.client.get(suggest_url, {'q': 'conv'}).json()['items']
+        self.assertEqual([item['title'] for item in suggestions], ["Converters"])
+
+
+@skipUnless(np, "numpy is not installed")
+class TrendingWorkerTests(CrossProcessTestCase):
+    def test_rankings_computed_in_a_worker_are_served(self):
+        tax = MenuItem.objects.create(title="Tax", tool_domain='finance')
+        MenuItemEvent.objects.create(menu_item=tax, event_type='click', occurred_at=timezone.now())
+        self.assertEqual(self.client.get(reverse('trending')).json()['items'], [])
+
+        self.run_in_subprocess("from django.core.management import call_command\ncall_command('compute_trending')")
+        response = self.client.get(reverse('trending')).json()
+        self.assertIsNotNone(response['computed_at'])
+        self.assertEqual([(item['title'], item['score']) for item in response['items']], [("Tax", 3.0)])
+
+
+class FullTextSearchTests(TestCase):
+    url = reverse('search')
+
+    def setUp(self):
+        MenuItem.objects.create(
+            title="Temperature Converter", tool_domain='converter',
+            seo_description="Convert Celsius to Fahrenheit and Kelvin.",
+        )
+        MenuItem.objects.create(title="Celsius Table", seo_title="Celsius conversion chart")
+        MenuItem.objects.create(title="Loan Calculator", seo_description="Monthly payments.")
+        MenuItem.objects.create(title="Hidden Celsius Tool", is_searchable=False)
+
+    def search(self, query, **params):
+        return self.client.get(self.url, {'q': query, **params}).json()
+
+    def test_results_are_ranked_by_weighted_fields(self):
+        # Title matches (weight A) outrank SEO title (B) and description (C) matches
+        results = self.search("celsius")['results']
+        self.assertEqual([item['title'] for item in results], ["Celsius Table", "Temperature Converter"])
+        self.assertGreater(results[0]['rank'], results[1]['rank'])
+        self.assertCountEqual( # Every word matches as a prefix
+            [item['title'] for item in self.search("conv cels")['results']], ["Temperature Converter", "Celsius Table"],
+        )
+        self.assertEqual(self.search("payment")['results'][0]['title'], "Loan Calculator")
+        self.assertEqual(self.search("!!")['results'], [])
+
+    def test_vector_follows_bulk_updates(self):
+        MenuItem.objects.filter(title="Loan Calculator").update(seo_title="Mortgage planner")
+        self.assertEqual([item['title'] for item in self.search("mortg")['results']], ["Loan Calculator"])
+
+    def test_cursor_pagination_by_rank(self):
+        first = self.search("celsius", page_size=1)
+        self.assertEqual([item['title'] for item in first['results']], ["Celsius Table"])
+        second = self.client.get(first['next']).json()
+        self.assertEqual([item['title'] for item in second['results']], ["Temperature Converter"])
+        self.assertIsNone(second['next'])
+
+    def test_search_is_index_backed(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = search_items(MenuItem.objects.all(), "celsius").explain()
+        self.assertIn('core_menuitem_search_idx', plan)
+
+    @mock.patch('core.search.trigram_available', return_value=False)
+    def test_typos_without_pg_trgm_find_nothing(self, trigram_available):
+        self.assertEqual(self.search("celcius")['results'], [])
+
+    def test_typos_fall_back_to_trigram_matching(self):
+        if not trigram_available():
+            self.skipTest("pg_trgm is not installed")
+        self.assertEqual(self.search("celcius")['results'][0]['title'], "Celsius Table")
+
+    def test_admin_search_uses_the_search_vector(self):
+        self.client.force_login(User.objects.create_superuser(username='admin', password='x'))
+        response = self.client.get(reverse('admin:core_menuitem_changelist'), {'q': 'fahrenh'})
+        self.assertEqual([item.title for item in response.context['cl'].result_list], ["Temperature Converter"])
+
+    @mock.patch('core.admin.trigram_available', return_value=False)
+    def test_admin_search_never_scans_without_trigram_indexes(self, trigram_available):
+        MenuItem.objects.create(title="All", url="/all", geo_location="India")
+        self.client.force_login(User.objects.create_superuser(username='admin', password='x'))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('admin:core_menuitem_changelist'), {'q': "india"})
+        self.assertEqual(list(response.context['cl'].result_list), [])
+        self.assertFalse([query for query in queries if 'LIKE' in query['sql']])
+
+    def test_admin_search_falls_back_to_indexed_ilike(self):
+        if not trigram_available():
+            self.skipTest("pg_trgm is not installed")
+        MenuItem.objects.create(title="All", url="/all", geo_location="India")
+        self.client.force_login(User.objects.create_superuser(username='admin', password='x'))
+        for term in ("All", "/all", "india"): # Stop word, url, geo_location: not in the search vector
+            with self.subTest(term=term):
+                response = self.client.get(reverse('admin:core_menuitem_changelist'), {'q': term})
+                self.assertEqual([item.title for item in response.context['cl'].result_list], ["All"])
+
+
+class TypeaheadTests(TestCase):
+    url = reverse('search_suggest')
+
+    def setUp(self):
+        cache.clear()
+        typeahead._index.version = None # Forget whatever an earlier test indexed
+        with self.captureOnCommitCallbacks(execute=True):
+            MenuItem.objects.create(title="Unit Converter", order=2, tool_domain='converter')
+            MenuItem.objects.create(title="Currency Converter", order=1, tool_domain='converter')
+            MenuItem.objects.create(title="Convertible Loan Calculator", order=3, tool_domain='finance')
+            MenuItem.objects.create(title="Résumé Builder", seo_title="CV maker", tool_domain='writing')
+            MenuItem.objects.create(title="Unit Price Checker", is_searchable=False)
+            MenuItem.objects.create(title="Converter Drafts", is_published=False)
+
+    def suggest(self, query, **extra):
+        return [item['title'] for item in self.client.get(self.url, {'q': query}, **extra).json()['items']]
+
+    def test_prefix_matches_rank_titles_first(self):
+        # Titles starting with the query, then titles with a later word matching, by menu order
+        self.assertEqual(self.suggest("conv"), ["Convertible Loan Calculator", "Currency Converter", "Unit Converter"])
+        self.assertEqual(self.suggest("unit conv"), ["Unit Converter"])
+        self.assertEqual(self.suggest("resu"), ["Résumé Builder"])
+        self.assertEqual(self.suggest("cv m"), ["Résumé Builder"]) # SEO title
+        self.assertEqual(self.suggest("finan"), ["Convertible Loan Calculator"]) # tool domain
+        self.assertEqual(self.suggest("unit p"), []) # Not searchable
+        self.assertEqual(self.suggest(""), [])
+
+    @in_process_cache
+    def test_searches_do_not_query_the_database(self):
+        self.suggest("conv")
+        with self.assertNumQueries(0):
+            self.suggest("curr")
+
+    def test_saved_items_are_reindexed_incrementally(self):
+        self.suggest("conv")
+        item = MenuItem.objects.get(title="Unit Converter")
+        with self.captureOnCommitCallbacks(execute=True):
+            item.title = "Length Converter"
+            item.save()
+            MenuItem.objects.get(title="Currency Converter").delete()
+        with mock.patch.object(PrefixIndex, 'build') as build:
+            self.assertEqual(self.suggest("conv"), ["Convertible Loan Calculator", "Length Converter"])
+        build.assert_not_called()
+        self.assertEqual(self.suggest("len"), ["Length Converter"])
+
+    def test_changes_never_overwrite_each_other_in_the_log(self):
+        self.suggest("conv")
+        item = MenuItem.objects.get(title="Unit Converter")
+        # Another process drew the next version for its own change (a non-atomic incr can hand it out twice)
+        other = MenuItem.objects.get(title="Currency Converter")
+        version = cache.get(typeahead.TYPEAHEAD_VERSION_KEY)
+        cache.set(typeahead.TYPEAHEAD_CHANGE_KEY.format(version + 1), other.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            item.title = "Length Converter"
+            item.save()
+        self.assertEqual(cache.get(typeahead.TYPEAHEAD_CHANGE_KEY.format(version + 1)), other.pk)
+        self.assertEqual(cache.get(typeahead.TYPEAHEAD_CHANGE_KEY.format(version + 2)), item.pk)
+        self.assertEqual(self.suggest("len"), ["Length Converter"])
+
+    def test_bulk_changes_rebuild_the_index(self):
+        self.suggest("conv")
+        MenuItem.objects.filter(tool_domain='converter').update(is_published=False)
+        self.assertEqual(len(self.suggest("conv")), 3) # Bulk updates bypass signals...
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_typeahead() # ...so their callers invalidate the index
+        self.assertEqual(self.suggest("conv"), ["Convertible Loan Calculator"])
+
+    def test_region_and_role_filtering(self):
+        index = PrefixIndex([
+            {'id': 1, 'title': "Tax Calculator", 'url': '/tax', 'icon': None, 'tool_domain': None, 'seo_title': None,
+             'order': 0, 'access_level': 'public', 'geo_regions': ['IN']},
+            {'id': 2, 'title': "Tax Reports", 'url': '/reports', 'icon': None, 'tool_domain': None, 'seo_title': None,
+             'order': 1, 'access_level': 'registered', 'geo_regions': []},
+        ])
+        self.assertEqual([item['id'] for item in index.search("tax")], [])
+        self.assertEqual([item['id'] for item in index.search("tax", region='IN')], [1])
+        self.assertEqual([item['id'] for item in index.search("tax", region='IN', role='registered')], [1, 2])
+        self.assertEqual(index.search("tax", limit=1, region='IN', role='registered')[0]['url'], '/tax')
+        index.discard(1)
+        self.assertEqual(len(index), 1)
+
+
+class NavbarFastPathTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='editor')
+        create_menu(3, 3, user=user)
+        MenuItem.objects.filter(title="Menu 1").update(
+            title="Outils \u2028 \u00e9t\u00e9 \"quoted\"",
+            analytics_data={'views': 12, 'ctr': 0.125, 'tiny': 1e-07, 'tags': ['a', None]},
+            seo_description="Line one\nLine two\t\u2603",
+            scheduled_at='2025-06-24T08:26:00.123456Z',
+        )
+        MenuItem.objects.create(title="Plain Link", order=9, url="/plain", is_dropdown=True)
+
+    def test_fast_path_matches_serializer_byte_for_byte(self):
+        for projection in ({}, {'profile': 'navbar'}, {'profile': 'card'}, {'exclude': ['dropdown_items']}):
+            with self.subTest(**projection):
+                expected = JSONRenderer().render(navbar_payload(serialize_menu_items(**projection)))
+                self.assertEqual(FastJSONRenderer().render(navbar_payload(build_menu_items(**projection))), expected)
+
+        self.assertEqual(
+            self.client.get(reverse('menu_items_list')).content,
+            JSONRenderer().render(navbar_payload(serialize_menu_items())),
+        )
+
+    def test_renderer_matches_json_renderer(self):
+        data = {'big': 1e16, 'small': 0.5, 'text': 'a\u2029b', 'nested': [{'n': None}]}
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+
+class VerifiedTokenCacheTests(TestCase):
+    def setUp(self):
+        token_cache.clear()
+
+    def claims(self, uid='firebase-uid', ttl=3600):
+        return {'uid': uid, 'sub': uid, 'exp': int(time.time()) + ttl}
+
+    @mock.patch('core.backends.auth.verify_id_token')
+    def test_repeat_tokens_skip_verification(self, verify_id_token):
+        verify_id_token.return_value = self.claims()
+
+        self.assertEqual(verify_firebase_token('token-a')['uid'], 'firebase-uid')
+        self.assertEqual(verify_firebase_token('token-a')['uid'], 'firebase-uid')
+
+        verify_id_token.assert_called_once_with('token-a')
+        self.assertEqual(token_cache.stats()['hits'], 1)
+        self.assertEqual(token_cache.stats()['misses'], 1)
+
+    @mock.patch('core.backends.auth.verify_id_token')
+    def test_entries_expire_with_the_token(self, verify_id_token):
+        verify_id_token.return_value = self.claims(ttl=60)
+        verify_firebase_token('token-a')
+
+        with mock.patch('core.backends.time.time', return_value=time.time() + 61):
+            verify_firebase_token('token-a')
+
+        self.assertEqual(verify_id_token.call_count, 2)
+
+    def test_cache_is_bounded(self):
+        cache = VerifiedTokenCache(max_size=2)
+        for token in ('a', 'b', 'c'):
+            cache.set(token, self.claims(uid=token))
+
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('c')['uid'], 'c')
+        self.assertEqual(cache.stats()['size'], 2)
+
+
+class FirebaseAuthenticationTests(TestCase):
+    url = reverse('protected_view')
+
+    def setUp(self):
+        token_cache.clear()
+
+    @mock.patch('core.backends.auth.verify_id_token')
+    def test_bearer_token_authenticates_without_a_session(self, verify_id_token):
+        verify_id_token.return_value = {'uid': 'firebase-uid', 'email': 'user@example.com', 'exp': int(time.time()) + 3600}
+
+        response = self.client.get(self.url, HTTP_AUTHORIZATION='Bearer token-a')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('firebase-uid', response.json()['message'])
+        self.assertEqual(User.objects.get(username='firebase-uid').email, 'user@example.com')
+        self.assertFalse(Session.objects.exists())
+
+    @mock.patch('core.backends.auth.verify_id_token')
+    def test_invalid_token_is_rejected(self, verify_id_token):
+        verify_id_token.side_effect = auth.InvalidIdTokenError('bad token')
+
+        response = self.client.get(self.url, HTTP_AUTHORIZATION='Bearer token-a')
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response['WWW-Authenticate'], 'Bearer')
+
+    def test_missing_token_is_rejected(self):
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    @mock.patch('core.backends.auth.verify_id_token')
+    def test_public_views_ignore_invalid_tokens(self, verify_id_token):
+        verify_id_token.side_effect = auth.InvalidIdTokenError('expired token')
+        MenuItem.objects.create(title="Public Tool")
+        MenuItem.objects.create(title="Members Tool", access_level='registered')
+
+        with self.assertLogs('core.authentication', 'INFO'):
+            response = self.client.get(reverse('menu_items_list'), HTTP_AUTHORIZATION='Bearer stale-token')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['title'] for item in response.json()['navbar']['menuItems']], ["Public Tool"])
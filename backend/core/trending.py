@@ -0,0 +1,172 @@
+# backend/core/trending.py
+import io
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, models
+from django.utils import timezone
+
+from .menu_cache import invalidate_menu_cache
+from .models import MenuItem, MenuItemEvent
+
+try:
+    import numpy as np
+except ImportError: # numpy is only needed by the trending job itself, not by readers of its scores
+    np = None
+
+TRENDING_SCORES_KEY = 'core:trending:scores'
+# Relative value of each event type in a popularity score
+EVENT_WEIGHTS = {MenuItemEvent.VIEW: 1.0, MenuItemEvent.CLICK: 3.0}
+# How many ranked items per domain (and overall) are kept for the API
+RANKING_LENGTH = 100
+
+TRENDING_TOP_N = getattr(settings, 'TRENDING_TOP_N', 5)
+TRENDING_HALF_LIFE_HOURS = getattr(settings, 'TRENDING_HALF_LIFE_HOURS', 48)
+TRENDING_WINDOW_DAYS = getattr(settings, 'TRENDING_WINDOW_DAYS', 14)
+
+
+class _ScoreAccumulator:
+    """
+    File-like sink for COPY ... TO STDOUT (CSV of id, weight, age seconds).
+
+    Complete lines are parsed with numpy every chunk_bytes and folded into a
+    per-id score array with np.bincount, so memory stays flat however many
+    events are read.
+    """
+
+    def __init__(self, half_life_seconds, chunk_bytes=8 << 20):
+        self.half_life_seconds = half_life_seconds
+        self.chunk_bytes = chunk_bytes
+        self.pending = bytearray()
+        self.scores = np.zeros(0)
+
+    def write(self, data):
+        self.pending += data.encode() if isinstance(data, str) else data
+        if len(self.pending) >= self.chunk_bytes:
+            self.fold(self.pending.rfind(b'\n') + 1)
+
+    def close(self):
+        self.fold(len(self.pending))
+        return self.scores
+
+    def fold(self, end):
+        block, self.pending = bytes(self.pending[:end]), self.pending[end:]
+        if not block.strip():
+            return
+        rows = np.loadtxt(io.BytesIO(block), delimiter=',', dtype=np.float64, ndmin=2)
+        decayed = rows[:, 1] * np.exp2(-np.maximum(rows[:, 2], 0) / self.half_life_seconds)
+        chunk_scores = np.bincount(rows[:, 0].astype(np.int64), weights=decayed)
+        if len(chunk_scores) > len(self.scores):
+            self.scores = np.pad(self.scores, (0, len(chunk_scores) - len(self.scores)))
+        self.scores[:len(chunk_scores)] += chunk_scores
+
+
+def _sql_literal(value):
+    # COPY takes no bind parameters; only our own constants and numbers are inlined
+    return f"'{value}'" if isinstance(value, str) and "'" not in value else repr(float(value))
+
+
+def decayed_scores(now, half_life, since):
+    """
+    Time-decayed popularity per menu item id: sum(weight * 0.5 ** (age / half_life)).
+
+    Events since 'since' are streamed out of PostgreSQL with COPY as
+    (id, weight, age) rows and aggregated with NumPy, so millions of events
+    never become Python objects one by one. Returns an array indexed by menu
+    item id.
+    """
+    weights = ' '.join(
+        f"WHEN {_sql_literal(event_type)} THEN {_sql_literal(weight)}" for event_type, weight in EVENT_WEIGHTS.items()
+    )
+    now_epoch, since_epoch = _sql_literal(now.timestamp()), _sql_literal(since.timestamp())
+    sql = (
+        f"COPY (SELECT menu_item_id, CASE event_type {weights} ELSE 0 END, "
+        f"{now_epoch} - EXTRACT(EPOCH FROM occurred_at)::float8 "
+        f"FROM {connection.ops.quote_name(MenuItemEvent._meta.db_table)} "
+        f"WHERE occurred_at >= to_timestamp({since_epoch})) TO STDOUT WITH (FORMAT csv)"
+    )
+    accumulator = _ScoreAccumulator(half_life.total_seconds())
+    with connection.cursor() as cursor:
+        raw_cursor = cursor.cursor
+        if hasattr(raw_cursor, 'copy_expert'): # psycopg2
+            raw_cursor.copy_expert(sql, accumulator)
+        else: # psycopg 3
+            with raw_cursor.copy(sql) as copy:
+                for data in copy:
+                    accumulator.write(data)
+    return accumulator.close()
+
+
+def rank_within_groups(groups, scores):
+    """
+    0-based rank of every entry inside its group, highest score first (ties: lowest index first).
+    groups: integer group codes; scores: floats of the same length.
+    """
+    order = np.lexsort((-scores, groups))
+    sorted_groups = groups[order]
+    group_starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+    group_sizes = np.diff(np.r_[group_starts, len(order)])
+    ranks = np.empty(len(order), dtype=np.int64)
+    ranks[order] = np.arange(len(order)) - np.repeat(group_starts, group_sizes)
+    return ranks
+
+
+def compute_trending(top_n=TRENDING_TOP_N, half_life_hours=TRENDING_HALF_LIFE_HOURS,
+                     window_days=TRENDING_WINDOW_DAYS, now=None):
+    """
+    Recompute trending scores and flag the top_n live items per tool_domain as trending.
+
+    Only rows whose is_trending actually changes are written, in one UPDATE,
+    and the navbar cache is invalidated only if there were any. Scores are
+    stored in the cache for trending_rankings(). Returns (turned_on, turned_off).
+    """
+    if np is None:
+        raise ImproperlyConfigured("Computing trending scores requires numpy (pip install numpy).")
+    now = now or timezone.now()
+    scores = decayed_scores(now, timedelta(hours=half_life_hours), now - timedelta(days=window_days))
+
+    live = list(MenuItem.live.order_by().values_list('id', 'tool_domain'))
+    item_ids = np.fromiter((pk for pk, _ in live), dtype=np.int64, count=len(live))
+    item_scores = np.zeros(len(live))
+    scored = item_ids < len(scores)
+    item_scores[scored] = scores[item_ids[scored]]
+    domains = np.array([domain or '' for _, domain in live], dtype=str)
+    domain_names, domain_codes = np.unique(domains, return_inverse=True)
+    ranks = rank_within_groups(domain_codes, item_scores)
+
+    trending = set(item_ids[(ranks < top_n) & (item_scores > 0)].tolist())
+    current = set(MenuItem.objects.filter(is_trending=True).order_by().values_list('id', flat=True))
+    turned_on, turned_off = trending - current, current - trending
+    if turned_on or turned_off:
+        MenuItem.objects.filter(pk__in=turned_on | turned_off).update(
+            is_trending=models.Case(models.When(pk__in=turned_on, then=True), default=False),
+            updated_at=now,
+        )
+        invalidate_menu_cache()
+
+    store_rankings(now, item_ids, item_scores, domain_names, domain_codes)
+    return len(turned_on), len(turned_off)
+
+
+def store_rankings(now, item_ids, item_scores, domain_names, domain_codes):
+    """
+    Store the best-scored items overall and per domain as [[id, score], ...]
+    lists, in the shared cache where the web workers read them.
+    """
+    def ranking(mask):
+        ids, values = item_ids[mask], item_scores[mask]
+        best = np.argsort(-values, kind='stable')[:RANKING_LENGTH]
+        return [[int(ids[i]), round(float(values[i]), 4)] for i in best if values[i] > 0]
+
+    cache.set(TRENDING_SCORES_KEY, {
+        'computed_at': now.isoformat(),
+        'overall': ranking(np.ones(len(item_ids), dtype=bool)),
+        'domains': {str(name): ranking(domain_codes == code) for code, name in enumerate(domain_names)},
+    }, None)
+
+
+def trending_rankings():
+    """The rankings stored by the last compute_trending() run, or None if it has not run yet."""
+    return cache.get(TRENDING_SCORES_KEY)
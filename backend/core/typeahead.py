@@ -0,0 +1,236 @@
+# backend/core/typeahead.py
+"""
+In-process prefix index behind the navbar search box.
+
+Each worker keeps sorted lists of normalised phrases ('unit converter',
+'converter', ...) for live, searchable menu items and answers a keystroke
+with a binary search and a short scan, without touching the database.
+
+Saves and deletes are logged under a version counter in the default cache,
+which settings.CACHES must point at a backend every process shares (see
+core.checks); a worker that finds the counter moved re-reads only the logged
+items, or rebuilds everything after a bulk change (invalidate_typeahead) or
+when the log has a gap.
+"""
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .menu_cache import bump_version, menu_version
+from .models import MenuItem, ROLE_ACCESS_LEVELS
+
+TYPEAHEAD_VERSION_KEY = 'core:typeahead:version'
+TYPEAHEAD_CHANGE_KEY = 'core:typeahead:change:{}' # -> id of the item changed at that version
+CHANGE_LOG_TIMEOUT = 60 * 60
+# Versions a change may try to claim before giving up and leaving a gap (which forces a rebuild)
+MAX_LOG_ATTEMPTS = 10
+# A worker further behind than this rebuilds instead of replaying the log
+MAX_REPLAYED_CHANGES = 500
+# Only the first few words of a text can start a match, and only this much of a phrase is compared
+MAX_PHRASE_WORDS = 6
+MAX_PHRASE_LENGTH = 40
+# Phrases examined per result before giving up on finding more (keeps 1-letter queries cheap)
+SCAN_FACTOR = 25
+
+RESULT_FIELDS = ('id', 'title', 'url', 'icon', 'tool_domain')
+INDEX_COLUMNS = RESULT_FIELDS + ('seo_title', 'order', 'access_level', 'geo_regions')
+
+_NON_WORD_RE = re.compile(r'[\W_]+')
+
+
+def normalize(text):
+    """Case-, accent- and punctuation-insensitive form of a text: 'Unit-Convérter!' -> 'unit converter'."""
+    text = text or ''
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text)
+        text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(_NON_WORD_RE.sub(' ', text.casefold()).split())
+
+
+def phrases(text):
+    """The phrases a text can be found by: 'unit price calc' -> ['unit price calc', 'price calc', 'calc']."""
+    words = normalize(text).split()
+    return [' '.join(words[start:])[:MAX_PHRASE_LENGTH] for start in range(min(len(words), MAX_PHRASE_WORDS))]
+
+
+def _entry(phrase, pk):
+    # 'phrase\0id': plain strings sort and compare much faster than tuples, and '\0' sorts first
+    return f'{phrase}\0{pk}'
+
+
+def _prefix_matches(entries, prefix, scan):
+    """Item ids of the first 'scan' entries whose phrase starts with prefix."""
+    start = bisect_left(entries, prefix)
+    for entry in entries[start:start + scan]:
+        if not entry.startswith(prefix):
+            break
+        yield int(entry.rpartition('\0')[2])
+
+
+class PrefixIndex:
+    """
+    Prefix search over item titles, then SEO titles and tool domains.
+
+    Entries are 'phrase\0id' strings in two sorted lists, so adding or
+    removing an item is a bisect per phrase and titles always outrank the
+    secondary fields. Rows are dicts with the INDEX_COLUMNS. Thread-safe.
+    """
+
+    def __init__(self, rows=()):
+        self.version = None # Cache version the contents correspond to (see typeahead_index)
+        self._lock = threading.RLock()
+        self.build(rows)
+
+    def __len__(self):
+        return len(self._items)
+
+    @staticmethod
+    def _phrases(row):
+        title_phrases = phrases(row['title'])
+        other_phrases = set(phrases(row['seo_title']) + phrases(row['tool_domain'])) - set(title_phrases)
+        return title_phrases, sorted(other_phrases)
+
+    def build(self, rows):
+        """Replace the contents with 'rows'."""
+        items, titles, others = {}, [], []
+        for row in rows:
+            title_phrases, other_phrases = self._phrases(row)
+            items[row['id']] = (row, title_phrases[0] if title_phrases else '')
+            titles.extend(_entry(phrase, row['id']) for phrase in title_phrases)
+            others.extend(_entry(phrase, row['id']) for phrase in other_phrases)
+        titles.sort()
+        others.sort()
+        with self._lock:
+            self._items, self._titles, self._others = items, titles, others
+
+    def add(self, row):
+        """Add an item, replacing any previous version of it."""
+        with self._lock:
+            self.discard(row['id'])
+            title_phrases, other_phrases = self._phrases(row)
+            self._items[row['id']] = (row, title_phrases[0] if title_phrases else '')
+            for phrase in title_phrases:
+                insort(self._titles, _entry(phrase, row['id']))
+            for phrase in other_phrases:
+                insort(self._others, _entry(phrase, row['id']))
+
+    def discard(self, pk):
+        """Remove an item if it is indexed."""
+        with self._lock:
+            row, _ = self._items.pop(pk, (None, None))
+            if row is None:
+                return
+            for entries, entry_phrases in zip((self._titles, self._others), self._phrases(row)):
+                for phrase in entry_phrases:
+                    entry = _entry(phrase, pk)
+                    position = bisect_left(entries, entry)
+                    if position < len(entries) and entries[position] == entry:
+                        del entries[position]
+
+    def search(self, query, limit=8, region=None, role='anonymous'):
+        """
+        Items with a word starting with 'query' (the last word may be partial),
+        visible to a caller from 'region' with 'role': title matches first
+        (titles starting with the query before the rest), then SEO title and
+        tool domain matches, each by menu order. Returns dicts of RESULT_FIELDS.
+        """
+        prefix = normalize(query)[:MAX_PHRASE_LENGTH]
+        if not prefix or limit <= 0:
+            return []
+        access_levels = ROLE_ACCESS_LEVELS[role]
+        scan = limit * SCAN_FACTOR
+        found = {}
+        with self._lock:
+            for entries in (self._titles, self._others):
+                candidates = {}
+                for pk in _prefix_matches(entries, prefix, scan):
+                    row, title = self._items[pk]
+                    if pk in found or row['access_level'] not in access_levels:
+                        continue
+                    if row['geo_regions'] and region not in row['geo_regions']:
+                        continue
+                    candidates[pk] = (not title.startswith(prefix), row['order'], row['title'], row)
+                ranked = sorted(candidates.values(), key=lambda candidate: candidate[:3])
+                for *_, row in ranked[:limit - len(found)]:
+                    found[row['id']] = row
+                if len(found) >= limit:
+                    break
+        return [{name: row[name] for name in RESULT_FIELDS} for row in found.values()]
+
+
+def searchable_items():
+    """Items the typeahead may suggest (before region and role filtering)."""
+    return MenuItem.live.filter(is_searchable=True)
+
+
+def _index_rows(queryset):
+    return queryset.order_by().values(*INDEX_COLUMNS).iterator(chunk_size=5000)
+
+
+_index = PrefixIndex()
+_sync_lock = threading.Lock()
+
+
+def typeahead_index():
+    """
+    This process's index, first brought up to date with changes made by any
+    process. While one request syncs it, concurrent requests keep searching the
+    current contents instead of waiting (only the very first build blocks).
+    """
+    version = menu_version(TYPEAHEAD_VERSION_KEY)
+    if _index.version != version and _sync_lock.acquire(blocking=_index.version is None):
+        try:
+            if _index.version != version:
+                _sync(version)
+        finally:
+            _sync_lock.release()
+    return _index
+
+
+def _sync(version):
+    changed = _logged_changes(_index.version, version)
+    if changed is None:
+        _index.build(_index_rows(searchable_items()))
+    else:
+        rows = {row['id']: row for row in _index_rows(searchable_items().filter(pk__in=changed))}
+        for pk in changed:
+            if pk in rows:
+                _index.add(rows[pk])
+            else:
+                _index.discard(pk)
+    _index.version = version
+
+
+def _logged_changes(since, version):
+    """Ids of the items changed after version 'since' up to 'version', or None if the log does not cover them."""
+    if since is None or not 0 < version - since <= MAX_REPLAYED_CHANGES:
+        return None
+    keys = [TYPEAHEAD_CHANGE_KEY.format(logged) for logged in range(since + 1, version + 1)]
+    logged = cache.get_many(keys)
+    return set(logged.values()) if len(logged) == len(keys) else None
+
+
+def item_changed(pk):
+    """
+    Record that one item was saved or deleted. Logged once the transaction
+    commits, so other processes never re-read it before the change is visible.
+
+    Each change claims its version with cache.add(): where incr() isn't atomic
+    (the database cache) two processes can draw the same version, and the
+    second then draws again instead of overwriting the first one's entry.
+    """
+    def log_change():
+        for _ in range(MAX_LOG_ATTEMPTS):
+            if cache.add(TYPEAHEAD_CHANGE_KEY.format(bump_version(TYPEAHEAD_VERSION_KEY)), pk, CHANGE_LOG_TIMEOUT):
+                return
+        bump_version(TYPEAHEAD_VERSION_KEY) # A version with no entry: workers rebuild
+    transaction.on_commit(log_change)
+
+
+def invalidate_typeahead():
+    """After bulk changes that bypass save() (QuerySet.update, imports): rebuild every index on next use."""
+    transaction.on_commit(lambda: bump_version(TYPEAHEAD_VERSION_KEY))
@@ -0,0 +1,153 @@
+# backend/core/units.py
+"""
+Unit conversion for the Unit, Temperature, Area and Volume Converter tools.
+
+Every unit is an affine map to its dimension's base unit (SI): base = value *
+scale + offset, where only temperatures have an offset. Definitions are exact
+fractions; at import they are expanded into a float (factor, offset) pair for
+every pair of units of a dimension, so a conversion is one dict lookup and one
+multiply-add, applied to a whole NumPy array at once by convert_many().
+"""
+import math
+from fractions import Fraction
+from itertools import product
+
+from django.core.exceptions import ImproperlyConfigured
+
+try:
+    import numpy as np
+except ImportError: # numpy is only needed for batch conversions
+    np = None
+
+# International yard and pound (1959) definitions
+_IN, _FT, _YD, _MI = Fraction('0.0254'), Fraction('0.3048'), Fraction('0.9144'), Fraction('1609.344')
+_LB = Fraction('0.45359237')
+_GAL = Fraction('0.003785411784') # US liquid gallon
+_ZERO_C = Fraction('273.15')
+
+# dimension -> {unit code: scale or (scale, offset) to the base unit}
+UNIT_DEFINITIONS = {
+    'length': { # metre
+        'm': 1, 'km': 1000, 'cm': Fraction('0.01'), 'mm': Fraction('0.001'),
+        'um': Fraction('1e-6'), 'nm': Fraction('1e-9'),
+        'in': _IN, 'ft': _FT, 'yd': _YD, 'mi': _MI, 'nmi': 1852,
+    },
+    'mass': { # kilogram
+        'kg': 1, 'g': Fraction('0.001'), 'mg': Fraction('1e-6'), 'ug': Fraction('1e-9'), 't': 1000,
+        'lb': _LB, 'oz': _LB / 16, 'st': _LB * 14,
+    },
+    'area': { # square metre
+        'm2': 1, 'km2': 10 ** 6, 'cm2': Fraction('1e-4'), 'mm2': Fraction('1e-6'), 'ha': 10 ** 4,
+        'in2': _IN ** 2, 'ft2': _FT ** 2, 'yd2': _YD ** 2, 'mi2': _MI ** 2, 'acre': _FT ** 2 * 43560,
+    },
+    'volume': { # cubic metre
+        'm3': 1, 'l': Fraction('0.001'), 'dl': Fraction('1e-4'), 'cl': Fraction('1e-5'),
+        'ml': Fraction('1e-6'), 'cm3': Fraction('1e-6'), 'in3': _IN ** 3, 'ft3': _FT ** 3,
+        'gal': _GAL, 'qt': _GAL / 4, 'pt': _GAL / 8, 'cup': _GAL / 16, 'fl_oz': _GAL / 128,
+        'tbsp': _GAL / 256, 'tsp': _GAL / 768, 'gal_imp': Fraction('0.00454609'),
+    },
+    'temperature': { # kelvin
+        'K': 1, 'C': (1, _ZERO_C), 'F': (Fraction(5, 9), _ZERO_C - Fraction(160, 9)), 'R': Fraction(5, 9),
+    },
+}
+
+# Other names accepted for unit codes (matched case-insensitively, like the codes)
+UNIT_ALIASES = {
+    'meter': 'm', 'metre': 'm', 'meters': 'm', 'metres': 'm',
+    'kilometer': 'km', 'kilometre': 'km', 'kilometers': 'km', 'kilometres': 'km',
+    'centimeter': 'cm', 'centimetre': 'cm', 'centimeters': 'cm', 'centimetres': 'cm',
+    'millimeter': 'mm', 'millimetre': 'mm', 'millimeters': 'mm', 'millimetres': 'mm',
+    'µm': 'um', 'micrometer': 'um', 'micron': 'um', 'nanometer': 'nm',
+    'inch': 'in', 'inches': 'in', 'foot': 'ft', 'feet': 'ft', 'yard': 'yd', 'yards': 'yd',
+    'mile': 'mi', 'miles': 'mi', 'nautical mile': 'nmi', 'nautical miles': 'nmi',
+    'kilogram': 'kg', 'kilograms': 'kg', 'gram': 'g', 'grams': 'g', 'milligram': 'mg', 'milligrams': 'mg',
+    'µg': 'ug', 'microgram': 'ug', 'tonne': 't', 'tonnes': 't', 'metric ton': 't',
+    'pound': 'lb', 'pounds': 'lb', 'lbs': 'lb', 'ounce': 'oz', 'ounces': 'oz', 'stone': 'st',
+    'm²': 'm2', 'km²': 'km2', 'cm²': 'cm2', 'mm²': 'mm2', 'in²': 'in2', 'ft²': 'ft2', 'yd²': 'yd2', 'mi²': 'mi2',
+    'hectare': 'ha', 'hectares': 'ha', 'acres': 'acre',
+    'm³': 'm3', 'cm³': 'cm3', 'in³': 'in3', 'ft³': 'ft3', 'cc': 'cm3',
+    'liter': 'l', 'litre': 'l', 'liters': 'l', 'litres': 'l',
+    'milliliter': 'ml', 'millilitre': 'ml', 'milliliters': 'ml', 'millilitres': 'ml',
+    'gallon': 'gal', 'gallons': 'gal', 'quart': 'qt', 'quarts': 'qt', 'pint': 'pt', 'pints': 'pt',
+    'cups': 'cup', 'fluid ounce': 'fl_oz', 'fluid ounces': 'fl_oz', 'fl oz': 'fl_oz',
+    'tablespoon': 'tbsp', 'tablespoons': 'tbsp', 'teaspoon': 'tsp', 'teaspoons': 'tsp', 'imperial gallon': 'gal_imp',
+    'kelvin': 'K', 'celsius': 'C', '°c': 'C', 'fahrenheit': 'F', '°f': 'F', 'rankine': 'R', '°r': 'R',
+}
+
+
+def _affine(definition):
+    return definition if isinstance(definition, tuple) else (definition, 0)
+
+
+def _build_tables():
+    units, conversions = {}, {}
+    for dimension, definitions in UNIT_DEFINITIONS.items():
+        for code in definitions:
+            units[code.lower()] = (dimension, code)
+        for source, target in product(definitions, repeat=2):
+            (source_scale, source_offset), (target_scale, target_offset) = (
+                _affine(definitions[source]), _affine(definitions[target])
+            )
+            # target = (value * source_scale + source_offset - target_offset) / target_scale, exactly
+            conversions[source, target] = (
+                float(Fraction(source_scale) / target_scale),
+                float(Fraction(source_offset - target_offset) / target_scale),
+            )
+    for alias, code in UNIT_ALIASES.items():
+        units[alias.lower()] = units[code.lower()]
+    return units, conversions
+
+
+# Built once per process: lowercase name -> (dimension, code), and (code, code) -> (factor, offset)
+_UNITS, _CONVERSIONS = _build_tables()
+
+
+def resolve_unit(name):
+    """A unit code or alias ('km', 'Kilometres', '°C') -> (dimension, code). Raises ValueError."""
+    try:
+        return _UNITS[' '.join(str(name).split()).lower()]
+    except KeyError:
+        raise ValueError(f"Unknown unit '{name}'.")
+
+
+def conversion(from_unit, to_unit):
+    """(dimension, from code, to code, factor, offset) for converting between two units. Raises ValueError."""
+    from_dimension, from_code = resolve_unit(from_unit)
+    to_dimension, to_code = resolve_unit(to_unit)
+    if from_dimension != to_dimension:
+        raise ValueError(f"Cannot convert {from_dimension} ({from_code}) to {to_dimension} ({to_code}).")
+    return (from_dimension, from_code, to_code, *_CONVERSIONS[from_code, to_code])
+
+
+def convert(value, from_unit, to_unit):
+    """Convert one number: convert(100, 'C', 'F') -> 212.0. Raises ValueError if the result overflows."""
+    *_, factor, offset = conversion(from_unit, to_unit)
+    result = float(value) * factor + offset
+    if not math.isfinite(result):
+        raise ValueError("Result is not a finite number.")
+    return result
+
+
+def convert_many(values, from_unit, to_unit):
+    """
+    Convert a sequence or array of numbers in one vectorised pass; returns a
+    float64 array. Raises ValueError if any result overflows the float range.
+    """
+    if np is None:
+        raise ImproperlyConfigured("Batch unit conversion requires numpy (pip install numpy).")
+    *_, factor, offset = conversion(from_unit, to_unit)
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim != 1:
+        raise ValueError("Values must be a flat list of numbers.")
+    with np.errstate(over='ignore', invalid='ignore'): # Overflow is reported below, not warned about
+        result = values * factor
+        if offset:
+            result += offset
+    if not np.isfinite(result).all():
+        raise ValueError(f"Result is not a finite number for value #{int(np.argmin(np.isfinite(result))) + 1}.")
+    return result
+
+
+def unit_catalog():
+    """{dimension: [unit codes]} for building converter pickers."""
+    return {dimension: list(definitions) for dimension, definitions in UNIT_DEFINITIONS.items()}
@@ -1,10 +1,33 @@
 # backend/core/urls.py
 from django.urls import path
-from .views import MenuItemsListView, ProtectedView
+from .views import (
+    AnalyticsEventsView, CatalogExportView, CatalogImportView, CurrencyBatchConversionView, CurrencyCatalogView,
+    CurrencyConversionView, ExpressionBatchEvaluationView, ExpressionEvaluationView, MenuItemsListView,
+    PasswordGeneratorView, ProtectedView, QRBatchView, QRCodeView, SearchView, ToolCatalogView, TrendingView,
+    TypeaheadView, UnitBatchConversionView, UnitCatalogView, UnitConversionView,
+)
 
 
 urlpatterns = [
     path('menu-items/', MenuItemsListView.as_view(), name='menu_items_list'),
     path('protected/', ProtectedView.as_view(), name='protected_view'),
+    path('catalog/export/', CatalogExportView.as_view(), name='catalog_export'),
+    path('catalog/import/', CatalogImportView.as_view(), name='catalog_import'),
+    path('analytics/events/', AnalyticsEventsView.as_view(), name='analytics_events'),
+    path('trending/', TrendingView.as_view(), name='trending'),
+    path('tools/', ToolCatalogView.as_view(), name='tool_catalog'),
+    path('units/', UnitCatalogView.as_view(), name='unit_catalog'),
+    path('units/convert/', UnitConversionView.as_view(), name='unit_convert'),
+    path('units/convert/batch/', UnitBatchConversionView.as_view(), name='unit_convert_batch'),
+    path('calculator/evaluate/', ExpressionEvaluationView.as_view(), name='expression_evaluate'),
+    path('calculator/evaluate/batch/', ExpressionBatchEvaluationView.as_view(), name='expression_evaluate_batch'),
+    path('currency/', CurrencyCatalogView.as_view(), name='currency_catalog'),
+    path('currency/convert/', CurrencyConversionView.as_view(), name='currency_convert'),
+    path('currency/convert/batch/', CurrencyBatchConversionView.as_view(), name='currency_convert_batch'),
+    path('passwords/', PasswordGeneratorView.as_view(), name='password_generator'),
+    path('qr/', QRCodeView.as_view(), name='qr_code'),
+    path('qr/batch/', QRBatchView.as_view(), name='qr_batch'),
+    path('search/', SearchView.as_view(), name='search'),
+    path('search/suggest/', TypeaheadView.as_view(), name='search_suggest'),
     # You can add more URL patterns for other API endpoints in your 'core' app here.
 ]
@@ -1,67 +1,132 @@
 # backend/core/views.py
-from rest_framework import generics
+import math
+import re
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework import generics, status
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.exceptions import APIException, ParseError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework.permissions import IsAuthenticated
-from .models import MenuItem
-from .serializers import MenuItemSerializer
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
+from .analytics import event_buffer, parse_events
+from .authentication import FirebaseAuthentication, OptionalFirebaseAuthentication
+from .catalog_io import CATALOG_FORMATS, catalog_format, export_catalog, import_catalog, read_catalog, text_stream
+from .currency import rate_snapshot
+from .expressions import compile_expression
+from .geo import GEO_REGION_HEADERS, request_region
+from .menu_cache import get_compressed_payload, payload_response
+from .models import MenuItem, access_role
+from .navbar import build_menu_items, navbar_payload, visible_items
+from .paginators import KeysetPagination, SearchRankPagination
+from .parsers import FastJSONParser
+from .passwords import CHARACTER_CLASSES, password_policy, password_stream
+from .qr import QR_FORMATS, get_qr, qr_key, qr_options, render_many, zip_stream
+from .renderers import FastJSONRenderer, NumpyJSONRenderer
+from .search import ranked_search
+from .serializers import MenuItemSerializer, MENU_ITEM_PROFILES, SearchResultSerializer
+from .trending import trending_rankings
+from .typeahead import typeahead_index
+from .units import conversion, convert_many, unit_catalog
+
+
+# Per-caller responses (role from the credentials, region from the CDN headers) must not be shared by caches
+# Navbar projections whose payloads are cached: the full item and each named profile
+CACHED_FIELD_SETS = {
+    tuple(MenuItemSerializer.select_field_names(profile=profile)) for profile in (None, *MENU_ITEM_PROFILES)
+}
+CALLER_VARY_HEADERS = ('Authorization', 'Cookie', *GEO_REGION_HEADERS)
+
+
+def split_query_list(value):
+    """'a, b,c' -> ['a', 'b', 'c'] for comma-separated query parameters."""
+    return [part.strip() for part in value.split(',') if part.strip()] if value else []
+
+
+def parse_bool_param(name, value):
+    """'true'/'false' (or 1/0, yes/no) query parameter -> bool."""
+    if value.lower() in ('1', 'true', 'yes'):
+        return True
+    if value.lower() in ('0', 'false', 'no'):
+        return False
+    raise ParseError(f"'{name}' must be true or false.")
+
+
+def check_number_list(name, values):
+    """Reject anything but JSON numbers in a batch list: NumPy would quietly turn "1.5", true and null into numbers."""
+    if not set(map(type, values)) <= {int, float}:
+        raise ParseError(f"'{name}' must be a flat list of numbers.")
 
 
 class MenuItemsListView(APIView):
     """
     API View to fetch all active, visible, and published top-level menu items,
     including their nested dropdown items, structured for the frontend navbar.
+
+    Supports sparse fieldsets: ?profile=navbar|card|admin, ?fields=a,b and
+    ?exclude=a,b. Only the columns (and user joins) the selected fields need are
+    loaded. The whole navbar is built from at most two queries regardless of
+    menu size: one for the top-level items and one for all of their live
+    dropdown items.
+
+    Items targeted at regions (geo_location) are only included for requests
+    from those regions, and only items whose access_level the caller's role
+    allows are returned (anonymous: public; signed in: + registered; staff:
+    everything). Each region/role pair gets its own cached variant.
     """
-    def get(self, request, format=None):
-        # Filter for top-level menu items (those without a parent_menu) that are:
-        # - active
-        # - visible
-        # - published
-        # - NOT hidden, archived, or deleted
-        top_level_items = MenuItem.objects.filter(
-            parent_menu__isnull=True,
-            is_active=True,
-            is_visible=True,
-            is_published=True,
-            is_hidden=False,
-            is_archived=False,
-            is_deleted=False
-        ).order_by('order') # Order them by the 'order' field
-
-        navbar_menu_data = []
-
-        for item in top_level_items:
-            # Serialize the top-level item using the main serializer.
-            # Due to the 'dropdown_items' field in MenuItemSerializer, this will automatically
-            # include the nested sub-items if 'is_dropdown' is true for the current item.
-            item_data = MenuItemSerializer(item).data
-
-            # The frontend expects 'dropdown' key and 'items' for nested items.
-            # Adjusting structure for frontend compatibility.
-            if item_data.get('is_dropdown') and item_data.get('dropdown_items'):
-                # If it's a dropdown and has items, rename 'dropdown_items' to 'items'
-                item_data['items'] = item_data.pop('dropdown_items')
-            else:
-                # If it's not a dropdown or has no sub-items, remove the dropdown-related keys
-                item_data.pop('dropdown_items', None) # Remove if present
-                item_data.pop('is_dropdown', None)    # Remove if present
-
-            navbar_menu_data.append(item_data)
-
-        # Construct the final response structure as per your frontend's expected JSON
-        response_data = {
-            "navbar": {
-                "brandName": "DailyToolbox",
-                "menuItems": navbar_menu_data,
-                "searchBar": True,
-                "loginAvatar": True,
-                "darkModeToggle": True
-            }
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    # Identify the caller (Firebase bearer token or admin session) to pick their role's tree
+    authentication_classes = [OptionalFirebaseAuthentication, SessionAuthentication]
+
+    def get_projection(self):
+        params = self.request.query_params
+        profile = params.get('profile')
+        if profile and profile not in MENU_ITEM_PROFILES:
+            raise ParseError(f"Unknown profile '{profile}'. Choose from: {', '.join(MENU_ITEM_PROFILES)}.")
+        return {
+            'profile': profile,
+            'fields': split_query_list(params.get('fields')),
+            'exclude': split_query_list(params.get('exclude')),
         }
-        return Response(response_data)
+
+    def get(self, request, format=None):
+        # Public, read-only data: built straight from values() rows (see core.navbar)
+        # and encoded by FastJSONRenderer. The JSON is identical to serializing the
+        # items with MenuItemSerializer (core.navbar.serialize_menu_items).
+        projection = self.get_projection()
+        region = request_region(request) # Geo-targeted items only show in their regions (see core.geo)
+        role = access_role(request.user) # access_level filtering happens in the query, not per item
+        if request.accepted_renderer.format != 'json':
+            return Response(navbar_payload(build_menu_items(region=region, role=role, **projection))) # Browsable API
+
+        # JSON is identical for every caller with the same role in a region, so each variant is
+        # rendered and compressed (gzip/brotli) once per relevant menu change and served from the
+        # cache afterwards (see core.menu_cache).
+        # Only the default and named-profile field sets are stored, so arbitrary
+        # ?fields=/?exclude= combinations cannot fill the cache.
+        field_names = tuple(MenuItemSerializer.select_field_names(**projection))
+        payload = get_compressed_payload(
+            variant=f"{role}:{','.join(field_names)}",
+            build=lambda: FastJSONRenderer().render(
+                navbar_payload(build_menu_items(region=region, role=role, **projection))
+            ),
+            cacheable=lambda: (
+                field_names in CACHED_FIELD_SETS
+                and not visible_items(region, role).filter(is_cacheable=False).exists()
+            ),
+            region=region,
+        )
+        response = payload_response(request, payload)
+        patch_vary_headers(response, CALLER_VARY_HEADERS)
+        return response
 
 
 class ProtectedView(APIView):
+    authentication_classes = [FirebaseAuthentication] # Firebase bearer token, no session
     permission_classes = [IsAuthenticated] # Requires authentication
 
     def get(self, request):
@@ -72,4 +137,523 @@ class ProtectedView(APIView):
             "message": f"Hello, {request.user.username}! This is a protected area. "
                        f"Your Firebase UID is {request.user.username}. "
                        f"You are authenticated via Django with Firebase token."
-        })
\ No newline at end of file
+        })
+
+
+class CatalogExportView(APIView):
+    """
+    Stream every core menu item as CSV (default) or JSON Lines: ?file_format=csv|jsonl.
+    Rows are written as they are read, so memory use does not grow with the catalog.
+    """
+    authentication_classes = [OptionalFirebaseAuthentication, SessionAuthentication]
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        fmt = request.query_params.get('file_format', 'csv')
+        if fmt not in CATALOG_FORMATS:
+            raise ParseError(f"Unknown file_format '{fmt}'. Choose from: {', '.join(CATALOG_FORMATS)}.")
+        response = StreamingHttpResponse(
+            (line.encode() for line in export_catalog(fmt)),
+            content_type='text/csv; charset=utf-8' if fmt == 'csv' else 'application/x-ndjson',
+        )
+        response['Content-Disposition'] = f'attachment; filename="menu-catalog.{fmt}"'
+        return response
+
+
+class CatalogImportView(APIView):
+    """
+    Upsert core menu items from an uploaded CSV or JSON Lines 'file' (multipart), matched by title.
+    The format comes from ?file_format= or the file name. Returns created/updated/unchanged counts
+    and per-line errors.
+    """
+    authentication_classes = [OptionalFirebaseAuthentication, SessionAuthentication]
+    permission_classes = [IsAdminUser]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            raise ParseError("Upload the catalog as a multipart 'file' field.")
+        fmt = request.query_params.get('file_format') or catalog_format(upload.name)
+        if fmt not in CATALOG_FORMATS:
+            raise ParseError(f"Unknown file_format '{fmt}'. Choose from: {', '.join(CATALOG_FORMATS)}.")
+        try:
+            result = import_catalog(read_catalog(text_stream(upload.file), fmt), user=request.user)
+        except UnicodeDecodeError:
+            raise ParseError("The catalog file must be UTF-8 encoded.")
+        return Response(result.as_dict())
+
+
+class AnalyticsEventsView(APIView):
+    """
+    Accept a batch of usage events from the SPA and buffer them for bulk storage.
+
+    Body: {"events": [{"item": 12, "type": "view", "ts": 1767225600000}, ...]} where
+    'ts' (epoch milliseconds) is optional. Responds 202 with accepted/rejected counts;
+    events are stored asynchronously (see core.analytics.EventBuffer).
+    """
+    authentication_classes = [] # Anonymous beacons: no session (and so no CSRF) needed
+    permission_classes = [AllowAny]
+    max_events = getattr(settings, 'ANALYTICS_MAX_EVENTS_PER_REQUEST', 500)
+
+    def post(self, request):
+        raw_events = request.data.get('events') if isinstance(request.data, dict) else None
+        if not isinstance(raw_events, list):
+            raise ParseError("Expected a JSON object with an 'events' list.")
+        if len(raw_events) > self.max_events:
+            raise ParseError(f"At most {self.max_events} events per request.")
+        events, rejected = parse_events(raw_events)
+        event_buffer.add(events)
+        return Response({'accepted': len(events), 'rejected': rejected}, status=status.HTTP_202_ACCEPTED)
+
+
+class TrendingView(APIView):
+    """
+    Menu items ranked by trending score (from the last compute_trending run),
+    overall or within one tool domain: ?domain=<tool_domain>&limit=<n, default 10, max 100>.
+    Same visibility rules as the navbar (live, the caller's region and role).
+    """
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    authentication_classes = [OptionalFirebaseAuthentication, SessionAuthentication]
+    max_limit = 100
+
+    def get(self, request):
+        try:
+            limit = max(0, min(int(request.query_params.get('limit', 10)), self.max_limit))
+        except ValueError:
+            raise ParseError("'limit' must be an integer.")
+        rankings = trending_rankings()
+        if rankings is None:
+            response = Response({'computed_at': None, 'items': []})
+        else:
+            domain = request.query_params.get('domain')
+            ranking = rankings['overall'] if domain is None else rankings['domains'].get(domain, [])
+            # The whole ranking (at most RANKING_LENGTH ids): items the caller can't see are skipped
+            scores = dict(ranking)
+            visible = visible_items(request_region(request), access_role(request.user)).filter(pk__in=scores)
+            items = {item['id']: item for item in visible.values('id', 'title', 'url', 'icon', 'tool_domain', 'is_trending')}
+            ranked = [dict(items[pk], score=score) for pk, score in scores.items() if pk in items][:limit]
+            response = Response({'computed_at': rankings['computed_at'], 'items': ranked})
+        patch_vary_headers(response, CALLER_VARY_HEADERS)
+        return response
+
+
+class TypeaheadView(APIView):
+    """
+    Navbar search suggestions: live, searchable items with a title, SEO title
+    or tool domain word starting with ?q= (titles first), limited to what the
+    caller's region and role may see. ?limit=<n, default 8, max 20>.
+
+    Answered from an in-process prefix index (core.typeahead), so a keystroke
+    costs no database query.
+    """
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    authentication_classes = [OptionalFirebaseAuthentication, SessionAuthentication]
+    max_limit = 20
+    max_query_length = 100
+
+    def get(self, request):
+        try:
+            limit = max(0, min(int(request.query_params.get('limit', 8)), self.max_limit))
+        except ValueError:
+            raise ParseError("'limit' must be an integer.")
+        query = request.query_params.get('q', '')[:self.max_query_length]
+        items = typeahead_index().search(
+            query, limit, region=request_region(request), role=access_role(request.user),
+        )
+        response = Response({'query': query, 'items': items})
+        patch_vary_headers(response, CALLER_VARY_HEADERS)
+        return response
+
+
+class SearchView(generics.ListAPIView):
+    """
+    Ranked full-text search over titles, SEO titles/descriptions and tool
+    domains: ?q=convert celsius (every word may be a prefix). Falls back to
+    typo-tolerant title matching when nothing matches and pg_trgm is installed.
+    Cursor-paginated by rank (?cursor=, ?page_size=<max 100>); same visibility
+    rules as the navbar (live, searchable, the caller's region and role).
+    """
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    authentication_classes = [OptionalFirebaseAuthentication, SessionAuthentication]
+    serializer_class = SearchResultSerializer
+    pagination_class = SearchRankPagination
+    max_query_length = 200
+
+    def get_queryset(self):
+        query = self.request.query_params.get('q', '')[:self.max_query_length]
+        items = visible_items(request_region(self.request), access_role(self.request.user)).filter(is_searchable=True)
+        columns = [name for name in SearchResultSerializer.Meta.fields if name != 'rank']
+        return ranked_search(items.only(*columns), query)
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        patch_vary_headers(response, CALLER_VARY_HEADERS)
+        return response
+
+
+class ToolCatalogView(generics.ListAPIView):
+    """
+    Tool cards (the 'card' profile of MenuItemSerializer): live, non-dropdown
+    items the caller may see, by menu order. Filters: ?tool_domain=,
+    ?is_featured=true|false, ?is_promoted=true|false.
+
+    Keyset-paginated on (order, id): follow 'next' (?cursor=) for the next
+    page, ?page_size=<max 100>. Every page is an index range scan of the same
+    cost (see KeysetPagination and the core_menuitem_tools*_idx indexes).
+    """
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    authentication_classes = [OptionalFirebaseAuthentication, SessionAuthentication]
+    pagination_class = KeysetPagination
+    card_fields = MenuItemSerializer.select_field_names(profile='card')
+
+    def get_queryset(self):
+        params = self.request.query_params
+        items = visible_items(request_region(self.request), access_role(self.request.user)).filter(is_dropdown=False)
+        if params.get('tool_domain'):
+            items = items.filter(tool_domain=params['tool_domain'])
+        for flag in ('is_featured', 'is_promoted'):
+            if flag in params:
+                items = items.filter(**{flag: parse_bool_param(flag, params[flag])})
+        only, select_related = MenuItemSerializer.model_columns(self.card_fields)
+        return items.only('order', *only).select_related(*select_related)
+
+    def get_serializer(self, *args, **kwargs):
+        return MenuItemSerializer(*args, profile='card', context=self.get_serializer_context(), **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        patch_vary_headers(response, CALLER_VARY_HEADERS)
+        return response
+
+
+class UnitCatalogView(APIView):
+    """Units the converters support, by dimension: {"dimensions": {"length": ["m", "km", ...], ...}}."""
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        return Response({'dimensions': unit_catalog()})
+
+
+class UnitConversionView(APIView):
+    """
+    Convert one value: ?value=12&from=km&to=mi ->
+    {"dimension": "length", "from": "km", "to": "mi", "value": 12.0, "result": 7.456...}.
+    Units are codes or names ('km', 'kilometres', '°C'); see UnitCatalogView.
+    """
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        params = request.query_params
+        missing = [name for name in ('value', 'from', 'to') if not params.get(name)]
+        if missing:
+            raise ParseError(f"Missing parameter(s): {', '.join(missing)}.")
+        try:
+            value = float(params['value'])
+        except ValueError:
+            raise ParseError("'value' must be a number.")
+        if not math.isfinite(value):
+            raise ParseError("'value' must be a finite number.")
+        try:
+            dimension, from_code, to_code, factor, offset = conversion(params['from'], params['to'])
+        except ValueError as exc:
+            raise ParseError(str(exc))
+        result = value * factor + offset
+        if not math.isfinite(result): # A finite value can still overflow, e.g. 1e308 km in m
+            raise ParseError("Result is not a finite number.")
+        return Response({
+            'dimension': dimension, 'from': from_code, 'to': to_code,
+            'value': value, 'result': result,
+        })
+
+
+class UnitBatchConversionView(APIView):
+    """
+    Convert many values between two units in one vectorised (NumPy) pass:
+    {"from": "C", "to": "F", "values": [0, 37.5, 100]} ->
+    {"dimension": "temperature", "from": "C", "to": "F", "results": [32.0, 99.5, 212.0]}.
+    At most UNIT_CONVERSION_MAX_BATCH values per request.
+    """
+    renderer_classes = [NumpyJSONRenderer]
+    parser_classes = [FastJSONParser]
+    authentication_classes = [] # Public calculator: no session (and so no CSRF) needed
+    permission_classes = [AllowAny]
+    max_values = getattr(settings, 'UNIT_CONVERSION_MAX_BATCH', 1_000_000)
+    max_body_size = 32 * max_values + 1024 # Room for max_values full-precision numbers (see FastJSONParser)
+
+    def post(self, request):
+        data = request.data if isinstance(request.data, dict) else {}
+        values = data.get('values')
+        if not isinstance(values, list) or not data.get('from') or not data.get('to'):
+            raise ParseError("Expected a JSON object with 'from', 'to' and a 'values' list.")
+        if len(values) > self.max_values:
+            raise ParseError(f"At most {self.max_values} values per request.")
+        check_number_list('values', values)
+        try:
+            dimension, from_code, to_code, *_ = conversion(data['from'], data['to'])
+        except ValueError as exc:
+            raise ParseError(str(exc))
+        try:
+            results = convert_many(values, from_code, to_code)
+        except ValueError as exc:
+            raise ParseError(str(exc))
+        return Response({'dimension': dimension, 'from': from_code, 'to': to_code, 'results': results})
+
+
+class CurrencyRatesUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Currency rates are not available yet."
+    default_code = 'rates_unavailable'
+
+
+def current_rate_snapshot():
+    snapshot = rate_snapshot()
+    if snapshot is None:
+        raise CurrencyRatesUnavailable()
+    return snapshot
+
+
+class CurrencyCatalogView(APIView):
+    """
+    Currencies in the rate snapshot and its freshness:
+    {"currencies": ["EUR", "USD", ...], "snapshot": {"as_of": ..., "age_seconds": 120, "stale": false}}.
+    """
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        snapshot = current_rate_snapshot()
+        return Response({'currencies': snapshot.codes, 'snapshot': snapshot.metadata()})
+
+
+class CurrencyConversionView(APIView):
+    """
+    Convert one amount with the locally cached rates (no upstream call): ?amount=100&from=USD&to=EUR ->
+    {"from": "USD", "to": "EUR", "amount": 100.0, "rate": 0.92, "result": 92.0, "snapshot": {...}}.
+    Responds 503 until manage.py refresh_currency_rates has written a snapshot.
+    """
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        params = request.query_params
+        missing = [name for name in ('amount', 'from', 'to') if not params.get(name)]
+        if missing:
+            raise ParseError(f"Missing parameter(s): {', '.join(missing)}.")
+        try:
+            amount = float(params['amount'])
+        except ValueError:
+            raise ParseError("'amount' must be a number.")
+        if not math.isfinite(amount):
+            raise ParseError("'amount' must be a finite number.")
+        snapshot = current_rate_snapshot()
+        try:
+            rate = snapshot.rate(params['from'], params['to'])
+        except ValueError as exc:
+            raise ParseError(str(exc))
+        result = amount * rate
+        if not math.isfinite(result): # A finite amount can still overflow at a large rate
+            raise ParseError("Result is not a finite number.")
+        return Response({
+            'from': params['from'].strip().upper(), 'to': params['to'].strip().upper(),
+            'amount': amount, 'rate': rate, 'result': result, 'snapshot': snapshot.metadata(),
+        })
+
+
+class CurrencyBatchConversionView(APIView):
+    """
+    Convert many amounts in one vectorised pass over the rate snapshot. 'from' and
+    'to' are each one code for every amount or a list with one code per amount:
+    {"from": "USD", "to": ["EUR", "INR"], "amounts": [10, 10]} ->
+    {"results": [9.2, 831.5], "rates": [0.92, 83.15], "snapshot": {...}}.
+    At most CURRENCY_CONVERSION_MAX_BATCH amounts per request.
+    """
+    renderer_classes = [NumpyJSONRenderer]
+    parser_classes = [FastJSONParser]
+    authentication_classes = [] # Public calculator: no session (and so no CSRF) needed
+    permission_classes = [AllowAny]
+    max_amounts = getattr(settings, 'CURRENCY_CONVERSION_MAX_BATCH', 100_000)
+    max_body_size = 48 * max_amounts + 1024 # Room for an amount and two quoted codes per entry (see FastJSONParser)
+
+    def post(self, request):
+        data = request.data if isinstance(request.data, dict) else {}
+        amounts = data.get('amounts')
+        if not isinstance(amounts, list) or not data.get('from') or not data.get('to'):
+            raise ParseError("Expected a JSON object with 'from', 'to' and an 'amounts' list.")
+        if len(amounts) > self.max_amounts:
+            raise ParseError(f"At most {self.max_amounts} amounts per request.")
+        check_number_list('amounts', amounts)
+        codes = [data[name] if isinstance(data[name], list) else [data[name]] * len(amounts) for name in ('from', 'to')]
+        snapshot = current_rate_snapshot()
+        try:
+            results, rates = snapshot.convert_many(amounts, *codes)
+        except (TypeError, ValueError) as exc:
+            raise ParseError(str(exc))
+        return Response({'results': results, 'rates': rates, 'snapshot': snapshot.metadata()})
+
+
+# Renderings are addressed by content and options, so a URL's response never changes
+QR_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+QR_OPTION_PARAMS = ('image_format', 'scale', 'border', 'error_correction', 'dark', 'light')
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^\w.-]+')
+
+
+class QRCodeView(APIView):
+    """
+    Render a QR code: ?data=https://example.com&image_format=svg. Optional: scale (pixels per
+    module, default 10), border (modules, default 4), error_correction (L/M/Q/H, default M),
+    dark and light (hex colors). Renderings come from a shared disk cache and are served as
+    immutable, with the content hash as ETag.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        params = request.query_params
+        content = params.get('data')
+        if not content:
+            raise ParseError("Missing parameter: data.")
+        try:
+            options = qr_options(**{name: params[name] for name in QR_OPTION_PARAMS if params.get(name)})
+            etag = f'"{qr_key(content, options)}"'
+            if request.headers.get('If-None-Match') == etag:
+                response = HttpResponseNotModified()
+            else:
+                _, image = get_qr(content, options)
+                response = HttpResponse(image, content_type=QR_FORMATS[options['image_format']])
+        except ValueError as exc:
+            raise ParseError(str(exc))
+        response['ETag'] = etag
+        response['Cache-Control'] = QR_CACHE_CONTROL
+        return response
+
+
+class QRBatchView(APIView):
+    """
+    Render many QR codes into a streamed ZIP archive:
+    {"items": ["https://a.example", {"data": "WIFI:...", "name": "guest-wifi"}], "image_format": "png", ...}
+    takes the same options as QRCodeView for every item. Cache misses are rendered in parallel on
+    a process pool. At most QR_BATCH_MAX_ITEMS items per request.
+    """
+    parser_classes = [FastJSONParser]
+    authentication_classes = [] # Public tool: no session (and so no CSRF) needed
+    permission_classes = [AllowAny]
+    max_items = getattr(settings, 'QR_BATCH_MAX_ITEMS', 500)
+
+    def post(self, request):
+        data = request.data if isinstance(request.data, dict) else {}
+        items = data.get('items')
+        if not isinstance(items, list) or not items:
+            raise ParseError("Expected a JSON object with a non-empty 'items' list.")
+        if len(items) > self.max_items:
+            raise ParseError(f"At most {self.max_items} items per request.")
+        try:
+            options = qr_options(**{name: data[name] for name in QR_OPTION_PARAMS if data.get(name) is not None})
+        except ValueError as exc:
+            raise ParseError(str(exc))
+
+        # Validate everything up front: once the archive starts streaming, errors can't be reported
+        jobs, names, used = [], [], set()
+        for index, item in enumerate(items, 1):
+            content, name = (item.get('data'), item.get('name')) if isinstance(item, dict) else (item, None)
+            try:
+                jobs.append((qr_key(content, options), content, options))
+            except ValueError as exc:
+                raise ParseError(f"Item {index}: {exc}")
+            name = _UNSAFE_FILENAME_CHARS.sub('-', str(name or ''))[:100].strip('.-') or f'qr-{index:04d}'
+            name = f"{name}.{options['image_format']}"
+            names.append(name if name not in used else f"{index:04d}-{name}")
+            used.add(names[-1])
+
+        response = StreamingHttpResponse(zip_stream(zip(names, render_many(jobs))), content_type='application/zip')
+        response['Content-Disposition'] = 'attachment; filename="qr-codes.zip"'
+        return response
+
+
+class PasswordGeneratorView(APIView):
+    """
+    Stream 'count' random passwords (default 1, at most PASSWORD_MAX_COUNT), one per line as
+    text/plain: ?count=1000&length=20&symbols=false&exclude=%22%27&exclude_similar=true.
+    Character classes (lowercase, uppercase, digits, symbols) default to on, and every selected
+    class appears in each password. Responses are never cached.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    max_count = getattr(settings, 'PASSWORD_MAX_COUNT', 1_000_000)
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            count = int(params.get('count', 1))
+        except ValueError:
+            raise ParseError("'count' must be an integer.")
+        if not 1 <= count <= self.max_count:
+            raise ParseError(f"'count' must be 1-{self.max_count}.")
+        flags = {name: parse_bool_param(name, params[name]) for name in (*CHARACTER_CLASSES, 'exclude_similar') if name in params}
+        try:
+            policy = password_policy(length=params.get('length', 16), exclude=params.get('exclude', ''), **flags)
+        except ValueError as exc:
+            raise ParseError(str(exc))
+        response = StreamingHttpResponse(password_stream(policy, count), content_type='text/plain; charset=utf-8')
+        response['Cache-Control'] = 'no-store'
+        return response
+
+
+class ExpressionEvaluationView(APIView):
+    """
+    Evaluate an arithmetic expression: ?expression=2*(x+1)^2&x=3 -> {"expression": "2*(x+1)^2", "result": 32.0}.
+    Other query parameters bind the expression's variables. Supports + - * / // % ** (or ^),
+    pi/e/tau and the functions in core.expressions.FUNCTIONS; nothing is passed to eval().
+    """
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            expression = compile_expression(params.get('expression', ''))
+            bindings = {name: float(params[name]) for name in expression.variables if name in params}
+            return Response({'expression': expression.text, 'result': expression.evaluate(**bindings)})
+        except ValueError as exc: # Includes float() of a variable that is not a number
+            raise ParseError(str(exc))
+
+
+class ExpressionBatchEvaluationView(APIView):
+    """
+    Evaluate one expression over many variable bindings in one vectorised (NumPy) pass:
+    {"expression": "a * x + b", "variables": {"x": [1, 2, 3], "a": 2, "b": [0, 0, 1]}} ->
+    {"results": [2.0, 4.0, 7.0]}. Lists must have equal lengths (at most EXPRESSION_MAX_BATCH);
+    single numbers apply to every row. Math errors give null; slow evaluations are stopped
+    after EXPRESSION_TIME_LIMIT seconds.
+    """
+    renderer_classes = [NumpyJSONRenderer]
+    parser_classes = [FastJSONParser]
+    authentication_classes = [] # Public calculator: no session (and so no CSRF) needed
+    permission_classes = [AllowAny]
+    max_rows = getattr(settings, 'EXPRESSION_MAX_BATCH', 1_000_000)
+    max_body_size = 32 * max_rows + 1024 # Room for max_rows full-precision numbers (see FastJSONParser)
+
+    def post(self, request):
+        data = request.data if isinstance(request.data, dict) else {}
+        variables = data.get('variables', {})
+        if not isinstance(data.get('expression'), str) or not isinstance(variables, dict):
+            raise ParseError("Expected a JSON object with an 'expression' and a 'variables' object.")
+        if any(isinstance(values, list) and len(values) > self.max_rows for values in variables.values()):
+            raise ParseError(f"At most {self.max_rows} values per variable.")
+        for name, values in variables.items():
+            if isinstance(values, list):
+                check_number_list(name, values)
+            elif type(values) not in (int, float):
+                raise ParseError(f"'{name}' must be a number or a flat list of numbers.")
+        try:
+            results = compile_expression(data['expression']).evaluate_many(variables)
+        except (TypeError, ValueError) as exc:
+            raise ParseError(str(exc))
+        return Response({'results': results})
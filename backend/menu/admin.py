@@ -1,7 +1,10 @@
 from django.contrib import admin
+from core.admin_actions import MenuItemBulkActionsMixin # Shared set-based bulk actions
+from core.admin_filters import ParentMenuFilter
+from core.paginators import EstimatedCountPaginator
 from .models import MenuItem, AccessLevelChoices, TargetChoices # Import new choices
 
-class MenuItemAdmin(admin.ModelAdmin):
+class MenuItemAdmin(MenuItemBulkActionsMixin, admin.ModelAdmin):
     list_display = (
         'title', 'parent_menu', 'url', 'order', 'is_dropdown', 'is_active',
         'is_visible', 'is_trending', 'is_promoted', 'is_featured', 'access_level',
@@ -12,10 +15,14 @@ class MenuItemAdmin(admin.ModelAdmin):
         'is_active', 'is_visible', 'is_dropdown', 'is_trending', 'is_promoted',
         'is_featured', 'is_hidden', 'is_draft', 'is_published', 'is_scheduled',
         'is_external', 'is_accessible', 'is_searchable', 'is_cacheable',
-        'is_archived', 'is_deleted', 'access_level', 'parent_menu',
+        'is_archived', 'is_deleted', 'access_level', ParentMenuFilter,
     )
     search_fields = ('title', 'url', 'seo_title', 'seo_description', 'tool_domain', 'geo_location')
     ordering = ('parent_menu__order', 'parent_menu__title', 'order', 'title') # Order by parent, then order, then title
+    list_select_related = ('parent_menu',)
+    # Keep the changelist cheap on large tables: no second COUNT(*), estimated counts past a threshold
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
     raw_id_fields = ('parent_menu', 'published_by', 'scheduled_by', 'created_by', 'updated_by', 'archived_by', 'deleted_by') # Added all ForeignKey fields
 
     # Group fields into logical sections for better readability in the admin change form
@@ -80,6 +87,8 @@ class MenuItemAdmin(admin.ModelAdmin):
         if not obj.pk:  # Only set created_by for new objects
             obj.created_by = request.user
         obj.updated_by = request.user # Always set updated_by on save
+        if obj.is_scheduled and not obj.scheduled_by: # Credited as publisher by publish_scheduled_items
+            obj.scheduled_by = request.user
         super().save_model(request, obj, form, change)
 
 
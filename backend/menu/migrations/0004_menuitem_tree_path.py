@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:13
+
+from django.db import migrations, models
+
+
+def build_tree_paths(apps, schema_editor):
+    """Backfill tree_path/depth for existing rows from the parent_menu adjacency list."""
+    MenuItem = apps.get_model('menu', 'MenuItem')
+    parents = dict(MenuItem.objects.values_list('id', 'parent_menu_id'))
+    paths = {}
+
+    def path_for(pk, seen=()):
+        if pk not in paths:
+            parent_id = parents.get(pk)
+            if parent_id is None or parent_id in seen:
+                paths[pk] = f"/{pk}/"
+            else:
+                paths[pk] = f"{path_for(parent_id, seen + (pk,))}{pk}/"
+        return paths[pk]
+
+    items = list(MenuItem.objects.only('id'))
+    for item in items:
+        item.tree_path = path_for(item.id)
+        item.depth = item.tree_path.count('/') - 2
+    MenuItem.objects.bulk_update(items, ['tree_path', 'depth'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('menu', '0003_alter_menuitem_options_remove_menuitem_name_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='menuitem',
+            name='depth',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False, help_text='Nesting level of the menu item (0 for top-level items).'),
+        ),
+        migrations.AddField(
+            model_name='menuitem',
+            name='tree_path',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text="Materialized path of ancestor ids ending with this item's id (e.g., '/1/5/23/').", max_length=255),
+        ),
+        migrations.RunPython(build_tree_paths, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,7 @@
 import uuid # For unique IDs if needed, though Django's default PK is often fine
 from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Substr
 from django.conf import settings # To link to User model
 from django.utils import timezone # For datetime fields
 
@@ -16,6 +18,52 @@ class TargetChoices(models.TextChoices):
     SELF = '_self', 'Same Window/Tab'
     BLANK = '_blank', 'New Window/Tab'
 
+# Separator for MenuItem.tree_path, e.g. '/1/5/23/' for item 23 under 5 under 1
+TREE_PATH_SEPARATOR = '/'
+
+# Items that may appear in public navigation: active, visible, published and
+# NOT hidden, archived, or deleted. Shared by MenuItem.live and its partial index.
+LIVE_MENU_ITEM_FILTER = models.Q(
+    is_active=True,
+    is_visible=True,
+    is_published=True,
+    is_hidden=False,
+    is_archived=False,
+    is_deleted=False,
+)
+
+class MenuItemQuerySet(models.QuerySet):
+    def live(self):
+        """Restrict to items that may be shown publicly."""
+        return self.filter(LIVE_MENU_ITEM_FILTER)
+
+    def due_for_publication(self, now=None):
+        """
+        Unpublished scheduled items whose scheduled_at has passed (served by the
+        scheduled-items partial index). Items that are already live are left
+        alone, so their published_at/published_by are never overwritten.
+        """
+        return self.filter(is_scheduled=True, is_published=False, scheduled_at__lte=now or timezone.now())
+
+    def publish_due(self, now=None):
+        """
+        Publish every due scheduled item with a single UPDATE and return how many were published.
+        published_at is the scheduled time and published_by the user who scheduled the item.
+        """
+        now = now or timezone.now()
+        return self.due_for_publication(now).update(
+            is_published=True,
+            is_scheduled=False,
+            published_at=models.F('scheduled_at'),
+            published_by=models.F('scheduled_by'),
+            updated_at=now,
+        )
+
+class LiveMenuItemManager(models.Manager.from_queryset(MenuItemQuerySet)):
+    """Manager for public read paths: MenuItem.live.filter(...) only ever sees live items."""
+    def get_queryset(self):
+        return super().get_queryset().live()
+
 class MenuItem(models.Model):
     # Basic Menu Information
     title = models.CharField(max_length=255,default="New Menu Item", help_text="Display title for the menu item.")
@@ -266,13 +314,110 @@ class MenuItem(models.Model):
         help_text="User who soft-deleted this menu item."
     )
 
+    # Hierarchy Index (maintained on save, move and delete; never edited by hand)
+    tree_path = models.CharField(
+        max_length=255,
+        blank=True,
+        default='',
+        db_index=True,
+        editable=False,
+        help_text="Materialized path of ancestor ids ending with this item's id (e.g., '/1/5/23/')."
+    )
+    depth = models.PositiveIntegerField(
+        default=0,
+        db_index=True,
+        editable=False,
+        help_text="Nesting level of the menu item (0 for top-level items)."
+    )
+
+    objects = MenuItemQuerySet.as_manager() # Default manager (admin, audit, etc.)
+    live = LiveMenuItemManager() # Public navigation: only live items
+
     class Meta:
         ordering = ['parent_menu__order', 'parent_menu__title', 'order', 'title']
         verbose_name = "Menu Item"
         verbose_name_plural = "Menu Items"
+        indexes = [
+            # Partial index matching MenuItem.live (see core.models for the same index)
+            models.Index(
+                fields=['parent_menu', 'order'],
+                condition=LIVE_MENU_ITEM_FILTER,
+                name='menu_menuitem_live_idx',
+            ),
+            # Lets the scheduled publishing worker find due items without scanning the table
+            models.Index(
+                fields=['scheduled_at'],
+                condition=models.Q(is_scheduled=True),
+                name='menu_menuitem_scheduled_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.title
-    
+
     # Override save method to set created_by/updated_by if user is available (more complex, often done via signals or custom admin save_model)
-    # For simplicity, we'll rely on auto_now_add/auto_now and admin.ModelAdmin for created_by/updated_by.
\ No newline at end of file
+    # For simplicity, we'll rely on auto_now_add/auto_now and admin.ModelAdmin for created_by/updated_by.
+
+    def save(self, *args, **kwargs):
+        """Save the item, then keep its tree_path/depth (and those of its subtree) in sync."""
+        if self.pk:
+            # Another save may have moved one of our ancestors since this instance was loaded
+            current_path = MenuItem.objects.filter(pk=self.pk).values_list('tree_path', flat=True).first()
+            if current_path is not None:
+                self.tree_path = current_path
+                self.depth = tree_path_depth(current_path)
+
+        parent_path = None
+        if self.parent_menu_id is not None:
+            parent_path = MenuItem.objects.filter(pk=self.parent_menu_id).values_list('tree_path', flat=True).get()
+            if self.tree_path and parent_path.startswith(self.tree_path):
+                raise ValueError("A menu item cannot be nested under itself or one of its descendants.")
+
+        super().save(*args, **kwargs)
+        self._move_subtree(parent_path)
+
+    def _move_subtree(self, parent_path):
+        """Rewrite tree_path/depth for this item and all of its descendants in one UPDATE."""
+        old_path = self.tree_path
+        new_path = f"{parent_path or TREE_PATH_SEPARATOR}{self.pk}{TREE_PATH_SEPARATOR}"
+        if new_path == old_path:
+            return
+        new_depth = tree_path_depth(new_path)
+
+        if old_path:
+            MenuItem.objects.filter(tree_path__startswith=old_path).update(
+                tree_path=Concat(Value(new_path), Substr('tree_path', len(old_path) + 1)),
+                depth=F('depth') + (new_depth - tree_path_depth(old_path)),
+            )
+        else:
+            MenuItem.objects.filter(pk=self.pk).update(tree_path=new_path, depth=new_depth)
+        self.tree_path = new_path
+        self.depth = new_depth
+
+    @property
+    def ancestor_ids(self):
+        """Ids of all ancestors, from the top-level item down to the direct parent."""
+        return [int(pk) for pk in self.tree_path.strip(TREE_PATH_SEPARATOR).split(TREE_PATH_SEPARATOR)[:-1]]
+
+    def get_descendants(self, include_self=False):
+        """All nested items below this one, answered by a prefix scan on tree_path."""
+        descendants = MenuItem.objects.filter(tree_path__startswith=self.tree_path)
+        if not include_self:
+            descendants = descendants.filter(depth__gt=self.depth)
+        return descendants.order_by('depth', 'order', 'title')
+
+    def get_ancestors(self, include_self=False):
+        """All items above this one, ordered from the top-level item downwards."""
+        ids = self.ancestor_ids
+        if include_self:
+            ids.append(self.pk)
+        return MenuItem.objects.filter(pk__in=ids).order_by('depth')
+
+    def get_breadcrumbs(self):
+        """Ancestors followed by the item itself, e.g. for 'Tools > Converters > Area'."""
+        return list(self.get_ancestors(include_self=True))
+
+
+def tree_path_depth(tree_path):
+    """Depth encoded by a tree_path: '/1/' is 0, '/1/5/' is 1, and so on."""
+    return tree_path.count(TREE_PATH_SEPARATOR) - 2
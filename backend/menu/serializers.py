@@ -1,6 +1,22 @@
+from collections import defaultdict
 from rest_framework import serializers
 from .models import MenuItem, AccessLevelChoices, TargetChoices # Import new choices
 
+
+def build_children_map(queryset=None):
+    """
+    Fetch every active menu item in a single query and group them by parent id.
+
+    Each list is ordered by 'order', 'title', matching what get_children_menus
+    returns for a node, so the map can stand in for the per-node queries.
+    """
+    if queryset is None:
+        queryset = MenuItem.objects.all()
+    children_map = defaultdict(list)
+    for item in queryset.filter(is_active=True).order_by('order', 'title'):
+        children_map[item.parent_menu_id].append(item)
+    return children_map
+
 class MenuItemSerializer(serializers.ModelSerializer):
     # If you want to include nested children in the API response:
     children_menus = serializers.SerializerMethodField() # Renamed to match model's related_name
@@ -30,7 +46,25 @@ class MenuItemSerializer(serializers.ModelSerializer):
         # read_only_fields = ['id', 'created_at', 'updated_at', 'published_at', 'scheduled_at', 'archived_at', 'deleted_at']
         # You might also make all the 'by' fields read-only if they're set by the system
 
+    @classmethod
+    def serialize_tree(cls, roots=None, queryset=None):
+        """
+        Serialize a menu tree from a single query, assembling parent/child links in Python.
+
+        By default the roots are the active top-level items. Output is identical to
+        serializing the same roots one node (and one query) at a time.
+        """
+        children_map = build_children_map(queryset)
+        if roots is None:
+            roots = children_map.get(None, [])
+        return cls(roots, many=True, context={'children_map': children_map}).data
+
     def get_children_menus(self, obj):
+        # Tree-building mode: children were prefetched by serialize_tree()
+        children_map = self.context.get('children_map')
+        if children_map is not None:
+            return MenuItemSerializer(children_map.get(obj.pk, []), many=True, context=self.context).data
+
         # Recursively serialize children if they exist
         # Filter for active children and order them
         if obj.children_menus.exists(): # Use children_menus here
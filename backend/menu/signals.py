@@ -0,0 +1,31 @@
+# backend/menu/signals.py
+from django.db.models import Q, Value
+from django.db.models.functions import Length, Replace, StrIndex, Substr
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import MenuItem, TREE_PATH_SEPARATOR
+
+
+@receiver(post_delete, sender=MenuItem)
+def detach_deleted_subtree(sender, instance, **kwargs):
+    """
+    Keep the hierarchy index valid after a hard delete.
+
+    parent_menu uses SET_NULL, so the deleted item's children become top-level
+    items. Their subtrees are rebased by cutting everything up to the deleted
+    item's path segment, found by an indexed prefix match on the item's full
+    path. When several nested items are deleted together an ancestor's rebase
+    may already have cut that path short, so every suffix of it is matched too.
+    """
+    segment = f"{TREE_PATH_SEPARATOR}{instance.pk}{TREE_PATH_SEPARATOR}"
+    ancestors = instance.tree_path.strip(TREE_PATH_SEPARATOR).split(TREE_PATH_SEPARATOR)[:-1]
+    prefixes = Q()
+    for start in range(len(ancestors) + 1):
+        prefix = TREE_PATH_SEPARATOR.join(['', *ancestors[start:], str(instance.pk), ''])
+        prefixes |= Q(tree_path__startswith=prefix)
+    new_path = Substr('tree_path', StrIndex('tree_path', Value(segment)) + len(segment) - 1)
+    MenuItem.objects.filter(prefixes).update(
+        tree_path=new_path,
+        depth=Length(new_path) - Length(Replace(new_path, Value(TREE_PATH_SEPARATOR), Value(''))) - 2,
+    )
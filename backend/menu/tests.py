@@ -1,3 +1,91 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
-# Create your tests here.
+from .models import MenuItem
+from .serializers import MenuItemSerializer
+
+
+class MenuTreeSerializationTests(TestCase):
+    def setUp(self):
+        tools = MenuItem.objects.create(title="Tools", order=2)
+        MenuItem.objects.create(title="Home", order=1)
+        MenuItem.objects.create(title="Archived Root", order=3, is_active=False)
+        converters = MenuItem.objects.create(title="Converters", parent_menu=tools, order=1)
+        MenuItem.objects.create(title="Calculator", parent_menu=tools, order=1)
+        MenuItem.objects.create(title="Timer", parent_menu=tools, order=0, is_active=False)
+        MenuItem.objects.create(title="Area", parent_menu=converters, order=5)
+        MenuItem.objects.create(title="Volume", parent_menu=converters, order=2)
+        self.roots = list(
+            MenuItem.objects.filter(parent_menu__isnull=True, is_active=True).order_by('order', 'title')
+        )
+
+    def test_tree_mode_matches_recursive_output(self):
+        expected = MenuItemSerializer(self.roots, many=True).data
+        self.assertEqual(MenuItemSerializer.serialize_tree(), expected)
+        self.assertEqual(MenuItemSerializer.serialize_tree(roots=self.roots), expected)
+
+    def test_tree_mode_uses_a_single_query(self):
+        with self.assertNumQueries(1):
+            data = MenuItemSerializer.serialize_tree()
+        tools = data[1]
+        self.assertEqual([child['title'] for child in tools['children_menus']], ["Calculator", "Converters"])
+        self.assertEqual(
+            [child['title'] for child in tools['children_menus'][1]['children_menus']], ["Volume", "Area"]
+        )
+
+
+class MenuTreePathTests(TestCase):
+    def setUp(self):
+        self.tools = MenuItem.objects.create(title="Tools")
+        self.converters = MenuItem.objects.create(title="Converters", parent_menu=self.tools)
+        self.area = MenuItem.objects.create(title="Area", parent_menu=self.converters)
+        self.home = MenuItem.objects.create(title="Home")
+
+    def test_paths_and_depth_are_maintained_on_create(self):
+        self.assertEqual(self.area.tree_path, f"/{self.tools.pk}/{self.converters.pk}/{self.area.pk}/")
+        self.assertEqual(self.area.depth, 2)
+        self.assertEqual([item.title for item in self.area.get_breadcrumbs()], ["Tools", "Converters", "Area"])
+        self.assertEqual([item.title for item in self.tools.get_descendants()], ["Converters", "Area"])
+
+    def test_moving_an_item_rewrites_its_subtree(self):
+        self.converters.parent_menu = self.home
+        self.converters.save()
+
+        self.area.refresh_from_db()
+        self.assertEqual(self.area.tree_path, f"/{self.home.pk}/{self.converters.pk}/{self.area.pk}/")
+        self.assertEqual(self.area.depth, 2)
+        self.assertEqual(list(self.tools.get_descendants()), [])
+        with self.assertNumQueries(1):
+            self.assertEqual([item.title for item in self.area.get_ancestors()], ["Home", "Converters"])
+
+    def test_cannot_move_an_item_under_its_descendant(self):
+        self.tools.parent_menu = self.area
+        with self.assertRaises(ValueError):
+            self.tools.save()
+
+    def test_deleting_an_item_promotes_its_subtree(self):
+        self.converters.delete()
+
+        self.area.refresh_from_db()
+        self.assertIsNone(self.area.parent_menu)
+        self.assertEqual(self.area.tree_path, f"/{self.area.pk}/")
+        self.assertEqual(self.area.depth, 0)
+
+    def test_deleting_an_item_rebases_by_path_prefix(self):
+        path = self.converters.tree_path
+        with CaptureQueriesContext(connection) as queries:
+            self.converters.delete()
+        rebase = next(query['sql'] for query in queries if 'SET "tree_path"' in query['sql'])
+        self.assertIn(f"LIKE '{path}%'", rebase)
+        self.assertNotIn("LIKE '%", rebase)
+
+    def test_deleting_nested_items_together(self):
+        leaf = MenuItem.objects.create(title="Square Metres", parent_menu=self.area)
+        MenuItem.objects.filter(pk__in=[self.tools.pk, self.converters.pk]).delete()
+
+        leaf.refresh_from_db()
+        self.area.refresh_from_db()
+        self.assertEqual(self.area.tree_path, f"/{self.area.pk}/")
+        self.assertEqual(leaf.tree_path, f"/{self.area.pk}/{leaf.pk}/")
+        self.assertEqual(leaf.depth, 1)
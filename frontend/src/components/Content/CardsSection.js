@@ -1,10 +1,56 @@
 // frontend/src/components/Content/CardsSection.js
-import React from 'react';
-import { Container, Typography, Box, Card, CardContent, Grid } from '@mui/material';
+import React, { useState, useEffect } from 'react';
+import { Container, Typography, Box, Card, CardContent, CardMedia, Grid, Button } from '@mui/material';
+
+const TOOLS_API_URL = 'http://localhost:8000/api/tools/';
+
+// /api/tools/ filters for each category page
+const CATEGORY_FILTERS = {
+  home: { is_featured: 'true' },
+  tools: { tool_domain: 'tools' },
+  convertors: { tool_domain: 'convertors' },
+};
+
+// Backend items are card-shaped menu items; map them to what the cards render
+const toCard = (item) => ({
+  id: item.id,
+  title: item.title,
+  description: item.seo_description,
+  icon: item.icon,
+  image: item.is_featured_image ? item.featured_image_url : null,
+});
 
 function CardsSection({ selectedCategory }) {
-  // Mock data for demonstration. In a real app, this would be fetched from a backend API
-  // based on the selectedCategory.
+  const [cards, setCards] = useState(null); // null until the first page arrives (or fails)
+  const [nextPage, setNextPage] = useState(null); // URL of the next keyset page, if any
+
+  // Fetch one page of cards; 'url' is the API's 'next' link for further pages
+  const fetchCards = async (url, append) => {
+    try {
+      const response = await fetch(url);
+      if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+      }
+      const data = await response.json();
+      const pageCards = data.results.map(toCard);
+      setCards((previous) => (append && previous ? [...previous, ...pageCards] : pageCards));
+      setNextPage(data.next);
+    } catch (error) {
+      console.error("Failed to fetch tool cards:", error);
+      if (!append) {
+        setCards(null); // Fall back to the static cards below
+        setNextPage(null);
+      }
+    }
+  };
+
+  useEffect(() => {
+    const params = new URLSearchParams(CATEGORY_FILTERS[selectedCategory] || CATEGORY_FILTERS.home);
+    setCards(null);
+    fetchCards(`${TOOLS_API_URL}?${params}`, false);
+  }, [selectedCategory]);
+
+  // Static cards, shown when the backend is unavailable or has no tools for the category yet
   const allCards = {
     home: [
       { id: 1, title: 'Featured Tool 1', description: 'A brief description of a popular tool.', icon: '🛠️' },
@@ -27,7 +73,7 @@ function CardsSection({ selectedCategory }) {
     // Add more categories as needed
   };
 
-  const cardsToDisplay = allCards[selectedCategory] || allCards.home;
+  const cardsToDisplay = cards && cards.length > 0 ? cards : (allCards[selectedCategory] || allCards.home);
 
   return (
     <Container component="section" maxWidth="lg" sx={{ mt: 4, mb: 4 }}>
@@ -38,6 +84,7 @@ function CardsSection({ selectedCategory }) {
         {cardsToDisplay.map((card) => (
           <Grid item key={card.id} xs={12} sm={6} md={4} lg={3}>
             <Card sx={{ height: '100%', display: 'flex', flexDirection: 'column', borderRadius: '12px', boxShadow: '0 4px 8px rgba(0,0,0,0.1)' }}>
+              {card.image && <CardMedia component="img" height="140" image={card.image} alt={card.title} />}
               <CardContent sx={{ flexGrow: 1, textAlign: 'center' }}>
                 <Typography variant="h3" component="div" sx={{ mb: 1 }}>
                   {card.icon}
@@ -53,6 +100,13 @@ function CardsSection({ selectedCategory }) {
           </Grid>
         ))}
       </Grid>
+      {nextPage && (
+        <Box sx={{ display: 'flex', justifyContent: 'center', mt: 4 }}>
+          <Button variant="outlined" onClick={() => fetchCards(nextPage, true)}>
+            Load more
+          </Button>
+        </Box>
+      )}
     </Container>
   );
 }
@@ -3,7 +3,8 @@ import React, { useState, useEffect } from 'react';
 import { useAuth } from '../../contexts/AuthContext'; // Correct path to AuthContext
 import {
   AppBar, Toolbar, Typography, Button, IconButton, Menu, MenuItem,
-  Switch, FormControlLabel, Box, InputBase, Tooltip, Avatar
+  Switch, FormControlLabel, Box, InputBase, Tooltip, Avatar,
+  Paper, List, ListItemButton, ListItemText
 } from '@mui/material';
 import { styled, alpha } from '@mui/material/styles';
 import MenuIcon from '@mui/icons-material/Menu';
@@ -60,6 +61,8 @@ const Navbar = ({ setCurrentPage }) => {
   const [convertorsAnchorEl, setConvertorsAnchorEl] = useState(null); // For Convertors dropdown
   const [navbarConfig, setNavbarConfig] = useState({ menuItems: [] });
   const [isDarkMode, setIsDarkMode] = useState(false);
+  const [searchQuery, setSearchQuery] = useState('');
+  const [suggestions, setSuggestions] = useState([]); // Typeahead results for the search bar
 
   const isMenuOpen = Boolean(anchorEl);
   const isToolsOpen = Boolean(toolsAnchorEl);
@@ -70,7 +73,7 @@ const Navbar = ({ setCurrentPage }) => {
     const fetchMenuItems = async () => {
       try {
         // Use the correct API endpoint for menu items
-        const response = await fetch('http://localhost:8000/api/menu-items/');
+        const response = await fetch('http://localhost:8000/api/menu-items/?profile=navbar');
         if (!response.ok) {
           throw new Error(`HTTP error! status: ${response.status}`);
         }
@@ -110,6 +113,36 @@ const Navbar = ({ setCurrentPage }) => {
     fetchMenuItems();
   }, []); // Empty dependency array means this runs once on mount
 
+  // Fetch search suggestions as the user types (debounced; stale responses are ignored)
+  useEffect(() => {
+    if (!searchQuery.trim()) {
+      setSuggestions([]);
+      return undefined;
+    }
+    const controller = new AbortController();
+    const timer = setTimeout(async () => {
+      try {
+        const response = await fetch(
+          `http://localhost:8000/api/search/suggest/?q=${encodeURIComponent(searchQuery)}`,
+          { signal: controller.signal }
+        );
+        if (!response.ok) {
+          throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        const data = await response.json();
+        setSuggestions(data.items);
+      } catch (error) {
+        if (error.name !== 'AbortError') {
+          console.error("Failed to fetch search suggestions:", error);
+        }
+      }
+    }, 150);
+    return () => {
+      clearTimeout(timer);
+      controller.abort();
+    };
+  }, [searchQuery]);
+
   const handleProfileMenuOpen = (event) => {
     setAnchorEl(event.currentTarget);
   };
@@ -290,7 +323,26 @@ const Navbar = ({ setCurrentPage }) => {
             <StyledInputBase
               placeholder="Search…"
               inputProps={{ 'aria-label': 'search' }}
+              value={searchQuery}
+              onChange={(event) => setSearchQuery(event.target.value)}
             />
+            {suggestions.length > 0 && (
+              <Paper sx={{ position: 'absolute', top: '100%', left: 0, right: 0, zIndex: 'modal' }}>
+                <List dense>
+                  {suggestions.map((suggestion) => (
+                    <ListItemButton
+                      key={suggestion.id}
+                      onClick={() => {
+                        setSearchQuery('');
+                        handlePageChange(suggestion.url || '/');
+                      }}
+                    >
+                      <ListItemText primary={suggestion.title} secondary={suggestion.tool_domain} />
+                    </ListItemButton>
+                  ))}
+                </List>
+              </Paper>
+            )}
           </Search>
         )}
 